@@ -0,0 +1,102 @@
+"""
+Round trips and wall time for 1k keys: per-key get/set vs get_many/set_many.
+
+Runs against a local redis-server when --url is given, otherwise against
+fakeredis (in the dev dependency group). fakeredis has no network, so --rtt-ms
+adds a simulated round-trip delay to each command or pipeline.
+
+    uv run python benchmarks/bench_bulk_cache.py
+    uv run python benchmarks/bench_bulk_cache.py --url redis://localhost:6379 --rtt-ms 0
+"""
+
+import argparse
+import asyncio
+import time
+
+from cache_adapters.providers.redis_cache import RedisCache
+
+
+class RoundTripCounter:
+    """Counts commands and pipeline executions on a redis client"""
+
+    def __init__(self, client, rtt: float):
+        self.count = 0
+        self._rtt = rtt
+        execute_command = client.execute_command
+        pipeline = client.pipeline
+
+        async def counted_command(*args, **kwargs):
+            await self._trip()
+            return await execute_command(*args, **kwargs)
+
+        def counted_pipeline(*args, **kwargs):
+            pipe = pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            async def counted_execute(*a, **k):
+                await self._trip()
+                return await execute(*a, **k)
+
+            pipe.execute = counted_execute
+            return pipe
+
+        client.execute_command = counted_command
+        client.pipeline = counted_pipeline
+
+    async def _trip(self) -> None:
+        self.count += 1
+        if self._rtt:
+            await asyncio.sleep(self._rtt)
+
+
+def make_client(url: str | None):
+    if url:
+        import redis.asyncio as redis
+
+        return redis.from_url(url)
+
+    import fakeredis
+
+    return fakeredis.FakeAsyncRedis()
+
+
+async def measure(label: str, counter: RoundTripCounter, fn) -> None:
+    counter.count = 0
+    start = time.perf_counter()
+    await fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<28} {counter.count:>12} {elapsed:>10.1f}")
+
+
+async def main(args) -> None:
+    client = make_client(args.url)
+    counter = RoundTripCounter(client, args.rtt_ms / 1000)
+    cache = RedisCache(client=client, default_ttl=3600, batch_size=args.batch_size)
+    keys = [f"bench:{i}" for i in range(args.keys)]
+    items = {key: f"rewritten text for {key}" for key in keys}
+
+    async def set_loop():
+        for key, value in items.items():
+            await cache.set(key, value)
+
+    async def get_loop():
+        for key in keys:
+            await cache.get(key)
+
+    print(f"{'operation':<28} {'round trips':>12} {'wall ms':>10}")
+    await measure(f"set x{args.keys}", counter, set_loop)
+    await measure(f"set_many({args.keys})", counter, lambda: cache.set_many(items))
+    await measure(f"get x{args.keys}", counter, get_loop)
+    await measure(f"get_many({args.keys})", counter, lambda: cache.get_many(keys))
+
+    await client.delete(*keys)
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Real Redis URL; fakeredis if omitted")
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=0.2, help="Simulated RTT per trip")
+    asyncio.run(main(parser.parse_args()))
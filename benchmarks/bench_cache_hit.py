@@ -0,0 +1,92 @@
+"""
+Per-request cost of a /v1/rewrite cache hit through the whole ASGI stack.
+
+Calls the app directly with hand-built ASGI messages (no HTTP client in the
+measurement) after warming the cache, so the numbers are the framework,
+routing, validation, lookup and serialization cost of one hit. /health is
+the floor: routing and middleware with no work at all.
+
+    uv run python benchmarks/bench_cache_hit.py
+    uv run python benchmarks/bench_cache_hit.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from rewriteforge.bootstrap import create_app
+
+
+def http_scope(method: str, path: str, body: bytes) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def call(app, method: str, path: str, body: bytes = b"") -> int:
+    """One request straight into the ASGI app; returns the status code"""
+    messages = [
+        {"type": "http.request", "body": body, "more_body": False},
+        {"type": "http.disconnect"},
+    ]
+    status = 0
+
+    async def receive():
+        return messages.pop(0) if len(messages) > 1 else messages[0]
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(http_scope(method, path, body), receive, send)
+    return status
+
+
+async def per_request_us(app, method: str, path: str, body: bytes, requests: int) -> float:
+    best = float("inf")
+    # Best of 5 runs to shave off scheduler noise
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await call(app, method, path, body)
+        best = min(best, time.perf_counter() - started)
+    return best / requests * 1e6
+
+
+async def main(args) -> None:
+    app = create_app()
+    body = json.dumps({"text": "Hello world " * args.words, "style": "pirate"}).encode()
+    if await call(app, "POST", "/v1/rewrite", body) != 200:
+        raise RuntimeError("warm-up request failed")
+
+    print(f"{'request':<24} {'us/req':>10} {'req/s':>10}")
+    for label, method, path, payload in (
+        ("GET /health", "GET", "/health", b""),
+        ("POST /v1/rewrite (hit)", "POST", "/v1/rewrite", body),
+    ):
+        us = await per_request_us(app, method, path, payload, args.requests)
+        print(f"{label:<24} {us:>10.1f} {1e6 / us:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=50, help="Text length in words")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,134 @@
+"""
+Bytes saved by cache value compression against its CPU cost per get and set.
+
+Stores the same values in memory caches configured with each codec and
+reports the average stored size and the per-operation get/set time, by
+value size. Values are synthetic rewrites unless --samples points at a
+JSONL file ({"text": ...} or {"rewritten": ...} per line); the dictionary is
+trained on a separate slice of them. --save-dictionary writes it out for
+CACHE_COMPRESSION_DICTIONARY.
+
+    uv run python benchmarks/bench_compression.py
+    uv run python benchmarks/bench_compression.py --samples rewrites.jsonl --save-dictionary d.bin
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+
+from cache_adapters.providers.memory_cache import MemoryCache
+from cache_adapters.support.codec import train_dictionary, zstandard
+
+SENTENCES = [
+    "Ahoy {name}, yer order {number} be loaded on the ship and sailin' yer way.",
+    "Dear {name}, we are pleased to confirm that order {number} has been dispatched.",
+    "Arr, the crew be needin' ye to reset yer password within {number} hours, matey.",
+    "Kindly note that your subscription will renew on the {number}th of the month.",
+    "Shiver me timbers, {name}! Yer invoice for {number} doubloons be ready.",
+    "We regret to inform you that the meeting with {name} has been postponed.",
+    "Avast! The treasure map to yer account settings be hidden behind the gear icon.",
+    "Please find attached the quarterly summary prepared by {name} for review.",
+]
+NAMES = ["Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi"]
+SIZES = {"short": (1, 1), "medium": (4, 8), "long": (30, 50)}  # sentences per value
+
+
+def synthetic(rng: random.Random, sentences: tuple[int, int]) -> str:
+    return " ".join(
+        rng.choice(SENTENCES).format(name=rng.choice(NAMES), number=rng.randint(1, 9999))
+        for _ in range(rng.randint(*sentences))
+    )
+
+
+def load_samples(path: str) -> list[str]:
+    with open(path) as file:
+        rows = [json.loads(line) for line in file if line.strip()]
+    return [row.get("rewritten") or row["text"] for row in rows]
+
+
+def by_size(values: list[str]) -> dict[str, list[str]]:
+    groups: dict[str, list[str]] = {"short": [], "medium": [], "long": []}
+    for value in values:
+        size = len(value.encode())
+        groups["short" if size < 256 else "medium" if size < 2048 else "long"].append(value)
+    return {name: group for name, group in groups.items() if group}
+
+
+def measure(cache: MemoryCache, values: list[str]) -> tuple[float, float]:
+    """Per-operation set and get time in us"""
+    keys = [f"k{i}" for i in range(len(values))]
+
+    async def run() -> tuple[float, float]:
+        started = time.perf_counter()
+        for key, value in zip(keys, values):
+            await cache.set(key, value)
+        set_us = (time.perf_counter() - started) / len(values) * 1e6
+        started = time.perf_counter()
+        for key in keys:
+            await cache.get(key)
+        get_us = (time.perf_counter() - started) / len(values) * 1e6
+        return set_us, get_us
+
+    # Best of 3 against scheduler noise
+    runs = [asyncio.run(run()) for _ in range(3)]
+    return min(run[0] for run in runs), min(run[1] for run in runs)
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    if args.samples:
+        values = load_samples(args.samples)
+        rng.shuffle(values)
+    else:
+        values = [synthetic(rng, SIZES[size]) for size in SIZES for _ in range(args.values)]
+    split = max(1, len(values) // 5)
+    training, values = values[:split], values[split:]
+
+    dictionary = train_dictionary(training, args.dictionary_size)
+    with tempfile.NamedTemporaryFile(suffix=".dict", delete=False) as file:
+        file.write(dictionary)
+        dictionary_path = file.name
+    if args.save_dictionary:
+        with open(args.save_dictionary, "wb") as file:
+            file.write(dictionary)
+
+    codecs = {"none": {}, "zlib": {"compression": "zlib"}}
+    codecs["zlib+dict"] = {"compression": "zlib", "compression_dictionary": dictionary_path}
+    if zstandard is not None:
+        codecs["zstd"] = {"compression": "zstd"}
+        codecs["zstd+dict"] = {"compression": "zstd", "compression_dictionary": dictionary_path}
+
+    print(f"dictionary: {len(dictionary)} bytes from {len(training)} samples\n")
+    print(f"{'values':<8} {'codec':<10} {'bytes':>8} {'saved':>7} {'set us':>8} {'get us':>8}")
+    for size, group in by_size(values).items():
+        raw = sum(len(value.encode()) for value in group) / len(group)
+        for codec, options in codecs.items():
+            cache = MemoryCache(compression_min_bytes=args.min_bytes, **options)
+            set_us, get_us = measure(cache, group)
+            stored = sum(_stored_size(cache, f"k{i}") for i in range(len(group))) / len(group)
+            saved = 1 - stored / raw
+            print(
+                f"{size:<8} {codec:<10} {stored:>8.0f} {saved:>7.0%} {set_us:>8.1f} {get_us:>8.1f}"
+            )
+        print()
+
+
+def _stored_size(cache: MemoryCache, key: str) -> int:
+    """What the value costs on the wire and in Redis: its stored bytes"""
+    value = cache._store[key].value
+    return len(value) if isinstance(value, bytes) else len(value.encode())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", help="JSONL file of real values")
+    parser.add_argument("--values", type=int, default=500, help="Synthetic values per size")
+    # 0 by default, so short values show what a dictionary can do for them
+    parser.add_argument("--min-bytes", type=int, default=0, help="Compression threshold")
+    parser.add_argument("--dictionary-size", type=int, default=16_384)
+    parser.add_argument("--save-dictionary", help="Write the trained dictionary here")
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
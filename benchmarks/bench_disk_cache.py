@@ -0,0 +1,97 @@
+"""
+Get/set latency of the disk backend against memory and Redis at 1M+ entries.
+
+Each backend is filled with --entries values through set_many, then timed
+on --ops sequential gets of random existing keys, sets of new keys, and
+gets of missing keys. Redis is a local redis-server with --url, otherwise
+fakeredis (dev dependency group) — in-process, so it shows
+client overhead rather than network latency.
+
+    uv run python benchmarks/bench_disk_cache.py
+    uv run python benchmarks/bench_disk_cache.py --entries 5000000 --dir /mnt/ssd
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from cache_adapters.providers.disk_cache import DiskCache
+from cache_adapters.providers.memory_cache import MemoryCache
+
+
+def make_redis(url: str | None):
+    from cache_adapters.providers.redis_cache import RedisCache
+
+    if url:
+        return RedisCache(url=url)
+    try:
+        import fakeredis
+    except ImportError:
+        return None
+    return RedisCache(client=fakeredis.FakeAsyncRedis())
+
+
+async def fill(cache, entries: int, value: str) -> float:
+    started = time.perf_counter()
+    for start in range(0, entries, 10_000):
+        await cache.set_many({f"k{i}": value for i in range(start, min(entries, start + 10_000))})
+    return time.perf_counter() - started
+
+
+async def timed(operation, keys: list[str]) -> tuple[float, float]:
+    """p50 and p99 latency in us"""
+    samples = []
+    for key in keys:
+        started = time.perf_counter()
+        await operation(key)
+        samples.append((time.perf_counter() - started) * 1e6)
+    percentiles = statistics.quantiles(samples, n=100)
+    return percentiles[49], percentiles[98]
+
+
+async def run(args) -> None:
+    rng = random.Random(args.seed)
+    value = "x" * args.value_bytes
+    directory = args.dir or tempfile.mkdtemp()
+    backends = {"memory": MemoryCache()}
+    backends["disk"] = DiskCache(path=os.path.join(directory, "bench.db"), threads=args.threads)
+    redis = make_redis(args.url)
+    if redis is not None:
+        backends["redis"] = redis
+
+    print(f"entries: {args.entries}, value: {args.value_bytes} bytes, ops: {args.ops}\n")
+    print(
+        f"{'backend':<8} {'fill s':>8} {'hit p50':>9} {'hit p99':>9} "
+        f"{'set p50':>9} {'set p99':>9} {'miss p50':>9}"
+    )
+    for name, cache in backends.items():
+        fill_s = await fill(cache, args.entries, value)
+        hits = [f"k{rng.randrange(args.entries)}" for _ in range(args.ops)]
+        new = [f"new{i}" for i in range(args.ops)]
+        missing = [f"missing{i}" for i in range(args.ops)]
+        hit = await timed(cache.get, hits)
+        written = await timed(lambda key: cache.set(key, value), new)
+        miss = await timed(cache.get, missing)
+        print(
+            f"{name:<8} {fill_s:>8.1f} {hit[0]:>9.1f} {hit[1]:>9.1f} "
+            f"{written[0]:>9.1f} {written[1]:>9.1f} {miss[0]:>9.1f}"
+        )
+        await cache.clear()
+        await cache.shutdown()
+    print("\nlatencies in us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--value-bytes", type=int, default=500)
+    parser.add_argument("--ops", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=4, help="Disk reader threads")
+    parser.add_argument("--dir", help="Directory for the disk database (default: a temp dir)")
+    parser.add_argument("--url", help="Real Redis URL; fakeredis if omitted")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
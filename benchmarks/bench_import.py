@@ -0,0 +1,91 @@
+"""
+Worker startup cost: lazy adapter loading vs importing every SDK up front.
+
+Each variant runs in fresh interpreters under `python -X importtime`. It
+imports the app, resolves the mock provider and the memory cache, and
+reports import time and peak RSS. "eager" also imports every built-in
+adapter module, which is what each worker paid before adapters were
+loaded lazily.
+
+    uv run python benchmarks/bench_import.py
+    uv run python benchmarks/bench_import.py --runs 10 --top 8
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+STARTUP = """
+import resource, time
+started = time.perf_counter()
+from rewriteforge.bootstrap import app
+from cache_adapters import CacheInterface
+from llm_adapters import LLMInterface
+{extra}
+LLMInterface.resolve("mock")
+CacheInterface.resolve("memory")
+elapsed = time.perf_counter() - started
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "rss_kb": peak}}))
+"""
+
+EAGER_IMPORTS = """
+import llm_adapters.providers.anthropic_adapter
+import llm_adapters.providers.openai_adapter
+import llm_adapters.providers.router_adapter
+import llm_adapters.providers.replay_adapter
+import cache_adapters.providers.redis_cache
+import cache_adapters.providers.tiered_cache
+"""
+
+VARIANTS = {"lazy": "", "eager": EAGER_IMPORTS}
+
+
+def run(extra: str) -> tuple[dict, dict[str, int]]:
+    """One fresh interpreter; returns its timings and cumulative us per package"""
+    code = "import json\n" + STARTUP.format(extra=extra)
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    packages: dict[str, int] = {}
+    for line in done.stderr.splitlines():
+        # "import time:      self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[12:].split("|"))
+        # Top-level packages only, wherever they were first imported from;
+        # cumulative includes everything they pulled in
+        if "." not in name:
+            packages[name] = int(cumulative)
+    return json.loads(done.stdout), packages
+
+
+def main(args) -> None:
+    print(f"{'variant':<10} {'import ms':>10} {'peak RSS MB':>12}")
+    heaviest: dict[str, int] = {}
+    for variant, extra in VARIANTS.items():
+        seconds, rss = [], []
+        for _ in range(args.runs):
+            result, packages = run(extra)
+            seconds.append(result["seconds"])
+            rss.append(result["rss_kb"] / 1024)
+        if variant == "eager":
+            heaviest = packages
+        elapsed_ms = statistics.median(seconds) * 1000
+        print(f"{variant:<10} {elapsed_ms:>10.1f} {statistics.median(rss):>12.1f}")
+
+    print(f"\n{'heaviest imports (eager)':<28} {'cumulative ms':>14}")
+    for name, micros in sorted(heaviest.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{name:<28} {micros / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per variant")
+    parser.add_argument("--top", type=int, default=6, help="Heaviest packages to list")
+    main(parser.parse_args())
@@ -0,0 +1,279 @@
+"""
+Throughput and latency of the HTTP API under concurrent load, fully offline.
+
+Drives the app in-process over ASGI (default) or through a real uvicorn
+server, for cache hits, cache misses and streams, against the memory cache
+and Redis (fakeredis in-process, or a real server via --redis-url). The
+mock provider's latency profile is set with --latency / --distribution /
+--ttft / --token-delay / --error-rate so misses cost what a real provider
+would. Results are JSON; --baseline compares against an earlier run and
+exits 1 when rps or p99 regressed by more than --tolerance.
+
+    uv run python benchmarks/bench_load.py
+    uv run python benchmarks/bench_load.py --server all --output results.json
+    uv run python benchmarks/bench_load.py --baseline results.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import resource
+import socket
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+from cache_adapters.providers.redis_cache import RedisCache
+from rewriteforge.bootstrap import create_app
+
+SERVERS = ("asgi", "uvicorn")
+BACKENDS = ("memory", "redis")
+SCENARIOS = ("hit", "miss", "stream")
+
+
+def app_env(args, backend: str) -> dict[str, str]:
+    """Settings for the app under test, passed as environment variables"""
+    env = {
+        "LLM_PROVIDER": "mock",
+        "LLM_MOCK_LATENCY": str(args.latency),
+        "LLM_MOCK_DISTRIBUTION": args.distribution,
+        "LLM_MOCK_TTFT": str(args.ttft),
+        "LLM_MOCK_TOKEN_DELAY": str(args.token_delay),
+        "LLM_MOCK_FAILURE_RATE": str(args.error_rate),
+        "CACHE_BACKEND": backend,
+        "REQUEST_TIMEOUT": "0",
+    }
+    if backend == "redis" and args.redis_url:
+        env["CACHE_REDIS_URL"] = args.redis_url
+    return env
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process; peak RSS of this one where /proc is missing"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if pid == os.getpid():
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kB on Linux, bytes on macOS
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return None
+
+
+def percentile(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] if ordered else 0.0
+
+
+@asynccontextmanager
+async def asgi_target(args, backend: str):
+    os.environ.update(app_env(args, backend))
+    app = create_app()
+    if backend == "redis" and not args.redis_url:
+        import fakeredis
+
+        app.state.container.cache_adapter.override(
+            RedisCache(client=fakeredis.FakeAsyncRedis(), default_ttl=3600)
+        )
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        yield client, os.getpid()
+
+
+@asynccontextmanager
+async def uvicorn_target(args, backend: str):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    # critical: simulated provider failures would otherwise print tracebacks
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        *("-m", "uvicorn", "rewriteforge.bootstrap:app"),
+        *("--port", str(port), "--log-level", "critical"),
+        env={**os.environ, **app_env(args, backend)},
+    )
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/health")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn did not come up")
+            yield client, process.pid
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+async def run_scenario(client: httpx.AsyncClient, pid: int, scenario: str, args) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    hot = [f"Benchmark text {run_id} number {i}" for i in range(args.hot_keys)]
+    if scenario == "hit":
+        for text in hot:
+            await client.post("/v1/rewrite", json={"text": text, "style": "pirate"})
+
+    latencies: list[float] = []
+    first_bytes: list[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def request(i: int) -> bool:
+        if scenario == "hit":
+            body = {"text": hot[i % len(hot)], "style": "pirate"}
+            return (await client.post("/v1/rewrite", json=body)).status_code == 200
+
+        # Misses and streams use a fresh text every time
+        body = {"text": f"Benchmark text {run_id} unique {i}", "style": "pirate"}
+        if scenario == "miss":
+            return (await client.post("/v1/rewrite", json=body)).status_code == 200
+
+        started = time.perf_counter()
+        async with client.stream("POST", "/v1/rewrite/stream", json=body) as response:
+            chunks = response.aiter_bytes()
+            if await anext(chunks, None) is not None:
+                first_bytes.append(time.perf_counter() - started)
+            async for _ in chunks:
+                pass
+            return response.status_code == 200
+
+    async def worker() -> None:
+        nonlocal errors
+        while (i := next(counter)) < args.requests:
+            started = time.perf_counter()
+            try:
+                ok = await request(i)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "requests": args.requests,
+        "errors": errors,
+        "rps": args.requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "rss_mb": rss_mb(pid),
+    }
+    if first_bytes:
+        result["ttfb_p50_ms"] = percentile(first_bytes, 50) * 1000
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print deltas against a baseline run; return the regressed keys"""
+    regressions = []
+    print(f"\n{'vs baseline':<24} {'rps':>10} {'p99':>10}")
+    for key, result in results.items():
+        before = baseline.get("results", {}).get(key)
+        if before is None:
+            continue
+        rps_delta = result["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        p99_delta = result["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else 0.0
+        regressed = rps_delta < -tolerance or p99_delta > tolerance
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{key:<24} {rps_delta:>+10.1%} {p99_delta:>+10.1%}{flag}")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+async def main(args) -> int:
+    servers = SERVERS if args.server == "all" else (args.server,)
+    targets = {"asgi": asgi_target, "uvicorn": uvicorn_target}
+    results: dict[str, dict] = {}
+
+    print(f"{'run':<24} {'rps':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8} {'rss MB':>8}")
+    for server in servers:
+        for backend in args.backends:
+            if server == "uvicorn" and backend == "redis" and not args.redis_url:
+                print(f"{server}/{backend:<17} skipped (needs --redis-url)")
+                continue
+            async with targets[server](args, backend) as (client, pid):
+                for scenario in args.scenarios:
+                    key = f"{server}/{backend}/{scenario}"
+                    result = results[key] = await run_scenario(client, pid, scenario, args)
+                    rss = f"{result['rss_mb']:.0f}" if result["rss_mb"] else "-"
+                    print(
+                        f"{key:<24} {result['rps']:>10.0f} {result['p50_ms']:>10.2f} "
+                        f"{result['p99_ms']:>10.2f} {result['errors']:>8} {rss:>8}"
+                    )
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "profile": {
+                "latency": args.latency,
+                "distribution": args.distribution,
+                "ttft": args.ttft,
+                "token_delay": args.token_delay,
+                "error_rate": args.error_rate,
+            },
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            if compare(results, json.load(baseline), args.tolerance):
+                return 1
+    return 0
+
+
+def csv(choices: tuple[str, ...]):
+    def parse(value: str) -> list[str]:
+        items = [item for item in value.split(",") if item]
+        unknown = set(items) - set(choices)
+        if unknown:
+            raise argparse.ArgumentTypeError(f"choose from {', '.join(choices)}")
+        return items
+
+    return parse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", choices=(*SERVERS, "all"), default="asgi")
+    parser.add_argument("--backends", type=csv(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--scenarios", type=csv(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--redis-url", help="Real Redis; fakeredis (ASGI only) if omitted")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--hot-keys", type=int, default=100, help="Distinct texts for hits")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock provider seconds")
+    parser.add_argument(
+        "--distribution", choices=("fixed", "lognormal", "pareto"), default="lognormal"
+    )
+    parser.add_argument("--ttft", type=float, default=0.02, help="Seconds to first chunk")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="Seconds per chunk")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed regression")
+    sys.exit(asyncio.run(main(parser.parse_args())))
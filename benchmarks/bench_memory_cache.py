@@ -0,0 +1,105 @@
+"""
+Steady-state RSS and hit ratio of MemoryCache under a Zipfian key workload.
+
+Each configuration runs in a fresh interpreter so RSS numbers don't bleed
+into each other. Read-through pattern: get, and set on miss.
+
+    uv run python benchmarks/bench_memory_cache.py
+    uv run python benchmarks/bench_memory_cache.py --requests 500000 --keys 200000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+
+from cache_adapters.providers.memory_cache import MemoryCache
+
+CONFIGS = {
+    "unbounded": {},
+    "lru": {"max_entries": 10_000, "eviction_policy": "lru"},
+    "tinylfu": {"max_entries": 10_000, "eviction_policy": "tinylfu"},
+    "lru-bytes": {"max_bytes": 16 * 1024 * 1024, "eviction_policy": "lru"},
+}
+
+
+def rss_mb() -> float:
+    """Current resident set size; falls back to peak RSS off Linux"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def zipf_keys(n_keys: int, n_requests: int, skew: float, seed: int) -> list[int]:
+    rng = random.Random(seed)
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, n_keys + 1):
+        total += 1.0 / rank**skew
+        cum_weights.append(total)
+    return rng.choices(range(n_keys), cum_weights=cum_weights, k=n_requests)
+
+
+async def run(config: str, n_keys: int, n_requests: int, skew: float, value_size: int) -> dict:
+    keys = zipf_keys(n_keys, n_requests, skew, seed=42)
+    value = "v" * value_size
+    cache = MemoryCache(**CONFIGS[config])
+    baseline_rss = rss_mb()
+
+    start = time.perf_counter()
+    for k in keys:
+        key = f"rewrite:{k}"
+        if await cache.get(key) is None:
+            await cache.set(key, f"{value}{k}")
+    elapsed = time.perf_counter() - start
+
+    stats = cache.stats()
+    return {
+        "config": config,
+        "hit_ratio": round(stats["hits"] / n_requests, 4),
+        "entries": stats["entries"],
+        "evictions": stats["evictions"],
+        "rss_growth_mb": round(rss_mb() - baseline_rss, 1),
+        "ops_per_sec": round(2 * n_requests / elapsed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--config", choices=CONFIGS)
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=300_000)
+    parser.add_argument("--skew", type=float, default=0.9)
+    parser.add_argument("--value-size", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.config:
+        result = asyncio.run(run(args.config, args.keys, args.requests, args.skew, args.value_size))
+        print(json.dumps(result))
+        return
+
+    header = ("config", "hit ratio", "entries", "evictions", "RSS MB", "ops/s")
+    print("{:<10} {:>9} {:>8} {:>9} {:>7} {:>9}".format(*header))
+    for config in CONFIGS:
+        out = subprocess.run(
+            [sys.executable, __file__, "--config", config, *sys.argv[1:]],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        r = json.loads(out.stdout)
+        print(
+            f"{r['config']:<10} {r['hit_ratio']:>9.2%} {r['entries']:>8} "
+            f"{r['evictions']:>9} {r['rss_growth_mb']:>7} {r['ops_per_sec']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
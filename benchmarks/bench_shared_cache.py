@@ -0,0 +1,118 @@
+"""
+Hit rate and get latency across worker processes: shared vs per-process caches.
+
+Starts --processes workers that each serve --requests lookups of Zipf-
+distributed keys, storing the value on a miss as RewriteService does. With
+`memory` every worker has a private cache (the host's budget of --slots
+entries split between them); with `shared` they all use one memory-mapped
+table of --slots slots; `redis` (with --url) is one local Redis server.
+
+    uv run python benchmarks/bench_shared_cache.py
+    uv run python benchmarks/bench_shared_cache.py --processes 16 --url redis://localhost:6379
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from cache_adapters.providers.memory_cache import MemoryCache
+from cache_adapters.providers.shared_cache import SharedMemoryCache
+
+
+def make_cache(backend: str, args):
+    if backend == "memory":
+        return MemoryCache(max_entries=args.slots // args.processes)
+    if backend == "shared":
+        return SharedMemoryCache(
+            shared_path=args.shared_path, slots=args.slots, slot_size=args.slot_size
+        )
+    from cache_adapters.providers.redis_cache import RedisCache
+
+    return RedisCache(url=args.url)
+
+
+def worker(backend: str, args, seed: int, start) -> tuple[int, list[float]]:
+    """Hits and per-get latencies (seconds) of one process"""
+    rng = random.Random(seed)
+    weights = [1 / (rank**args.zipf) for rank in range(1, args.keys + 1)]
+    keys = rng.choices(range(args.keys), cum_weights=list(_accumulate(weights)), k=args.requests)
+    value = "x" * args.value_size
+
+    async def run() -> tuple[int, list[float]]:
+        cache = make_cache(backend, args)
+        hits, latencies = 0, []
+        start.wait()
+        for key in keys:
+            started = time.perf_counter()
+            found = await cache.get(f"key:{key}")
+            latencies.append(time.perf_counter() - started)
+            if found is None:
+                await cache.set(f"key:{key}", value)
+            else:
+                hits += 1
+        await cache.shutdown()
+        return hits, latencies
+
+    return asyncio.run(run())
+
+
+def _accumulate(weights: list[float]):
+    total = 0.0
+    for weight in weights:
+        total += weight
+        yield total
+
+
+def measure(backend: str, args) -> tuple[float, float, float]:
+    """Hit rate, p50 and p99 get latency in us over all processes"""
+    context = multiprocessing.get_context("fork")
+    start = context.Manager().Event()
+    with context.Pool(args.processes) as pool:
+        results = [
+            pool.apply_async(worker, (backend, args, args.seed + i, start))
+            for i in range(args.processes)
+        ]
+        time.sleep(0.5)  # Let every worker get to the start line
+        start.set()
+        outcomes = [result.get() for result in results]
+    hits = sum(outcome[0] for outcome in outcomes)
+    latencies = sorted(latency for outcome in outcomes for latency in outcome[1])
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return hits / len(latencies), statistics.median(latencies) * 1e6, p99 * 1e6
+
+
+def main(args) -> None:
+    print(
+        f"{args.processes} processes x {args.requests} gets, {args.keys} keys "
+        f"(zipf {args.zipf}), {args.slots} entries per host\n"
+    )
+    print(f"{'backend':<8} {'hit rate':>9} {'p50 us':>8} {'p99 us':>8}")
+    backends = ["memory", "shared"] + (["redis"] if args.url else [])
+    for backend in backends:
+        if backend == "shared":
+            args.shared_path = os.path.join(tempfile.mkdtemp(), "bench-shared-cache")
+        hit_rate, p50, p99 = measure(backend, args)
+        if backend == "shared":
+            os.remove(args.shared_path)
+        print(f"{backend:<8} {hit_rate:>9.1%} {p50:>8.1f} {p99:>8.1f}")
+    if not args.url:
+        print("\n(pass --url redis://localhost:6379 for the redis row)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=50_000, help="Gets per process")
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--zipf", type=float, default=0.9)
+    parser.add_argument("--slots", type=int, default=32_768, help="Host-wide entry budget")
+    parser.add_argument("--slot-size", type=int, default=1024)
+    parser.add_argument("--value-size", type=int, default=500)
+    parser.add_argument("--url", help="Local Redis, e.g. redis://localhost:6379")
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
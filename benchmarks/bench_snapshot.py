@@ -0,0 +1,56 @@
+"""
+Warm-restart cost: saving a MemoryCache snapshot and loading it at startup.
+
+Fills a cache with --entries values of --value-bytes each, saves it, then
+times a fresh cache's startup (mmap + index of keys) and the first read of
+every value, which is when values are paged in from the file.
+
+    uv run python benchmarks/bench_snapshot.py
+    uv run python benchmarks/bench_snapshot.py --entries 1000000 --value-bytes 2000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from cache_adapters.providers.memory_cache import MemoryCache
+
+
+async def run(args) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "cache.snapshot")
+    cache = MemoryCache(snapshot_path=path)
+    value = "x" * args.value_bytes
+    for i in range(args.entries):
+        await cache.set(f"rewrite:v1:mock::formal:{i:016x}", value)
+
+    started = time.perf_counter()
+    await cache.save_snapshot()
+    save_s = time.perf_counter() - started
+    size_mb = os.path.getsize(path) / 1e6
+    del cache
+
+    restarted = MemoryCache(snapshot_path=path)
+    started = time.perf_counter()
+    await restarted.startup()
+    load_s = time.perf_counter() - started
+
+    keys = list(restarted._store)
+    started = time.perf_counter()
+    for key in keys:
+        await restarted.get(key)
+    first_read_us = (time.perf_counter() - started) / len(keys) * 1e6
+
+    print(f"entries: {args.entries}, snapshot: {size_mb:.0f} MB")
+    print(f"save:       {save_s:8.2f} s ({size_mb / save_s:.0f} MB/s)")
+    print(f"startup:    {load_s:8.2f} s ({args.entries / load_s / 1e3:.0f}k entries/s)")
+    print(f"first read: {first_read_us:8.2f} us per value")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--value-bytes", type=int, default=1000)
+    asyncio.run(run(parser.parse_args()))
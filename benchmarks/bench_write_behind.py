@@ -0,0 +1,78 @@
+"""
+Time a cache miss spends storing its rewrite: direct set vs write-behind.
+
+Concurrent "requests" each store one value, as RewriteService does after
+an LLM call, into a memory cache that adds a simulated network round trip
+(--rtt-ms) per command, the way Redis would. Reports the store time each
+request waits for, and how many round trips reached the backend.
+
+    uv run python benchmarks/bench_write_behind.py
+    uv run python benchmarks/bench_write_behind.py --requests 5000 --rtt-ms 2
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from cache_adapters.providers.memory_cache import MemoryCache
+from cache_adapters.support.write_behind import WriteBehindCache
+
+
+class RemoteCache(MemoryCache):
+    """Memory cache with one simulated round trip per set / set_many"""
+
+    def __init__(self, rtt: float):
+        super().__init__()
+        self.rtt = rtt
+        self.round_trips = 0
+
+    async def set(self, key, value, ttl=None):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+        await super().set(key, value, ttl)
+
+    async def set_many(self, items, ttl=None):
+        self.round_trips += 1
+        await asyncio.sleep(self.rtt)
+        await super().set_many(items, ttl)
+
+
+async def run(args, write_behind: bool) -> tuple[list[float], float, int]:
+    backend = RemoteCache(args.rtt_ms / 1000)
+    cache = WriteBehindCache.wrap(backend, enabled=write_behind, batch_size=args.batch_size)
+    value = "x" * args.value_size
+    waits: list[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def request(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await cache.set(f"key:{i}", value, ttl=3600)
+            waits.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(args.requests)))
+    await cache.shutdown()  # write-behind: flush what is still queued
+    return waits, time.perf_counter() - started, backend.round_trips
+
+
+def main(args) -> None:
+    print(f"{args.requests} stores, {args.concurrency} concurrent, {args.rtt_ms} ms round trip\n")
+    print(f"{'mode':<14} {'p50 us':>9} {'p99 us':>9} {'total s':>8} {'round trips':>12}")
+    for mode, write_behind in (("direct", False), ("write-behind", True)):
+        waits, total, trips = asyncio.run(run(args, write_behind))
+        waits.sort()
+        p50 = statistics.median(waits) * 1e6
+        p99 = waits[int(len(waits) * 0.99) - 1] * 1e6
+        print(f"{mode:<14} {p50:>9.1f} {p99:>9.1f} {total:>8.2f} {trips:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--value-size", type=int, default=500)
+    main(parser.parse_args())
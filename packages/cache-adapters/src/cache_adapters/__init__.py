@@ -1,5 +1,11 @@
-# Import providers to trigger __init_subclass__ registration
-from cache_adapters import providers  # noqa: F401
 from cache_adapters.contracts.cache_interface import CacheInterface
 
+# Built-in backends, imported on first resolve() so memory-only workers
+# never load the Redis client
+CacheInterface.register_lazy("memory", "cache_adapters.providers.memory_cache:MemoryCache")
+CacheInterface.register_lazy("redis", "cache_adapters.providers.redis_cache:RedisCache")
+CacheInterface.register_lazy("tiered", "cache_adapters.providers.tiered_cache:TieredCache")
+CacheInterface.register_lazy("disk", "cache_adapters.providers.disk_cache:DiskCache")
+CacheInterface.register_lazy("shared", "cache_adapters.providers.shared_cache:SharedMemoryCache")
+
 __all__ = ["CacheInterface"]
@@ -1,3 +1,3 @@
-from cache_adapters.contracts.cache_interface import CacheInterface
+from cache_adapters.contracts.cache_interface import CacheInterface, ttl_for
 
-__all__ = ["CacheInterface"]
+__all__ = ["CacheInterface", "ttl_for"]
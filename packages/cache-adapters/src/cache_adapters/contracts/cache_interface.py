@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from importlib import import_module
+from importlib.metadata import entry_points
 from typing import Optional
 
+# Third-party backends register here: [project.entry-points.cache_adapters]
+ENTRY_POINT_GROUP = "cache_adapters"
+
 
 class CacheInterface(ABC):
     """
@@ -8,9 +14,13 @@ class CacheInterface(ABC):
 
     Subclasses auto-register via __init_subclass__.
     Just declare `name = "backend"` and you're in the registry.
+
+    Backends can also be registered lazily by import path or entry point
+    and are only imported once resolve() picks them.
     """
 
     _registry: dict[str, type["CacheInterface"]] = {}
+    _lazy: dict[str, str] = {}  # name -> "module:Class"
 
     name: str  # Each adapter declares its registry key
 
@@ -19,20 +29,43 @@ class CacheInterface(ABC):
         if hasattr(cls, "name") and cls.name:
             CacheInterface._registry[cls.name] = cls
 
+    @classmethod
+    def register_lazy(cls, name: str, target: str) -> None:
+        """Register a backend by "module:Class" path without importing it"""
+        CacheInterface._lazy.setdefault(name, target)
+
+    @classmethod
+    def _load(cls, name: str) -> Optional[type["CacheInterface"]]:
+        """Import a lazily registered or entry-point backend"""
+        target = cls._lazy.get(name)
+        if target is not None:
+            module, _, attr = target.partition(":")
+            backend = getattr(import_module(module), attr)
+        else:
+            found = entry_points(group=ENTRY_POINT_GROUP, name=name)
+            if not found:
+                return None
+            backend = next(iter(found)).load()
+        CacheInterface._registry[name] = backend
+        return backend
+
     @classmethod
     def resolve(cls, name: str, **kwargs) -> "CacheInterface":
         """Resolve adapter by name from registry"""
-        if name not in cls._registry:
-            available = ", ".join(cls._registry.keys())
+        backend = cls._registry.get(name) or cls._load(name)
+        if backend is None:
+            available = ", ".join(cls.available())
             raise KeyError(f"Unknown cache backend '{name}'. Available: {available}")
 
         kwargs = {k: v for k, v in kwargs.items() if v}
-        return cls._registry[name](**kwargs)
+        return backend(**kwargs)
 
     @classmethod
     def available(cls) -> list[str]:
-        """List all registered backend names"""
-        return list(cls._registry.keys())
+        """List all backend names — imported, lazy and entry points"""
+        names = [*cls._registry, *cls._lazy]
+        names += [entry.name for entry in entry_points(group=ENTRY_POINT_GROUP)]
+        return list(dict.fromkeys(names))
 
     @abstractmethod
     async def get(self, key: str) -> Optional[str]:
@@ -53,3 +86,59 @@ class CacheInterface(ABC):
     async def clear(self) -> None:
         """Clear all cache entries"""
         pass
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        """
+        Get several values at once.
+
+        Returns values aligned with `keys`, None for misses. Default
+        implementation loops over get() — backends should override it to
+        batch round trips.
+        """
+        return [await self.get(key) for key in keys]
+
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        ttl: Optional[int | Mapping[str, int]] = None,
+    ) -> None:
+        """
+        Set several values at once.
+
+        Args:
+            items: key -> value
+            ttl: One TTL for all keys, or a per-key mapping (missing keys
+                fall back to the default TTL)
+        """
+        for key, value in items.items():
+            await self.set(key, value, ttl_for(ttl, key))
+
+    async def startup(self) -> None:
+        """Start background work (called from app lifespan)"""
+
+    async def shutdown(self) -> None:
+        """Stop background work and release resources"""
+
+    async def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """
+        Set value only if key is absent. Returns True if the value was stored.
+
+        Default implementation is only atomic for in-process backends that
+        never yield between get and set — shared backends should override
+        it (e.g. Redis SET NX).
+        """
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    def stats(self) -> dict[str, float]:
+        """Backend counters (hits, misses, evictions...) for metrics export"""
+        return {}
+
+
+def ttl_for(ttl: Optional[int | Mapping[str, int]], key: str) -> Optional[int]:
+    """Pick a key's TTL from a set_many() ttl argument"""
+    if isinstance(ttl, Mapping):
+        return ttl.get(key)
+    return ttl
@@ -1,4 +1,19 @@
-from cache_adapters.providers.memory_cache import MemoryCache
-from cache_adapters.providers.redis_cache import RedisCache
+from importlib import import_module
 
-__all__ = ["MemoryCache", "RedisCache"]
+# Resolved on attribute access so importing the memory cache doesn't
+# drag in redis
+_PROVIDERS = {
+    "MemoryCache": "cache_adapters.providers.memory_cache",
+    "RedisCache": "cache_adapters.providers.redis_cache",
+    "TieredCache": "cache_adapters.providers.tiered_cache",
+    "DiskCache": "cache_adapters.providers.disk_cache",
+    "SharedMemoryCache": "cache_adapters.providers.shared_cache",
+}
+
+__all__ = list(_PROVIDERS)
+
+
+def __getattr__(name: str):
+    if name not in _PROVIDERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_PROVIDERS[name]), name)
@@ -0,0 +1,324 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, TypeVar
+
+from cache_adapters.contracts import CacheInterface, ttl_for
+from cache_adapters.support.codec import ValueCodec
+
+T = TypeVar("T")
+
+# size and expires_at come before the value, so totals and expiry scans
+# never read a large value's overflow pages
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    expires_at REAL,
+    size INTEGER NOT NULL,
+    value BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)
+    WHERE expires_at IS NOT NULL;
+"""
+_LIVE = "(expires_at IS NULL OR expires_at > ?)"
+_GET = f"SELECT value FROM entries WHERE key = ? AND {_LIVE}"
+# REPLACE deletes and re-inserts, so rowid order is write order
+_SET = "INSERT OR REPLACE INTO entries (key, expires_at, size, value) VALUES (?, ?, ?, ?)"
+_ADD = """
+INSERT INTO entries (key, expires_at, size, value) VALUES (?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    expires_at = excluded.expires_at, size = excluded.size, value = excluded.value
+WHERE entries.expires_at IS NOT NULL AND entries.expires_at <= ?
+"""
+_DELETE_EXPIRED = "DELETE FROM entries WHERE expires_at <= ?"
+_TOTALS = "SELECT count(*), coalesce(sum(size), 0) FROM entries"
+# Oldest writes first, until at least `removed` rows and `freed` bytes are gone
+_EVICT = """
+DELETE FROM entries WHERE rowid <= (
+    SELECT rowid FROM (
+        SELECT rowid, row_number() OVER w AS removed, sum(size) OVER w AS freed
+        FROM entries WINDOW w AS (ORDER BY rowid)
+    )
+    WHERE removed >= ? AND freed >= ?
+    ORDER BY rowid LIMIT 1
+) RETURNING size
+"""
+_ROW_OVERHEAD = 32  # Approximate per-row bytes beyond key and value
+_BUSY_TIMEOUT_MS = 5_000
+# Errors that mean the file itself is unusable; anything else (a lock held
+# by another worker starting up) must not cost the shared database
+_CORRUPTION = (sqlite3.SQLITE_NOTADB, sqlite3.SQLITE_CORRUPT)
+_MMAP_BYTES = 256 * 1024 * 1024
+
+
+class DiskCache(CacheInterface):
+    name = "disk"  # Auto-registered!
+
+    """
+    SQLite-backed local cache for working sets larger than RAM.
+
+    The database runs in WAL mode: readers never wait for the writer, and a
+    crash loses at most the last transactions, never the file. Queries run
+    on a dedicated thread pool — `threads` readers and one writer — so the
+    event loop never blocks on disk. Several processes can share one file.
+
+    Every `compaction_interval` seconds (and at startup) expired rows are
+    deleted, the oldest-written entries are evicted past `max_entries` /
+    `max_bytes`, and freed pages are returned to the filesystem; between
+    runs the bounds may be overshot. A file that is not a readable database
+    is moved aside to `<path>.corrupt` and the cache starts empty.
+
+    Values are stored as UTF-8 or, with `compression`, behind the codec
+    header shared with the memory and Redis backends.
+    """
+
+    def __init__(
+        self,
+        path: str = "rewriteforge-cache.db",
+        default_ttl: Optional[int] = None,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        threads: int = 4,
+        compaction_interval: float = 60.0,
+        batch_size: int = 500,
+        compression: str = "none",
+        compression_level: Optional[int] = None,
+        compression_min_bytes: int = 256,
+        compression_dictionary: Optional[str] = None,
+        **kwargs,
+    ):
+        self._path = path
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._threads = threads
+        self._compaction_interval = compaction_interval
+        self._batch_size = batch_size
+        self._codec = ValueCodec.create(
+            compression, compression_level, compression_min_bytes, compression_dictionary
+        )
+        self._reader = self._codec or ValueCodec()
+
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._readers: Optional[ThreadPoolExecutor] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._compaction_task: Optional[asyncio.Task] = None
+
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._evictions = 0
+        self._compactions = 0
+        self._entries = 0
+        self._bytes = 0
+        self._recovered = self._open()
+
+    def _open(self) -> int:
+        """Create the database; returns 1 if a corrupt one had to be replaced"""
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            self._create_schema()
+            return 0
+        except sqlite3.DatabaseError as exc:
+            if exc.sqlite_errorcode & 0xFF not in _CORRUPTION:
+                raise
+            os.replace(self._path, f"{self._path}.corrupt")
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(self._path + suffix):
+                    os.remove(self._path + suffix)
+            self._create_schema()
+            return 1
+
+    def _create_schema(self) -> None:
+        connection = sqlite3.connect(self._path, isolation_level=None)
+        try:
+            # Other workers may be creating the same file right now
+            connection.execute(f"PRAGMA busy_timeout = {_BUSY_TIMEOUT_MS}")
+            # Only takes effect on a new file, before the first table
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, isolation_level=None, check_same_thread=False)
+            # WAL + NORMAL: no fsync per commit, the file stays consistent
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute(f"PRAGMA busy_timeout = {_BUSY_TIMEOUT_MS}")
+            connection.execute(f"PRAGMA mmap_size = {_MMAP_BYTES}")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    async def _read(self, fn: Callable[..., T], *args) -> T:
+        if self._readers is None:
+            self._readers = ThreadPoolExecutor(self._threads, "disk-cache-read")
+        return await asyncio.get_running_loop().run_in_executor(self._readers, fn, *args)
+
+    async def _write(self, fn: Callable[..., T], *args) -> T:
+        # One writer thread: writes queue here instead of on SQLite's lock
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(1, "disk-cache-write")
+        return await asyncio.get_running_loop().run_in_executor(self._writer, fn, *args)
+
+    def _row(self, key: str, value: str, ttl: Optional[int], now: float) -> tuple:
+        ttl = ttl or self._default_ttl
+        stored = value if self._codec is None else self._codec.encode(value)
+        if isinstance(stored, str):
+            stored = stored.encode()
+        return key, now + ttl if ttl else None, len(key) + len(stored) + _ROW_OVERHEAD, stored
+
+    def _decode(self, stored: Optional[bytes]) -> Optional[str]:
+        value = self._reader.decode(stored) if stored is not None else None
+        if value is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return value
+
+    def _select(self, key: str, now: float) -> Optional[bytes]:
+        row = self._connection().execute(_GET, (key, now)).fetchone()
+        return row[0] if row else None
+
+    def _select_many(self, keys: Sequence[str], now: float) -> dict[str, bytes]:
+        query = (
+            f"SELECT key, value FROM entries WHERE key IN ({','.join('?' * len(keys))}) AND {_LIVE}"
+        )
+        return dict(self._connection().execute(query, (*keys, now)))
+
+    def _execute(self, query: str, parameters: tuple = ()) -> int:
+        return self._connection().execute(query, parameters).rowcount
+
+    def _insert_many(self, rows: list[tuple]) -> None:
+        connection = self._connection()
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(_SET, rows)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._decode(await self._read(self._select, key, time.time()))
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        await self._write(self._execute, _SET, self._row(key, value, ttl, time.time()))
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        now = time.time()
+        results: list[Optional[str]] = []
+        for start in range(0, len(keys), self._batch_size):
+            chunk = keys[start : start + self._batch_size]
+            found = await self._read(self._select_many, chunk, now)
+            results.extend(self._decode(found.get(key)) for key in chunk)
+        return results
+
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        ttl: Optional[int | Mapping[str, int]] = None,
+    ) -> None:
+        if not items:
+            return
+        now = time.time()
+        rows = [self._row(key, value, ttl_for(ttl, key), now) for key, value in items.items()]
+        # One transaction: one WAL commit instead of one per key
+        await self._write(self._insert_many, rows)
+
+    async def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """Atomic across processes: one upsert that only replaces expired rows"""
+        now = time.time()
+        row = self._row(key, value, ttl, now)
+        return await self._write(self._execute, _ADD, (*row, now)) == 1
+
+    async def delete(self, key: str) -> None:
+        await self._write(self._execute, "DELETE FROM entries WHERE key = ?", (key,))
+
+    async def clear(self) -> None:
+        await self._write(self._execute, "DELETE FROM entries")
+        await self.compact()
+
+    async def compact(self) -> None:
+        """Purge expired rows, enforce the size bounds and release free pages"""
+        expired, evicted, self._entries, self._bytes = await self._write(self._compact, time.time())
+        self._expirations += expired
+        self._evictions += evicted
+        self._compactions += 1
+
+    def _compact(self, now: float) -> tuple[int, int, int, int]:
+        connection = self._connection()
+        expired = connection.execute(_DELETE_EXPIRED, (now,)).rowcount
+        entries, size = connection.execute(_TOTALS).fetchone()
+        excess_entries = entries - self._max_entries if self._max_entries else 0
+        excess_bytes = size - self._max_bytes if self._max_bytes else 0
+        evicted = 0
+        if excess_entries > 0 or excess_bytes > 0:
+            freed = connection.execute(_EVICT, (excess_entries, excess_bytes)).fetchall()
+            evicted = len(freed)
+            entries -= evicted
+            size -= sum(row[0] for row in freed)
+        connection.execute("PRAGMA incremental_vacuum").fetchall()
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        return expired, evicted, entries, size
+
+    async def _compaction_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._compaction_interval)
+            await self.compact()
+
+    async def startup(self) -> None:
+        await self.compact()
+        if self._compaction_interval > 0 and self._compaction_task is None:
+            self._compaction_task = asyncio.create_task(self._compaction_loop())
+
+    async def shutdown(self) -> None:
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            try:
+                await self._compaction_task
+            except asyncio.CancelledError:
+                pass
+            self._compaction_task = None
+        if self._writer is not None:
+            await self._write(self._execute, "PRAGMA wal_checkpoint(TRUNCATE)")
+        await asyncio.to_thread(self._close)
+
+    def _close(self) -> None:
+        for executor in (self._readers, self._writer):
+            if executor is not None:
+                executor.shutdown()
+        self._readers = self._writer = None
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        # Threads are gone; a later call opens fresh connections
+        self._local = threading.local()
+
+    def stats(self) -> dict[str, float]:
+        """Hit/miss counters; entries and bytes as of the last compaction"""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "entries": self._entries,
+            "bytes": self._bytes,
+            "compactions": self._compactions,
+            "recovered": self._recovered,
+            **(self._codec.stats() if self._codec is not None else {}),
+        }
@@ -1,37 +1,346 @@
+import asyncio
+import os
+import sys
 import time
-from typing import Dict, Optional, Tuple
+from collections.abc import Mapping, Sequence
+from typing import Dict, Optional
 
-from cache_adapters.contracts import CacheInterface
+from cache_adapters.contracts import CacheInterface, ttl_for
+from cache_adapters.support.codec import ValueCodec
+from cache_adapters.support.eviction import EvictionPolicy
+from cache_adapters.support.snapshot import (
+    MappedValue,
+    SnapshotError,
+    read_snapshot,
+    write_snapshot,
+)
+from cache_adapters.support.timing_wheel import TimingWheel
+
+
+class _Entry:
+    """Compact cache entry — __slots__ keeps per-entry overhead low"""
+
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: str | bytes | MappedValue, expires_at: Optional[float], size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+_ENTRY_OVERHEAD = sys.getsizeof(_Entry("", None, 0))
 
 
 class MemoryCache(CacheInterface):
     name = "memory"  # Auto-registered!
 
-    """In-memory cache with optional TTL support"""
+    """
+    In-memory cache with optional TTL support.
+
+    Unbounded by default. Set `max_entries` and/or `max_bytes` to bound it;
+    the `eviction_policy` ("lru" or "tinylfu") then picks what to drop.
+
+    Expiry is lazy (checked on get) unless `active_expiry` is set: a timing
+    wheel then tracks deadlines and a background task started by `startup()`
+    purges expired entries every `expiry_interval` seconds, spending at most
+    `expiry_budget_ms` per run.
+
+    With `compression` ("zlib" or "zstd") values of at least
+    `compression_min_bytes` are held compressed, so a `max_bytes` budget
+    fits more entries at the cost of a decompression per hit.
+
+    With `snapshot_path`, `startup()` memory-maps the snapshot left by the
+    previous process and serves its live entries right away — values are
+    only read from the file when first requested. Live entries are written
+    back every `snapshot_interval` seconds (0 = only on shutdown) and by
+    `shutdown()`.
+    """
 
-    def __init__(self, default_ttl: Optional[int] = None, **kwargs):
-        self._store: Dict[str, Tuple[str, Optional[float]]] = {}
+    def __init__(
+        self,
+        default_ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction_policy: str = "lru",
+        active_expiry: bool = False,
+        expiry_interval: float = 1.0,
+        expiry_budget_ms: float = 5.0,
+        compression: str = "none",
+        compression_level: Optional[int] = None,
+        compression_min_bytes: int = 256,
+        compression_dictionary: Optional[str] = None,
+        snapshot_path: Optional[str] = None,
+        snapshot_interval: float = 0,
+        **kwargs,
+    ):
+        self._store: Dict[str, _Entry] = {}
         self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bounded = bool(max_entries or max_bytes)
+        self._policy = EvictionPolicy.resolve(eviction_policy, capacity=max_entries or 10_000)
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._wheel = TimingWheel(tick=expiry_interval) if active_expiry else None
+        self._expiry_interval = expiry_interval
+        self._expiry_budget = expiry_budget_ms / 1000
+        self._expiry_task: Optional[asyncio.Task] = None
+        self._purged = 0
+        self._purged_bytes = 0
+        self._purge_runs = 0
+        self._purge_budget_exhausted = 0
+        self._codec = ValueCodec.create(
+            compression, compression_level, compression_min_bytes, compression_dictionary
+        )
+        self._reader = self._codec or ValueCodec()
+        self._snapshot_path = snapshot_path
+        self._snapshot_interval = snapshot_interval
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._snapshot_lock = asyncio.Lock()
+        self._snapshot_loaded = 0
+        self._snapshot_saved = 0
+        self._snapshot_writes = 0
+        self._snapshot_rejected = 0
 
     async def get(self, key: str) -> Optional[str]:
-        if key not in self._store:
-            return None
+        return self._get(key, time.time())
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        now = time.time()
+        return [self._get(key, now) for key in keys]
 
-        value, expires_at = self._store[key]
+    def _get(self, key: str, now: float) -> Optional[str]:
+        if self._bounded:
+            self._policy.record(key)
 
-        if expires_at and time.time() > expires_at:
-            del self._store[key]
+        entry = self._store.get(key)
+        if entry is None:
+            self._misses += 1
             return None
 
-        return value
+        if entry.expires_at and now > entry.expires_at:
+            self._discard(key)
+            self._expirations += 1
+            self._misses += 1
+            return None
+
+        if self._bounded:
+            self._policy.touch(key)
+        self._hits += 1
+        value = entry.value
+        if value.__class__ is MappedValue:
+            # First read since the snapshot was loaded
+            value = entry.value = value.load()
+        if value.__class__ is str:
+            return value
+        # Compressed, possibly by a snapshot written with other settings
+        return self._reader.decode(value)
 
     async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self._set(key, value, ttl, time.time())
+
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        ttl: Optional[int | Mapping[str, int]] = None,
+    ) -> None:
+        now = time.time()
+        for key, value in items.items():
+            self._set(key, value, ttl_for(ttl, key), now)
+
+    def _set(self, key: str, value: str, ttl: Optional[int], now: float) -> None:
         ttl = ttl or self._default_ttl
-        expires_at = time.time() + ttl if ttl else None
-        self._store[key] = (value, expires_at)
+        expires_at = now + ttl if ttl else None
+        stored = value if self._codec is None else self._codec.encode(value)
+        self._put(key, stored, expires_at)
+
+    def _put(
+        self, key: str, stored: str | bytes | MappedValue, expires_at: Optional[float]
+    ) -> None:
+        if self._wheel is not None:
+            if expires_at:
+                self._wheel.schedule(key, expires_at)
+            else:
+                self._wheel.cancel(key)
+
+        if not self._bounded:
+            self._store[key] = _Entry(stored, expires_at, 0)
+            return
+
+        value_size = len(stored) if stored.__class__ is MappedValue else sys.getsizeof(stored)
+        size = _ENTRY_OVERHEAD + sys.getsizeof(key) + value_size
+        if self._max_bytes and size > self._max_bytes:
+            # Never fits — storing it would just flush everything else
+            self._discard(key)
+            return
+
+        existing = self._store.get(key)
+        if existing is not None:
+            self._bytes += size - existing.size
+            existing.value, existing.expires_at, existing.size = stored, expires_at, size
+            self._policy.touch(key)
+        else:
+            self._store[key] = _Entry(stored, expires_at, size)
+            self._bytes += size
+            self._policy.insert(key)
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop victims until both the entry and byte budgets are met"""
+        while (self._max_entries and len(self._store) > self._max_entries) or (
+            self._max_bytes and self._bytes > self._max_bytes
+        ):
+            victim = self._policy.victim()
+            if victim is None:
+                break
+            entry = self._store.pop(victim, None)
+            if entry is not None:
+                self._bytes -= entry.size
+                self._evictions += 1
+                if self._wheel is not None:
+                    self._wheel.cancel(victim)
+
+    def _discard(self, key: str) -> None:
+        entry = self._store.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            if self._bounded:
+                self._policy.remove(key)
+            if self._wheel is not None:
+                self._wheel.cancel(key)
 
     async def delete(self, key: str) -> None:
-        self._store.pop(key, None)
+        self._discard(key)
 
     async def clear(self) -> None:
         self._store.clear()
+        self._policy.clear()
+        self._bytes = 0
+        if self._wheel is not None:
+            self._wheel.clear()
+
+    async def startup(self) -> None:
+        if self._snapshot_path:
+            self.load_snapshot()
+            if self._snapshot_interval > 0 and self._snapshot_task is None:
+                self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+        if self._wheel is not None and self._expiry_task is None:
+            self._expiry_task = asyncio.create_task(self._expiry_loop())
+
+    async def shutdown(self) -> None:
+        for task in (self._expiry_task, self._snapshot_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._expiry_task = self._snapshot_task = None
+        if self._snapshot_path:
+            await self.save_snapshot()
+
+    def load_snapshot(self, path: Optional[str] = None) -> int:
+        """
+        Add the live entries of a snapshot; returns how many were loaded.
+
+        Entries saved without an expiry (a pre-warmed snapshot) get
+        `default_ttl` from now. A missing file is an empty cache. An
+        unreadable one (another format version) is skipped and counted as
+        `snapshot_rejected`.
+        """
+        path = path or self._snapshot_path
+        if not path or not os.path.exists(path):
+            return 0
+        loaded = 0
+        default_expiry = time.time() + self._default_ttl if self._default_ttl else None
+        try:
+            for key, value, expires_at in read_snapshot(path):
+                self._put(key, value, expires_at or default_expiry)
+                loaded += 1
+        except SnapshotError:
+            self._snapshot_rejected += 1
+        self._snapshot_loaded += loaded
+        return loaded
+
+    async def save_snapshot(self, path: Optional[str] = None) -> int:
+        """
+        Write live entries to a snapshot; returns how many were written.
+
+        Entries are copied on the event loop and the file written in a
+        thread, so serving continues while a large cache is saved.
+        """
+        path = path or self._snapshot_path
+        if not path:
+            return 0
+        async with self._snapshot_lock:
+            # Entries are updated in place, so copy their fields, not them
+            items = [(key, entry.value, entry.expires_at) for key, entry in self._store.items()]
+            saved = await asyncio.to_thread(write_snapshot, path, items)
+        self._snapshot_saved = saved
+        self._snapshot_writes += 1
+        return saved
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._snapshot_interval)
+            await self.save_snapshot()
+
+    async def _expiry_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._expiry_interval)
+            self.purge_expired()
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """
+        Remove entries whose deadline has passed, within the time budget.
+
+        Only keys due by `now` are touched. Returns how many were removed.
+        """
+        if self._wheel is None:
+            return 0
+
+        now = time.time() if now is None else now
+        due = self._wheel.advance(now, budget=self._expiry_budget)
+        self._purge_runs += 1
+        if self._wheel.pending(now):
+            self._purge_budget_exhausted += 1
+
+        purged = 0
+        for key in due:
+            entry = self._store.get(key)
+            if entry is None or not entry.expires_at or entry.expires_at > now:
+                continue
+            self._purged_bytes += entry.size
+            self._discard(key)
+            purged += 1
+
+        self._purged += purged
+        return purged
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "entries": len(self._store),
+            "bytes": self._bytes,
+            "purged": self._purged,
+            "purged_bytes": self._purged_bytes,
+            "purge_runs": self._purge_runs,
+            "purge_budget_exhausted": self._purge_budget_exhausted,
+            **(self._codec.stats() if self._codec is not None else {}),
+            **(self._snapshot_stats() if self._snapshot_path else {}),
+        }
+
+    def _snapshot_stats(self) -> dict[str, float]:
+        return {
+            "snapshot_loaded": self._snapshot_loaded,
+            "snapshot_saved": self._snapshot_saved,
+            "snapshot_writes": self._snapshot_writes,
+            "snapshot_rejected": self._snapshot_rejected,
+        }
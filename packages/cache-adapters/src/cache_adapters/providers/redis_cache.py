@@ -1,32 +1,118 @@
+from collections.abc import Mapping, Sequence
 from typing import Optional
 
 import redis.asyncio as redis
 
-from cache_adapters.contracts import CacheInterface
+from cache_adapters.contracts import CacheInterface, ttl_for
+from cache_adapters.support.codec import ValueCodec
 
 
 class RedisCache(CacheInterface):
     name = "redis"  # Auto-registered!
 
-    """Redis cache adapter for horizontal scaling"""
+    """
+    Redis cache adapter for horizontal scaling.
 
-    def __init__(self, url: str, default_ttl: Optional[int] = None, **kwargs):
-        self._client = redis.from_url(url)
+    Bulk operations use MGET and non-transactional SETEX pipelines, one
+    round trip per `batch_size` keys.
+
+    With `compression` ("zlib" or "zstd") values of at least
+    `compression_min_bytes` are stored compressed behind a small header.
+    Reads always understand both forms, so entries written before or after
+    switching compression on (or off) coexist; values the current settings
+    cannot decode (another dictionary) read as misses.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379",
+        default_ttl: Optional[int] = None,
+        client: Optional[redis.Redis] = None,
+        batch_size: int = 500,
+        compression: str = "none",
+        compression_level: Optional[int] = None,
+        compression_min_bytes: int = 256,
+        compression_dictionary: Optional[str] = None,
+        **kwargs,
+    ):
+        self._client = client or redis.from_url(url)
         self._default_ttl = default_ttl
+        self._batch_size = batch_size
+        self._hits = 0
+        self._misses = 0
+        self._codec = ValueCodec.create(
+            compression, compression_level, compression_min_bytes, compression_dictionary
+        )
+        # Reads go through a codec even with compression off
+        self._reader = self._codec or ValueCodec()
+
+    @property
+    def client(self) -> redis.Redis:
+        """Underlying client, for composing backends (pub/sub, pipelines)"""
+        return self._client
+
+    def _encode(self, value: str) -> str | bytes:
+        return value if self._codec is None else self._codec.encode(value)
+
+    def _decode(self, stored: Optional[bytes]) -> Optional[str]:
+        value = self._reader.decode(stored) if stored else None
+        if value is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return value
 
     async def get(self, key: str) -> Optional[str]:
-        value = await self._client.get(key)
-        return value.decode() if value else None
+        return self._decode(await self._client.get(key))
 
     async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        value = self._encode(value)
         ttl = ttl or self._default_ttl
         if ttl:
             await self._client.setex(key, ttl, value)
         else:
             await self._client.set(key, value)
 
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        results: list[Optional[str]] = []
+        for start in range(0, len(keys), self._batch_size):
+            values = await self._client.mget(keys[start : start + self._batch_size])
+            results.extend(self._decode(value) for value in values)
+        return results
+
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        ttl: Optional[int | Mapping[str, int]] = None,
+    ) -> None:
+        pairs = list(items.items())
+        for start in range(0, len(pairs), self._batch_size):
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in pairs[start : start + self._batch_size]:
+                value = self._encode(value)
+                key_ttl = ttl_for(ttl, key) or self._default_ttl
+                if key_ttl:
+                    pipe.setex(key, key_ttl, value)
+                else:
+                    pipe.set(key, value)
+            await pipe.execute()
+
+    async def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        ttl = ttl or self._default_ttl
+        return bool(await self._client.set(key, self._encode(value), ex=ttl, nx=True))
+
     async def delete(self, key: str) -> None:
         await self._client.delete(key)
 
     async def clear(self) -> None:
         await self._client.flushdb()
+
+    async def shutdown(self) -> None:
+        await self._client.aclose()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            **(self._codec.stats() if self._codec is not None else {}),
+        }
@@ -0,0 +1,337 @@
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+from collections.abc import Mapping, Sequence
+from typing import Optional
+
+from cache_adapters.contracts import CacheInterface, ttl_for
+from cache_adapters.support.codec import ValueCodec
+
+# File layout: one header page, the key hashes of every set's slots, then
+# `slots` fixed-size slots in sets of _WAYS. A key lives in one set, picked
+# by its hash.
+#   header: magic | u16 version | u16 ways | u32 slots | u32 slot size | u32 generation
+#   slot:   u32 seq | u32 generation | u64 key hash (0 = empty) | f64 expires at
+#           (0 = never) | f64 last hit | u16 key length | pad | u32 value length
+#           | key | value
+_MAGIC = b"RFSM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHIII")
+_GENERATION = struct.Struct("<I")
+_GENERATION_OFFSET = 16
+_DATA = mmap.PAGESIZE
+_SLOT = struct.Struct("<IIQddHxxI")
+_SEQ = struct.Struct("<I")
+_KEY_HASH = struct.Struct("<Q")
+_EMPTY = bytes(_SLOT.size)
+_TOUCHED = struct.Struct("<d")
+_TOUCHED_OFFSET = 24
+_WAYS = 8
+_TAGS = struct.Struct(f"<{_WAYS}Q")  # Key hashes of a set's slots, for lookups
+# Byte-range locks: one per stripe of sets, one for clear(), one for setup
+_STRIPES = 64
+_CLEAR_LOCK = _STRIPES
+_SETUP_LOCK = _STRIPES + 1
+_READ_RETRIES = 64
+_TOUCH_INTERVAL = 1.0  # Seconds between last-hit updates, to spare writes
+
+
+def default_path() -> str:
+    """Under /dev/shm where it exists (RAM-backed), else the temp directory"""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "rewriteforge-cache")
+
+
+def _hash(key: bytes) -> int:
+    # Stable across processes, unlike hash(), and cheap: a collision only
+    # costs a key comparison. The crc32 half picks the set (adler32 spreads
+    # short keys poorly); 0 marks an empty slot
+    return (zlib.crc32(key) << 32 | zlib.adler32(key)) or 1
+
+
+class SharedMemoryCache(CacheInterface):
+    name = "shared"  # Auto-registered!
+
+    """
+    Cache shared by every worker process on a host, in a memory-mapped file.
+
+    The file (under /dev/shm by default) is a fixed-size hash table of
+    `slots` slots of `slot_size` bytes, grouped in sets of 8: a key can only
+    live in the set its hash picks, and a write to a full set evicts the
+    entry that was least recently hit. Values that do not fit a slot are
+    not cached. Entries expire after their TTL.
+
+    Reads take no lock: each slot carries a sequence number that writers
+    make odd while they copy, and readers retry until they see the same
+    even number before and after their copy (a seqlock). Writes take a
+    byte-range lock on one of 64 stripes of sets, so writers only wait for
+    writers to the same stripe, in any process. The locks are per process:
+    use one event loop per worker.
+
+    The file outlives the workers, so restarts start warm. The first
+    worker creates it; one with a different slot geometry is replaced.
+    """
+
+    def __init__(
+        self,
+        shared_path: str = "",
+        slots: int = 65_536,
+        slot_size: int = 4096,
+        default_ttl: Optional[int] = None,
+        compression: str = "none",
+        compression_level: Optional[int] = None,
+        compression_min_bytes: int = 256,
+        compression_dictionary: Optional[str] = None,
+        **kwargs,
+    ):
+        if slot_size < _SLOT.size + 64:
+            raise ValueError(f"Shared cache slot size must be at least {_SLOT.size + 64} bytes")
+        self._path = shared_path or default_path()
+        self._sets = max(1, -(-slots // _WAYS))
+        self._slot_size = slot_size
+        self._set_size = _WAYS * slot_size
+        tags = -(-self._sets * _TAGS.size // mmap.PAGESIZE) * mmap.PAGESIZE
+        self._slots_start = _DATA + tags
+        self._size = self._slots_start + self._sets * self._set_size
+        self._default_ttl = default_ttl
+        self._codec = ValueCodec.create(
+            compression, compression_level, compression_min_bytes, compression_dictionary
+        )
+        self._reader = self._codec or ValueCodec()
+
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._evictions = 0
+        self._rejected = 0
+        self._contended = 0
+        self._recreated = 0
+        self._fd = self._open()
+        self._map = mmap.mmap(self._fd, self._size)
+
+    def _open(self) -> int:
+        """Open the file, creating (or replacing) it under the setup lock"""
+        while True:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX, 1, _SETUP_LOCK)
+                ready = self._prepare(fd)
+                fcntl.lockf(fd, fcntl.LOCK_UN, 1, _SETUP_LOCK)
+            except BaseException:
+                os.close(fd)
+                raise
+            if ready:
+                return fd
+            os.close(fd)
+
+    def _prepare(self, fd: int) -> bool:
+        """Size and label an empty file; False if `fd` is no longer the file at our path"""
+        try:
+            # Another worker may have replaced the file while we waited
+            if os.stat(self._path).st_ino != os.fstat(fd).st_ino:
+                return False
+        except FileNotFoundError:
+            return False
+        header = _HEADER.pack(_MAGIC, _VERSION, _WAYS, self._sets * _WAYS, self._slot_size, 0)
+        existing = os.pread(fd, _HEADER.size, 0)
+        if not existing.strip(b"\0"):
+            os.ftruncate(fd, self._size)
+            os.pwrite(fd, header, 0)
+            return True
+        if existing[:_GENERATION_OFFSET] == header[:_GENERATION_OFFSET]:
+            return True
+        # Another geometry or format: workers still mapping it keep their
+        # copy, new ones get a fresh file
+        os.unlink(self._path)
+        self._recreated += 1
+        return False
+
+    def _generation(self) -> int:
+        return _GENERATION.unpack_from(self._map, _GENERATION_OFFSET)[0]
+
+    def _slot_offset(self, set_index: int, way: int) -> int:
+        return self._slots_start + set_index * self._set_size + way * self._slot_size
+
+    def _lookup(self, key: bytes, now: float) -> Optional[bytes]:
+        key_hash = _hash(key)
+        set_index = (key_hash >> 32) % self._sets
+        data = self._map
+        # Cheap filter; a match is re-checked against the slot itself
+        tags = _TAGS.unpack_from(data, _DATA + set_index * _TAGS.size)
+        if key_hash not in tags:
+            return None
+        offset = self._slot_offset(set_index, tags.index(key_hash))
+        generation = self._generation()
+        for _ in range(_READ_RETRIES):
+            seq, slot_generation, slot_hash, expires_at, touched, key_length, value_length = (
+                _SLOT.unpack_from(data, offset)
+            )
+            if seq & 1:
+                continue  # Being written
+            if slot_hash != key_hash or slot_generation != generation:
+                return None
+            body = offset + _SLOT.size
+            stored = data[body : body + key_length + value_length]
+            if _SEQ.unpack_from(data, offset)[0] != seq:
+                continue  # Rewritten while we copied
+            if stored[:key_length] != key:
+                return None
+            if expires_at and expires_at <= now:
+                self._expirations += 1
+                return None
+            if now - touched > _TOUCH_INTERVAL:
+                _TOUCHED.pack_into(data, offset + _TOUCHED_OFFSET, now)
+            return stored[key_length:]
+        self._contended += 1
+        return None
+
+    def _decode(self, stored: Optional[bytes]) -> Optional[str]:
+        value = self._reader.decode(stored) if stored is not None else None
+        if value is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return value
+
+    def _lock(self, set_index: int, command: int) -> None:
+        fcntl.lockf(self._fd, command, 1, set_index % _STRIPES)
+
+    def _find(
+        self, key: bytes, key_hash: int, set_index: int, now: float, generation: int
+    ) -> tuple[int, bool]:
+        """
+        Way for `key` in its set and whether it holds a live entry; called
+        under the stripe lock. Prefers the key's own slot, then a free or
+        expired one, then evicts the least recently hit.
+        """
+        data = self._map
+        free = victim = None
+        oldest = float("inf")
+        for way in range(_WAYS):
+            offset = self._slot_offset(set_index, way)
+            _, slot_generation, slot_hash, expires_at, touched, key_length, _ = _SLOT.unpack_from(
+                data, offset
+            )
+            live = (
+                slot_hash
+                and slot_generation == generation
+                and not (expires_at and expires_at <= now)
+            )
+            if not live:
+                if free is None:
+                    free = way
+                continue
+            body = offset + _SLOT.size
+            if slot_hash == key_hash and data[body : body + key_length] == key:
+                return way, True
+            if touched < oldest:
+                victim, oldest = way, touched
+        if free is not None:
+            return free, False
+        self._evictions += 1
+        return victim, False
+
+    def _write(self, set_index: int, way: int, slot: bytes, key_hash: int) -> None:
+        """Copy a whole slot in, odd sequence number while it is inconsistent"""
+        data = self._map
+        offset = self._slot_offset(set_index, way)
+        seq = _SEQ.unpack_from(data, offset)[0] | 1  # Odd even if a writer died mid-copy
+        _SEQ.pack_into(data, offset, seq)
+        data[offset + _SEQ.size : offset + len(slot)] = slot[_SEQ.size :]
+        _SEQ.pack_into(data, offset, seq + 1)
+        _KEY_HASH.pack_into(data, _DATA + set_index * _TAGS.size + way * _KEY_HASH.size, key_hash)
+
+    def _store(self, key: str, value: str, ttl: Optional[int], only_new: bool = False) -> bool:
+        key_data = key.encode()
+        key_hash = _hash(key_data)
+        set_index = (key_hash >> 32) % self._sets
+        stored = value if self._codec is None else self._codec.encode(value)
+        if isinstance(stored, str):
+            stored = stored.encode()
+        now = time.time()
+        ttl = ttl or self._default_ttl
+        self._lock(set_index, fcntl.LOCK_EX)
+        try:
+            generation = self._generation()
+            way, exists = self._find(key_data, key_hash, set_index, now, generation)
+            if only_new and exists:
+                return False
+            header = _SLOT.pack(
+                0, generation, key_hash, now + ttl if ttl else 0.0, now, len(key_data), len(stored)
+            )
+            if len(header) + len(key_data) + len(stored) > self._slot_size:
+                # Too big: drop the old value too rather than serve it
+                self._rejected += 1
+                if exists:
+                    self._write(set_index, way, _EMPTY, 0)
+                return False
+            self._write(set_index, way, header + key_data + stored, key_hash)
+            return True
+        finally:
+            self._lock(set_index, fcntl.LOCK_UN)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._decode(self._lookup(key.encode(), time.time()))
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self._store(key, value, ttl)
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        now = time.time()
+        return [self._decode(self._lookup(key.encode(), now)) for key in keys]
+
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        ttl: Optional[int | Mapping[str, int]] = None,
+    ) -> None:
+        for key, value in items.items():
+            self._store(key, value, ttl_for(ttl, key))
+
+    async def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """Atomic across processes: checked and written under the stripe lock"""
+        return self._store(key, value, ttl, only_new=True)
+
+    async def delete(self, key: str) -> None:
+        key_data = key.encode()
+        key_hash = _hash(key_data)
+        set_index = (key_hash >> 32) % self._sets
+        self._lock(set_index, fcntl.LOCK_EX)
+        try:
+            way, exists = self._find(key_data, key_hash, set_index, time.time(), self._generation())
+            if exists:
+                self._write(set_index, way, _EMPTY, 0)
+        finally:
+            self._lock(set_index, fcntl.LOCK_UN)
+
+    async def clear(self) -> None:
+        """Empty the cache for every process at once by bumping the generation"""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, _CLEAR_LOCK)
+        try:
+            _GENERATION.pack_into(
+                self._map, _GENERATION_OFFSET, (self._generation() + 1) & 0xFFFFFFFF
+            )
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, _CLEAR_LOCK)
+
+    async def shutdown(self) -> None:
+        # Entries stay in the file for the other workers and the next start
+        self._map.flush()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "rejected": self._rejected,
+            "contended_reads": self._contended,
+            "slots": self._sets * _WAYS,
+            "slot_size": self._slot_size,
+            "recreated": self._recreated,
+            **(self._codec.stats() if self._codec is not None else {}),
+        }
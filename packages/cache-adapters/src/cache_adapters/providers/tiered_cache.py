@@ -0,0 +1,199 @@
+import asyncio
+import uuid
+from collections.abc import Mapping, Sequence
+from typing import Optional
+
+from cache_adapters.contracts import CacheInterface, ttl_for
+from cache_adapters.providers.memory_cache import MemoryCache
+from cache_adapters.providers.redis_cache import RedisCache
+
+# Single-flight locks taken with add(); only the shared tier may answer for them
+_COORDINATION_PREFIXES = ("lock:", "refresh:")
+
+
+class TieredCache(CacheInterface):
+    name = "tiered"  # Auto-registered!
+
+    """
+    Near/far cache: a bounded in-process L1 in front of Redis (L2).
+
+    L1 hits skip the network entirely. L2 hits fill L1 for at most `l1_ttl`
+    seconds, which bounds how stale a replica can get. With
+    `l1_invalidation`, writes and deletes are broadcast over a Redis pub/sub
+    channel and every other replica drops its L1 copy right away.
+
+    Coordination keys (`lock:` / `refresh:`) are read from L2 only, so a
+    released lock never lingers in L1 as if it were still held.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379",
+        default_ttl: Optional[int] = None,
+        l1_ttl: int = 30,
+        l1_max_entries: int = 10_000,
+        l1_invalidation: bool = False,
+        invalidation_channel: str = "cache:invalidate",
+        eviction_policy: str = "lru",
+        l1: Optional[CacheInterface] = None,
+        l2: Optional[CacheInterface] = None,
+        **kwargs,
+    ):
+        self._l1 = l1 or MemoryCache(
+            default_ttl=l1_ttl,
+            max_entries=l1_max_entries,
+            eviction_policy=eviction_policy,
+        )
+        self._l2 = l2 or RedisCache(url=url, default_ttl=default_ttl, **kwargs)
+        self._default_ttl = default_ttl
+        self._l1_ttl = l1_ttl
+        self._invalidation = l1_invalidation
+        self._channel = invalidation_channel
+        self._node_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._l1_hits = 0
+        self._l2_hits = 0
+        self._l2_misses = 0
+        self._invalidations_received = 0
+
+    def _l1_ttl_for(self, ttl: Optional[int]) -> int:
+        ttl = ttl or self._default_ttl
+        return min(ttl, self._l1_ttl) if ttl else self._l1_ttl
+
+    async def get(self, key: str) -> Optional[str]:
+        if key.startswith(_COORDINATION_PREFIXES):
+            return await self._l2.get(key)
+
+        value = await self._l1.get(key)
+        if value is not None:
+            self._l1_hits += 1
+            return value
+
+        value = await self._l2.get(key)
+        if value is None:
+            self._l2_misses += 1
+            return None
+
+        self._l2_hits += 1
+        await self._l1.set(key, value, ttl=self._l1_ttl)
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        await self._l2.set(key, value, ttl)
+        await self._l1.set(key, value, ttl=self._l1_ttl_for(ttl))
+        await self._publish(key)
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        results = await self._l1.get_many(keys)
+        missing = [i for i, value in enumerate(results) if value is None]
+        self._l1_hits += len(keys) - len(missing)
+        if not missing:
+            return results
+
+        found = await self._l2.get_many([keys[i] for i in missing])
+        fill = {}
+        for i, value in zip(missing, found):
+            if value is None:
+                self._l2_misses += 1
+            else:
+                self._l2_hits += 1
+                results[i] = value
+                if not keys[i].startswith(_COORDINATION_PREFIXES):
+                    fill[keys[i]] = value
+        if fill:
+            await self._l1.set_many(fill, ttl=self._l1_ttl)
+        return results
+
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        ttl: Optional[int | Mapping[str, int]] = None,
+    ) -> None:
+        await self._l2.set_many(items, ttl)
+        await self._l1.set_many(
+            items, ttl={key: self._l1_ttl_for(ttl_for(ttl, key)) for key in items}
+        )
+        await self._publish(*items)
+
+    async def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        # Locks must be decided by the shared tier only
+        return await self._l2.add(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._l2.delete(key)
+        await self._l1.delete(key)
+        await self._publish(key)
+
+    async def clear(self) -> None:
+        await self._l2.clear()
+        await self._l1.clear()
+        await self._publish("*")
+
+    async def _publish(self, *keys: str) -> None:
+        if keys and self._invalidation and isinstance(self._l2, RedisCache):
+            message = f"{self._node_id} " + "\n".join(keys)
+            await self._l2.client.publish(self._channel, message)
+
+    async def handle_invalidation(self, message: bytes | str) -> None:
+        """Drop the L1 copies named in a message from another replica (newline-separated keys)"""
+        if isinstance(message, bytes):
+            message = message.decode()
+        node_id, _, keys = message.partition(" ")
+        if node_id == self._node_id:
+            return
+
+        self._invalidations_received += 1
+        for key in keys.split("\n"):
+            if key == "*":
+                await self._l1.clear()
+            else:
+                await self._l1.delete(key)
+
+    async def startup(self) -> None:
+        await self._l1.startup()
+        await self._l2.startup()
+        if self._invalidation and isinstance(self._l2, RedisCache) and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def shutdown(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._l1.shutdown()
+        await self._l2.shutdown()
+
+    async def _listen(self) -> None:
+        """Consume invalidations, resubscribing after connection loss"""
+        while True:
+            pubsub = self._l2.client.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        await self.handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Messages may have been missed while disconnected
+                await self._l1.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+    def stats(self) -> dict[str, float]:
+        lookups = self._l1_hits + self._l2_hits + self._l2_misses
+        l2_lookups = self._l2_hits + self._l2_misses
+        return {
+            "l1_hits": self._l1_hits,
+            "l2_hits": self._l2_hits,
+            "l2_misses": self._l2_misses,
+            "l1_hit_ratio": self._l1_hits / lookups if lookups else 0.0,
+            "l2_hit_ratio": self._l2_hits / l2_lookups if l2_lookups else 0.0,
+            "hit_ratio": (self._l1_hits + self._l2_hits) / lookups if lookups else 0.0,
+            "invalidations_received": self._invalidations_received,
+            "l1_entries": self._l1.stats().get("entries", 0),
+        }
@@ -0,0 +1,17 @@
+from cache_adapters.support.codec import ValueCodec, train_dictionary
+from cache_adapters.support.eviction import EvictionPolicy, LRUPolicy, WTinyLFUPolicy
+from cache_adapters.support.snapshot import read_snapshot, write_snapshot
+from cache_adapters.support.timing_wheel import TimingWheel
+from cache_adapters.support.write_behind import WriteBehindCache
+
+__all__ = [
+    "EvictionPolicy",
+    "LRUPolicy",
+    "WTinyLFUPolicy",
+    "TimingWheel",
+    "ValueCodec",
+    "train_dictionary",
+    "read_snapshot",
+    "write_snapshot",
+    "WriteBehindCache",
+]
@@ -0,0 +1,208 @@
+import struct
+import zlib
+from collections import Counter
+from collections.abc import Iterable
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional; zlib is always available
+    zstandard = None
+
+# Compressed values start with 0xff — a byte that never begins valid UTF-8 —
+# so plain values written before compression was enabled (or below the
+# size threshold) are read back unchanged:
+#   0xff | u8 codec (| 0x80 = with dictionary) | [u32 dictionary id] | payload
+MAGIC = 0xFF
+_ZLIB, _ZSTD, _WITH_DICT = 1, 2, 0x80
+_DICT_ID = struct.Struct("<I")
+_CODECS = {"zlib": _ZLIB, "zstd": _ZSTD}
+# UnicodeDecodeError is a ValueError
+_DECODE_ERRORS = (ValueError, zlib.error) + ((zstandard.ZstdError,) if zstandard else ())
+
+
+class ValueCodec:
+    """
+    Transparent compression for cached values.
+
+    Values of at least `min_bytes` UTF-8 bytes are compressed with zlib or
+    zstd (the `zstandard` package) and stored with a small header; shorter
+    values, and values that would not shrink, stay as they are. A shared
+    `dictionary` (see train_dictionary) gives short texts something to
+    reference and is identified in the header by its CRC32, so entries
+    written with a different dictionary read back as misses instead of
+    garbage.
+
+    encode() returns the str itself when it does not compress, so an
+    in-process cache keeps skipping the decode for those.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = "zlib",
+        level: Optional[int] = None,
+        min_bytes: int = 256,
+        dictionary: Optional[bytes] = None,
+    ):
+        if algorithm not in _CODECS:
+            raise ValueError(f"Unknown compression '{algorithm}'. Available: {list(_CODECS)}")
+        if algorithm == "zstd" and zstandard is None:
+            raise ImportError(
+                "zstd compression needs the 'zstandard' package: install cache-adapters[zstd]"
+            )
+        self._min_bytes = min_bytes
+        self._dictionary = dictionary or None
+        self._dict_id = zlib.crc32(dictionary) if dictionary else None
+
+        codec = _CODECS[algorithm]
+        if self._dictionary:
+            self._header = bytes((MAGIC, codec | _WITH_DICT)) + _DICT_ID.pack(self._dict_id)
+        else:
+            self._header = bytes((MAGIC, codec))
+
+        if algorithm == "zlib":
+            self._level = 6 if level is None else level
+            self._compress = self._zlib_compress
+        else:
+            zstd_dict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            self._zstd_compressor = zstandard.ZstdCompressor(
+                level=3 if level is None else level, dict_data=zstd_dict, write_dict_id=False
+            )
+            self._compress = self._zstd_compressor.compress
+        # Any codec reads what the others wrote, as long as the dictionary
+        # matches; keyed by whether the value used it
+        self._zstd_decompressors: dict[bool, object] = {}
+        self._compressed = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._undecodable = 0
+
+    @classmethod
+    def create(
+        cls,
+        algorithm: str = "none",
+        level: Optional[int] = None,
+        min_bytes: int = 256,
+        dictionary: Optional[str] = None,
+    ) -> Optional["ValueCodec"]:
+        """Codec from backend settings — None for "none"; `dictionary` is a file path"""
+        if algorithm == "none":
+            return None
+        data = None
+        if dictionary:
+            with open(dictionary, "rb") as file:
+                data = file.read()
+        return cls(algorithm, level, min_bytes, data)
+
+    def _zlib_compress(self, data: bytes) -> bytes:
+        # Raw deflate: no zlib header or checksum, 6 bytes less per value.
+        # Most of the cost of a short value is allocating and clearing
+        # deflate's state, so the window (and hash table) is sized to what
+        # this value plus the dictionary can use; inflate with the full
+        # window reads any of them.
+        window = max(10, min(15, (len(data) + len(self._dictionary or b"")).bit_length()))
+        options = (self._level, zlib.DEFLATED, -window, max(1, window - 7))
+        if self._dictionary:
+            compressor = zlib.compressobj(*options, zdict=self._dictionary)
+        else:
+            compressor = zlib.compressobj(*options)
+        return compressor.compress(data) + compressor.flush()
+
+    def encode(self, value: str) -> str | bytes:
+        """Stored form of `value`: compressed bytes, or the str unchanged"""
+        data = value.encode()
+        self._bytes_in += len(data)
+        if len(data) < self._min_bytes:
+            self._bytes_out += len(data)
+            return value
+        compressed = self._header + self._compress(data)
+        if len(compressed) >= len(data):
+            self._bytes_out += len(data)
+            return value
+        self._compressed += 1
+        self._bytes_out += len(compressed)
+        return compressed
+
+    def decode(self, stored: str | bytes) -> Optional[str]:
+        """Original value; None if it was written with another dictionary or is corrupt"""
+        if isinstance(stored, str):
+            return stored
+        if not stored or stored[0] != MAGIC:
+            return stored.decode()
+        try:
+            return self._decompress(stored).decode()
+        except _DECODE_ERRORS:
+            self._undecodable += 1
+            return None
+
+    def _decompress(self, stored: bytes) -> bytes:
+        codec, offset = stored[1], 2
+        dictionary = None
+        if codec & _WITH_DICT:
+            (dict_id,) = _DICT_ID.unpack_from(stored, offset)
+            if dict_id != self._dict_id:
+                raise ValueError("Value was compressed with another dictionary")
+            dictionary, offset = self._dictionary, offset + _DICT_ID.size
+            codec &= ~_WITH_DICT
+        payload = stored[offset:]
+
+        if codec == _ZLIB:
+            if not dictionary:
+                return zlib.decompress(payload, -15)
+            decompressor = zlib.decompressobj(-15, zdict=dictionary)
+            return decompressor.decompress(payload) + decompressor.flush()
+        if codec == _ZSTD:
+            if zstandard is None:
+                raise ValueError("Value is zstd-compressed but 'zstandard' is not installed")
+            decompressor = self._zstd_decompressors.get(dictionary is not None)
+            if decompressor is None:
+                zstd_dict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+                decompressor = zstandard.ZstdDecompressor(dict_data=zstd_dict)
+                self._zstd_decompressors[dictionary is not None] = decompressor
+            return decompressor.decompress(payload)
+        raise ValueError(f"Unknown codec {codec}")
+
+    def stats(self) -> dict[str, float]:
+        """Written values compressed, UTF-8 bytes in vs stored bytes out"""
+        return {
+            "compressed": self._compressed,
+            "compress_bytes_in": self._bytes_in,
+            "compress_bytes_out": self._bytes_out,
+            "undecodable": self._undecodable,
+        }
+
+
+def train_dictionary(samples: Iterable[str], size: int = 16_384) -> bytes:
+    """
+    Build a compression dictionary from sample values.
+
+    With `zstandard` installed this is zstd's trainer. Otherwise the most
+    frequent words and word pairs, weighted by the bytes they would save,
+    are packed with the most valuable last — deflate reaches back at most
+    32 KB and codes nearer matches more cheaply. Either result works for
+    zlib and zstd.
+    """
+    samples = list(samples)
+    if zstandard is not None and len(samples) >= 8:
+        encoded = [sample.encode() for sample in samples]
+        return zstandard.train_dictionary(size, encoded).as_bytes()
+
+    counts: Counter[str] = Counter()
+    for sample in samples:
+        words = sample.split()
+        counts.update(words)
+        counts.update(" ".join(pair) for pair in zip(words, words[1:]))
+    ranked = sorted(
+        (phrase for phrase, count in counts.items() if count > 1),
+        key=lambda phrase: counts[phrase] * len(phrase),
+        reverse=True,
+    )
+    chosen: list[bytes] = []
+    used = 0
+    for phrase in ranked:
+        data = phrase.encode() + b" "
+        if used + len(data) > size:
+            continue
+        chosen.append(data)
+        used += len(data)
+    return b"".join(reversed(chosen))
@@ -0,0 +1,216 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+
+class EvictionPolicy(ABC):
+    """
+    Tracks key order for a bounded cache and picks eviction victims.
+
+    The cache owns the entries; the policy only sees keys. Every operation
+    is O(1).
+    """
+
+    _registry: dict[str, type["EvictionPolicy"]] = {}
+
+    name: str
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if hasattr(cls, "name") and cls.name:
+            EvictionPolicy._registry[cls.name] = cls
+
+    @classmethod
+    def resolve(cls, name: str, **kwargs) -> "EvictionPolicy":
+        """Resolve policy by name from registry"""
+        if name not in cls._registry:
+            available = ", ".join(cls._registry.keys())
+            raise KeyError(f"Unknown eviction policy '{name}'. Available: {available}")
+        return cls._registry[name](**kwargs)
+
+    def record(self, key: str) -> None:
+        """Note a lookup of key, hit or miss (frequency-aware policies only)"""
+
+    @abstractmethod
+    def touch(self, key: str) -> None:
+        """Mark an existing key as recently used"""
+
+    @abstractmethod
+    def insert(self, key: str) -> None:
+        """Track a newly stored key"""
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        """Stop tracking key (deleted or expired)"""
+
+    @abstractmethod
+    def victim(self) -> Optional[str]:
+        """Pick and stop tracking the next key to evict"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget all keys"""
+
+
+class LRUPolicy(EvictionPolicy):
+    name = "lru"
+
+    """Least recently used, backed by an OrderedDict"""
+
+    def __init__(self, **kwargs):
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def touch(self, key: str) -> None:
+        self._order.move_to_end(key)
+
+    def insert(self, key: str) -> None:
+        self._order[key] = None
+
+    def remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        if not self._order:
+            return None
+        return self._order.popitem(last=False)[0]
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of 4-bit-style counters with periodic aging.
+
+    Approximates how often each key was seen recently. Counters saturate at
+    15 and are all halved once `sample_size` increments have been recorded,
+    so old popularity decays.
+    """
+
+    _SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+    _MAX_COUNT = 15
+
+    def __init__(self, width: int = 1024):
+        # Power of two so index is a mask, not a modulo
+        self._width = 1 << max(4, (width - 1).bit_length())
+        self._mask = self._width - 1
+        self._rows = [(row * self._width, seed) for row, seed in enumerate(self._SEEDS)]
+        self._table = bytearray(self._width * len(self._SEEDS))
+        self._sample_size = 10 * self._width
+        self._additions = 0
+
+    def _indexes(self, key: str) -> list[int]:
+        h = hash(key)
+        mask = self._mask
+        return [offset + (((h * seed) >> 16) & mask) for offset, seed in self._rows]
+
+    def increment(self, key: str) -> None:
+        table = self._table
+        added = False
+        for i in self._indexes(key):
+            if table[i] < self._MAX_COUNT:
+                table[i] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= self._sample_size:
+                self._age()
+
+    def frequency(self, key: str) -> int:
+        table = self._table
+        return min(table[i] for i in self._indexes(key))
+
+    def _age(self) -> None:
+        self._table = bytearray(count >> 1 for count in self._table)
+        self._additions //= 2
+
+    def clear(self) -> None:
+        self._table = bytearray(len(self._table))
+        self._additions = 0
+
+
+class WTinyLFUPolicy(EvictionPolicy):
+    name = "tinylfu"
+
+    """
+    Window TinyLFU: a small LRU window in front of a segmented LRU main area.
+
+    New keys enter the window and spill into the main area's probation
+    segment as the window overflows. When something must go, the latest
+    spilled key competes with the probation victim and the one the frequency
+    sketch has seen less often is evicted — so one-hit wonders cannot flush
+    popular keys.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10_000,
+        window_ratio: float = 0.01,
+        protected_ratio: float = 0.8,
+        **kwargs,
+    ):
+        self._window: OrderedDict[str, None] = OrderedDict()
+        self._probation: OrderedDict[str, None] = OrderedDict()
+        self._protected: OrderedDict[str, None] = OrderedDict()
+        self._window_ratio = window_ratio
+        self._protected_ratio = protected_ratio
+        self._sketch = FrequencySketch(capacity)
+        self._candidate: Optional[str] = None
+
+    def record(self, key: str) -> None:
+        self._sketch.increment(key)
+
+    def touch(self, key: str) -> None:
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._probation:
+            # Second hit in main promotes to protected
+            del self._probation[key]
+            self._protected[key] = None
+            self._rebalance_protected()
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+
+    def insert(self, key: str) -> None:
+        self._window[key] = None
+        total = len(self._window) + len(self._probation) + len(self._protected)
+        if len(self._window) > max(1, int(total * self._window_ratio)):
+            spilled, _ = self._window.popitem(last=False)
+            self._probation[spilled] = None
+            self._candidate = spilled
+
+    def remove(self, key: str) -> None:
+        self._window.pop(key, None)
+        self._probation.pop(key, None)
+        self._protected.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        candidate, self._candidate = self._candidate, None
+
+        if self._probation:
+            lru = next(iter(self._probation))
+            # Admission: a freshly spilled key must beat the probation victim
+            if candidate is not None and candidate != lru and candidate in self._probation:
+                if self._sketch.frequency(candidate) <= self._sketch.frequency(lru):
+                    del self._probation[candidate]
+                    return candidate
+            return self._probation.popitem(last=False)[0]
+
+        if self._protected:
+            return self._protected.popitem(last=False)[0]
+        if self._window:
+            return self._window.popitem(last=False)[0]
+        return None
+
+    def _rebalance_protected(self) -> None:
+        main = len(self._probation) + len(self._protected)
+        while len(self._protected) > max(1, int(main * self._protected_ratio)):
+            demoted, _ = self._protected.popitem(last=False)
+            self._probation[demoted] = None
+
+    def clear(self) -> None:
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self._sketch.clear()
+        self._candidate = None
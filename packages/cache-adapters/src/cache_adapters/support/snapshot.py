@@ -0,0 +1,132 @@
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+# Header, then one record per entry:
+#   magic | u16 format version | u16 reserved | u64 entry count | f64 written at
+#   u16 key length | u32 value length | u8 kind | f64 expires at (0 = never) | key | value
+MAGIC = b"RFMC"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQd")
+_RECORD = struct.Struct("<HIBd")
+_TEXT, _BINARY = 0, 1  # str stored as UTF-8, or bytes (compressed values)
+
+
+class SnapshotError(ValueError):
+    """Not a snapshot, or one written in an unsupported format version"""
+
+
+class MappedValue:
+    """
+    A value still sitting in a memory-mapped snapshot.
+
+    Loading a snapshot only reads keys and record headers; the pages
+    holding values are faulted in by the OS when a value is first read.
+    """
+
+    __slots__ = ("view", "binary")
+
+    def __init__(self, view: memoryview, binary: bool):
+        self.view = view
+        self.binary = binary
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def load(self) -> str | bytes:
+        return bytes(self.view) if self.binary else str(self.view, "utf-8")
+
+
+def write_snapshot(
+    path: str,
+    entries: Iterable[tuple[str, str | bytes | MappedValue, Optional[float]]],
+    now: Optional[float] = None,
+) -> int:
+    """
+    Write (key, value, expires_at) entries that are still live at `now`.
+
+    Goes to a temporary file that is fsynced and renamed over `path`, so
+    readers — and a crash halfway — only ever see a complete snapshot.
+    Returns the number of entries written.
+    """
+    now = time.time() if now is None else now
+    temporary = f"{path}.{os.getpid()}.tmp"
+    count = 0
+    try:
+        with open(temporary, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, 0, 0, now))
+            for key, value, expires_at in entries:
+                if expires_at and expires_at <= now:
+                    continue
+                key_data = key.encode()
+                if len(key_data) > 0xFFFF:
+                    continue
+                if isinstance(value, MappedValue):
+                    kind, data = _BINARY if value.binary else _TEXT, value.view
+                elif isinstance(value, str):
+                    kind, data = _TEXT, value.encode()
+                else:
+                    kind, data = _BINARY, value
+                file.write(_RECORD.pack(len(key_data), len(data), kind, expires_at or 0.0))
+                file.write(key_data)
+                file.write(data)
+                count += 1
+            # Now that the count is known
+            file.seek(0)
+            file.write(_HEADER.pack(MAGIC, VERSION, 0, count, now))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return count
+
+
+def read_snapshot(
+    path: str, now: Optional[float] = None
+) -> Iterator[tuple[str, MappedValue, Optional[float]]]:
+    """
+    Yield live (key, value, expires_at) entries from a snapshot.
+
+    The file is memory-mapped and values are returned as MappedValue
+    views into it. A truncated tail is ignored.
+
+    Raises:
+        SnapshotError: Wrong magic or format version
+    """
+    now = time.time() if now is None else now
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < _HEADER.size:
+            raise SnapshotError(f"{path} is not a cache snapshot")
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, _, count, _ = _HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} is not a cache snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version} (expected {VERSION})")
+
+    view = memoryview(mapped)
+    unpack, record_size = _RECORD.unpack_from, _RECORD.size
+    offset, size = _HEADER.size, len(mapped)
+    for _ in range(count):
+        try:
+            key_length, value_length, kind, expires_at = unpack(mapped, offset)
+        except struct.error:
+            return
+        key_start = offset + record_size
+        value_start = key_start + key_length
+        offset = value_start + value_length
+        if offset > size:
+            return
+        if expires_at and expires_at <= now:
+            continue
+        yield (
+            str(view[key_start:value_start], "utf-8"),
+            MappedValue(view[value_start:offset], kind == _BINARY),
+            expires_at or None,
+        )
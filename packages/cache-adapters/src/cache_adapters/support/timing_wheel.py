@@ -0,0 +1,122 @@
+import math
+import time
+from typing import Optional
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel for key expiry.
+
+    Level 0 has `slots` buckets of one tick each; every level above covers
+    `slots` times the span of the one below. Keys sit in the coarsest bucket
+    that still resolves their deadline and cascade down as time approaches
+    it, so advancing costs O(keys due) per tick — the keyspace is never
+    scanned. Deadlines beyond the top level wait in an overflow bucket.
+    """
+
+    def __init__(
+        self,
+        tick: float = 1.0,
+        slots: int = 64,
+        levels: int = 4,
+        now: Optional[float] = None,
+    ):
+        self._tick = tick
+        self._slots = slots
+        self._levels = levels
+        self._wheels: list[list[dict[str, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: dict[str, int] = {}
+        self._where: dict[str, dict[str, int]] = {}
+        # Next tick to process
+        self._current = int((time.time() if now is None else now) // tick)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def schedule(self, key: str, expires_at: float) -> None:
+        """Track key to expire at `expires_at` (epoch seconds), replacing any previous deadline"""
+        self.cancel(key)
+        self._place(key, math.ceil(expires_at / self._tick))
+
+    def cancel(self, key: str) -> None:
+        """Stop tracking key"""
+        bucket = self._where.pop(key, None)
+        if bucket is not None:
+            bucket.pop(key, None)
+
+    def clear(self) -> None:
+        for wheel in self._wheels:
+            for bucket in wheel:
+                bucket.clear()
+        self._overflow.clear()
+        self._where.clear()
+
+    def _place(self, key: str, due: int) -> None:
+        due = max(due, self._current)
+        delta = due - self._current
+        span = self._slots
+        for level in range(self._levels):
+            if delta < span:
+                bucket = self._wheels[level][(due // (span // self._slots)) % self._slots]
+                break
+            span *= self._slots
+        else:
+            bucket = self._overflow
+
+        bucket[key] = due
+        self._where[key] = bucket
+
+    def _cascade(self, tick: int) -> None:
+        """Redistribute coarse buckets whose range starts at this tick"""
+        span = 1
+        for level in range(1, self._levels):
+            span *= self._slots
+            if tick % span:
+                return
+            bucket = self._wheels[level][(tick // span) % self._slots]
+            for key, due in list(bucket.items()):
+                del bucket[key]
+                self._place(key, due)
+
+        if tick % (span * self._slots) == 0:
+            for key, due in list(self._overflow.items()):
+                del self._overflow[key]
+                self._place(key, due)
+
+    def pending(self, now: Optional[float] = None) -> bool:
+        """True if ticks up to `now` are still unprocessed (budget ran out)"""
+        now = time.time() if now is None else now
+        return self._current <= int(now // self._tick)
+
+    def advance(self, now: Optional[float] = None, budget: Optional[float] = None) -> list[str]:
+        """
+        Process ticks up to `now` and return keys whose deadline passed.
+
+        Args:
+            now: Epoch seconds, defaults to time.time()
+            budget: Max seconds to spend; unfinished work resumes next call
+        """
+        now = time.time() if now is None else now
+        stop_at = time.perf_counter() + budget if budget is not None else None
+        target = int(now // self._tick)
+        expired: list[str] = []
+
+        while self._current <= target:
+            tick = self._current
+            self._cascade(tick)
+            bucket = self._wheels[0][tick % self._slots]
+            while bucket:
+                key, _ = bucket.popitem()
+                del self._where[key]
+                expired.append(key)
+                # Check the clock every 64 keys to keep the overhead down
+                if stop_at is not None and not len(expired) % 64:
+                    if time.perf_counter() >= stop_at:
+                        return expired
+            self._current += 1
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                break
+
+        return expired
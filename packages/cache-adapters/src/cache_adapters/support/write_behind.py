@@ -0,0 +1,215 @@
+import asyncio
+from collections.abc import Mapping, Sequence
+from typing import Optional
+
+from cache_adapters.contracts import CacheInterface, ttl_for
+
+_OVERFLOW = ("drop", "block")
+
+
+class WriteBehindCache(CacheInterface):
+    """
+    Queues writes to the wrapped cache and flushes them in the background.
+
+    set() and set_many() return once the value is queued; a single task
+    drains the queue in set_many() batches of up to `batch_size` (one
+    pipeline on Redis), waiting `flush_interval` seconds for a batch to
+    fill. Queued and in-flight values are served by get(), so a write
+    never reads back as a miss. Rewriting a queued key replaces its value.
+
+    At most `max_queue` keys wait; past that, overflow="drop" discards the
+    new write and overflow="block" waits for room. shutdown() flushes the
+    queue before shutting the wrapped cache down; later writes go straight
+    through. Failed batches are counted and dropped — a lost cache write
+    only costs a later miss.
+
+    delete() first flushes every write queued before it, so releasing a
+    lock publishes what its holder stored to other processes. add() (taking
+    a lock) goes straight through.
+
+    Has no `name`, so it never enters the registry — wrap a resolved
+    cache instead.
+    """
+
+    def __init__(
+        self,
+        cache: CacheInterface,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.005,
+        overflow: str = "drop",
+    ):
+        if overflow not in _OVERFLOW:
+            raise ValueError(f"Unknown write-behind overflow '{overflow}'. Available: {_OVERFLOW}")
+        self._cache = cache
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._block = overflow == "block"
+        # key -> (value, ttl), oldest first
+        self._pending: dict[str, tuple[str, Optional[int]]] = {}
+        self._inflight: dict[str, tuple[str, Optional[int]]] = {}
+        self._ready = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        # Held while a batch is written, so deletes cannot be overtaken by it
+        self._writing = asyncio.Lock()
+        self._drainer: Optional[asyncio.Task] = None
+        self._closing = False
+        self._queued = 0
+        self._dropped = 0
+        self._batches = 0
+        self._errors = 0
+
+    @classmethod
+    def wrap(
+        cls,
+        cache: CacheInterface,
+        enabled: bool = False,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.005,
+        overflow: str = "drop",
+    ) -> CacheInterface:
+        """Wrap cache in a write-behind queue, or return it unchanged"""
+        if not enabled:
+            return cache
+        return cls(cache, max_queue, batch_size, flush_interval, overflow)
+
+    def _queued_value(self, key: str) -> Optional[str]:
+        entry = self._pending.get(key) or self._inflight.get(key)
+        return entry[0] if entry else None
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self._queued_value(key)
+        if value is not None:
+            return value
+        return await self._cache.get(key)
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        if not self._pending and not self._inflight:
+            return await self._cache.get_many(keys)
+        results = [self._queued_value(key) for key in keys]
+        missing = [i for i, value in enumerate(results) if value is None]
+        if missing:
+            found = await self._cache.get_many([keys[i] for i in missing])
+            for i, value in zip(missing, found):
+                results[i] = value
+        return results
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        await self._enqueue(key, value, ttl)
+
+    async def set_many(
+        self,
+        items: Mapping[str, str],
+        ttl: Optional[int | Mapping[str, int]] = None,
+    ) -> None:
+        for key, value in items.items():
+            await self._enqueue(key, value, ttl_for(ttl, key))
+
+    async def _enqueue(self, key: str, value: str, ttl: Optional[int]) -> None:
+        while (
+            len(self._pending) >= self._max_queue and key not in self._pending and not self._closing
+        ):
+            if not self._block:
+                self._dropped += 1
+                return
+            self._not_full.clear()
+            await self._not_full.wait()
+        if self._closing:
+            # Nothing drains the queue any more
+            self._pending.pop(key, None)
+            await self._cache.set(key, value, ttl)
+            return
+        # Re-inserted at the end: the newest value is the one written
+        self._pending.pop(key, None)
+        self._pending[key] = (value, ttl)
+        self._queued += 1
+        self._ready.set()
+        if self._drainer is None and not self._closing:
+            self._drainer = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while True:
+            await self._ready.wait()
+            if len(self._pending) < self._batch_size:
+                # Let a batch build up
+                await asyncio.sleep(self._flush_interval)
+            await self._flush_batch()
+            if not self._pending:
+                self._ready.clear()
+
+    async def _flush_batch(self) -> None:
+        async with self._writing:
+            keys = list(self._pending)[: self._batch_size]
+            self._inflight = {key: self._pending.pop(key) for key in keys}
+            self._not_full.set()
+            if not self._inflight:
+                return
+            items = {key: value for key, (value, _) in self._inflight.items()}
+            ttls = {key: ttl for key, (_, ttl) in self._inflight.items() if ttl}
+            try:
+                await self._cache.set_many(items, ttl=ttls)
+                self._batches += 1
+            except Exception:
+                self._errors += 1
+            finally:
+                self._inflight = {}
+
+    async def flush(self) -> None:
+        """Write everything queued so far, not what is queued meanwhile"""
+        # Batches take the oldest keys first and new writes join at the back,
+        # so the keys queued now are gone after this many batches
+        batches = -(-len(self._pending) // self._batch_size)
+        for _ in range(batches):
+            if not self._pending:
+                break
+            await self._flush_batch()
+
+    async def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        if self._queued_value(key) is not None:
+            return False
+        return await self._cache.add(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._pending.pop(key, None)
+        await self.flush()
+        async with self._writing:
+            self._pending.pop(key, None)
+            await self._cache.delete(key)
+
+    async def clear(self) -> None:
+        async with self._writing:
+            self._pending.clear()
+            self._not_full.set()
+            await self._cache.clear()
+
+    async def startup(self) -> None:
+        self._closing = False
+        await self._cache.startup()
+
+    async def shutdown(self) -> None:
+        self._closing = True
+        self._not_full.set()  # Blocked writers write through instead
+        if self._drainer is not None:
+            # Under the lock, so no batch is cut off halfway
+            async with self._writing:
+                self._drainer.cancel()
+            try:
+                await self._drainer
+            except asyncio.CancelledError:
+                pass
+            self._drainer = None
+        await self.flush()
+        await self._cache.shutdown()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            **self._cache.stats(),
+            "write_queue_depth": len(self._pending) + len(self._inflight),
+            "writes_queued": self._queued,
+            "writes_dropped": self._dropped,
+            "write_batches": self._batches,
+            "write_errors": self._errors,
+        }
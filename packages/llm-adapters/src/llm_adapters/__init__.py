@@ -1,5 +1,11 @@
-# Import providers to trigger __init_subclass__ registration
-from llm_adapters import providers  # noqa: F401
 from llm_adapters.contracts.llm_interface import LLMInterface
 
+# Built-in providers, imported on first resolve() so a worker only pays
+# for the SDK it uses
+LLMInterface.register_lazy("anthropic", "llm_adapters.providers.anthropic_adapter:AnthropicAdapter")
+LLMInterface.register_lazy("openai", "llm_adapters.providers.openai_adapter:OpenAIAdapter")
+LLMInterface.register_lazy("mock", "llm_adapters.providers.mock_adapter:MockAdapter")
+LLMInterface.register_lazy("router", "llm_adapters.providers.router_adapter:RouterAdapter")
+LLMInterface.register_lazy("replay", "llm_adapters.providers.replay_adapter:ReplayAdapter")
+
 __all__ = ["LLMInterface"]
@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Optional
+
+# Third-party adapters register here: [project.entry-points.llm_adapters]
+ENTRY_POINT_GROUP = "llm_adapters"
 
 
 class LLMInterface(ABC):
@@ -8,9 +14,14 @@ class LLMInterface(ABC):
 
     Subclasses auto-register via __init_subclass__.
     Just declare `name = "provider"` and you're in the registry.
+
+    Adapters that haven't been imported yet can be registered lazily by
+    import path (register_lazy) or entry point; resolve() imports them on
+    first use, so a worker only loads the SDK it actually talks to.
     """
 
     _registry: dict[str, type["LLMInterface"]] = {}
+    _lazy: dict[str, str] = {}  # name -> "module:Class"
 
     name: str  # Each adapter declares its registry key
 
@@ -20,6 +31,26 @@ class LLMInterface(ABC):
         if hasattr(cls, "name") and cls.name:
             LLMInterface._registry[cls.name] = cls
 
+    @classmethod
+    def register_lazy(cls, name: str, target: str) -> None:
+        """Register an adapter by "module:Class" path without importing it"""
+        LLMInterface._lazy.setdefault(name, target)
+
+    @classmethod
+    def _load(cls, name: str) -> Optional[type["LLMInterface"]]:
+        """Import a lazily registered or entry-point adapter"""
+        target = cls._lazy.get(name)
+        if target is not None:
+            module, _, attr = target.partition(":")
+            adapter = getattr(import_module(module), attr)
+        else:
+            found = entry_points(group=ENTRY_POINT_GROUP, name=name)
+            if not found:
+                return None
+            adapter = next(iter(found)).load()
+        LLMInterface._registry[name] = adapter
+        return adapter
+
     @classmethod
     def resolve(cls, name: str, **kwargs) -> "LLMInterface":
         """
@@ -35,18 +66,21 @@ class LLMInterface(ABC):
         Raises:
             KeyError: If provider not found
         """
-        if name not in cls._registry:
-            available = ", ".join(cls._registry.keys())
+        adapter = cls._registry.get(name) or cls._load(name)
+        if adapter is None:
+            available = ", ".join(cls.available())
             raise KeyError(f"Unknown LLM provider '{name}'. Available: {available}")
 
         # Filter out empty kwargs
         kwargs = {k: v for k, v in kwargs.items() if v}
-        return cls._registry[name](**kwargs)
+        return adapter(**kwargs)
 
     @classmethod
     def available(cls) -> list[str]:
-        """List all registered provider names"""
-        return list(cls._registry.keys())
+        """List all provider names — imported, lazy and entry points"""
+        names = [*cls._registry, *cls._lazy]
+        names += [entry.name for entry in entry_points(group=ENTRY_POINT_GROUP)]
+        return list(dict.fromkeys(names))
 
     @abstractmethod
     async def rewrite(self, text: str, style: str) -> str:
@@ -71,3 +105,10 @@ class LLMInterface(ABC):
             Text chunks as they arrive
         """
         ...
+
+    def stats(self) -> dict[str, float]:
+        """Counters and gauges for metrics export"""
+        return {}
+
+    async def shutdown(self) -> None:
+        """Release files and connections (called from app lifespan)"""
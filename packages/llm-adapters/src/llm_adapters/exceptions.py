@@ -0,0 +1,26 @@
+class LLMError(Exception):
+    """Base exception for adapter-level failures"""
+
+    pass
+
+
+class OverloadedError(LLMError):
+    """Call was shed before reaching the provider; retry after `retry_after` seconds"""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(LLMError):
+    """The request's time budget ran out before the call finished"""
+
+    pass
+
+
+class ReplayMissError(LLMError):
+    """Replay mode has no recording for this request; `key` identifies it"""
+
+    def __init__(self, message: str, key: str = ""):
+        super().__init__(message)
+        self.key = key
@@ -1,5 +1,19 @@
-from llm_adapters.providers.anthropic_adapter import AnthropicAdapter
-from llm_adapters.providers.mock_adapter import MockAdapter
-from llm_adapters.providers.openai_adapter import OpenAIAdapter
+from importlib import import_module
 
-__all__ = ["AnthropicAdapter", "OpenAIAdapter", "MockAdapter"]
+# Resolved on attribute access so importing one provider module doesn't
+# drag in every SDK
+_PROVIDERS = {
+    "AnthropicAdapter": "llm_adapters.providers.anthropic_adapter",
+    "OpenAIAdapter": "llm_adapters.providers.openai_adapter",
+    "MockAdapter": "llm_adapters.providers.mock_adapter",
+    "RouterAdapter": "llm_adapters.providers.router_adapter",
+    "ReplayAdapter": "llm_adapters.providers.replay_adapter",
+}
+
+__all__ = list(_PROVIDERS)
+
+
+def __getattr__(name: str):
+    if name not in _PROVIDERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_PROVIDERS[name]), name)
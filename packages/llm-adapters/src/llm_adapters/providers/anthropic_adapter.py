@@ -2,19 +2,27 @@ from anthropic import AsyncAnthropic
 from anthropic.types import TextBlock
 
 from llm_adapters.contracts import LLMInterface
+from llm_adapters.support.deadline import timeout_kwargs
 
 
 class AnthropicAdapter(LLMInterface):
     name = "anthropic"  # Auto-registered!
 
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514", **_kwargs):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-sonnet-4-20250514",
+        max_tokens: int = 1024,
+        **_kwargs,
+    ):
         self._client = AsyncAnthropic(api_key=api_key)
         self._model = model
+        self._max_tokens = max_tokens
 
     async def rewrite(self, text: str, style: str) -> str:
         response = await self._client.messages.create(
             model=self._model,
-            max_tokens=1024,
+            max_tokens=self._max_tokens,
             messages=[
                 {
                     "role": "user",
@@ -22,6 +30,7 @@ class AnthropicAdapter(LLMInterface):
                     f"Return ONLY the rewritten text, nothing else.\n\nText: {text}",
                 }
             ],
+            **timeout_kwargs(),
         )
         block = response.content[0]
         if isinstance(block, TextBlock):
@@ -31,7 +40,7 @@ class AnthropicAdapter(LLMInterface):
     async def rewrite_stream(self, text: str, style: str):
         async with self._client.messages.stream(
             model=self._model,
-            max_tokens=1024,
+            max_tokens=self._max_tokens,
             messages=[
                 {
                     "role": "user",
@@ -39,6 +48,7 @@ class AnthropicAdapter(LLMInterface):
                     f"Return ONLY the rewritten text, nothing else.\n\nText: {text}",
                 }
             ],
+            **timeout_kwargs(),
         ) as stream:
             async for chunk in stream.text_stream:
                 yield chunk
@@ -1,4 +1,18 @@
+import asyncio
+import math
+import random
+from typing import Optional
+
 from llm_adapters.contracts import LLMInterface
+from llm_adapters.exceptions import LLMError
+
+DISTRIBUTIONS = ("fixed", "lognormal", "pareto")
+
+
+class MockProviderError(LLMError):
+    """Simulated provider outage"""
+
+    status_code = 503
 
 
 class MockAdapter(LLMInterface):
@@ -7,16 +21,69 @@ class MockAdapter(LLMInterface):
     """
     Mock adapter for testing and when no API key is set.
     Wraps text with style indicator.
+
+    Optional latency/failure profile for offline load and routing tests.
+    `latency` is the typical call time and `distribution` its shape:
+    "fixed" (always `latency`), "lognormal" (median `latency`, spread
+    `sigma`) or "pareto" (at least `latency`, heavy tail — lower
+    `tail_alpha` means fatter). `jitter` adds up to that many seconds on
+    top. Streams wait `ttft` (or a latency sample when unset) before the
+    first chunk and `token_delay` between chunks. Calls fail with
+    probability `failure_rate`.
     """
 
-    def __init__(self, **kwargs):
-        pass  # Mock adapter accepts but ignores all kwargs
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+        distribution: str = "fixed",
+        sigma: float = 0.5,
+        tail_alpha: float = 1.5,
+        ttft: Optional[float] = None,
+        token_delay: float = 0.0,
+        **kwargs,
+    ):
+        # Accepts but ignores all other kwargs
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}'")
+        self._latency = latency
+        self._jitter = jitter
+        self._failure_rate = failure_rate
+        self._distribution = distribution
+        self._sigma = sigma
+        self._tail_alpha = tail_alpha
+        self._ttft = ttft
+        self._token_delay = token_delay
+        self._random = random.Random(seed)
+
+    def sample_latency(self) -> float:
+        """Draw one call duration from the configured distribution"""
+        delay = self._latency
+        if delay and self._distribution == "lognormal":
+            delay = self._random.lognormvariate(math.log(delay), self._sigma)
+        elif delay and self._distribution == "pareto":
+            delay *= self._random.paretovariate(self._tail_alpha)
+        if self._jitter:
+            delay += self._random.uniform(0, self._jitter)
+        return delay
+
+    async def _simulate(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        if self._failure_rate and self._random.random() < self._failure_rate:
+            raise MockProviderError("Simulated provider failure")
 
     async def rewrite(self, text: str, style: str) -> str:
+        await self._simulate(self.sample_latency())
         return f"[*{style}*] {text}"
 
     async def rewrite_stream(self, text: str, style: str):
-        result = await self.rewrite(text, style)
+        await self._simulate(self.sample_latency() if self._ttft is None else self._ttft)
+        result = f"[*{style}*] {text}"
         # Simulate streaming by yielding word by word
-        for word in result.split():
+        for index, word in enumerate(result.split()):
+            if index and self._token_delay:
+                await asyncio.sleep(self._token_delay)
             yield word + " "
@@ -1,6 +1,7 @@
 from openai import AsyncOpenAI
 
 from llm_adapters.contracts import LLMInterface
+from llm_adapters.support.deadline import timeout_kwargs
 
 
 class OpenAIAdapter(LLMInterface):
@@ -20,6 +21,7 @@ class OpenAIAdapter(LLMInterface):
                     f"Return ONLY the rewritten text, nothing else.\n\nText: {text}",
                 }
             ],
+            **timeout_kwargs(),
         )
         return response.choices[0].message.content or ""
 
@@ -34,6 +36,7 @@ class OpenAIAdapter(LLMInterface):
                 }
             ],
             stream=True,
+            **timeout_kwargs(),
         )
         async for chunk in stream:
             if chunk.choices[0].delta.content:
@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import struct
+import time
+from collections.abc import AsyncIterator
+from typing import Optional
+
+from llm_adapters.contracts import LLMInterface
+from llm_adapters.exceptions import ReplayMissError
+
+# File header, then records:
+#   u32 body length | 32-byte key | u8 kind | u32 chunk count
+#   per chunk: f32 seconds since the previous chunk | u32 length | UTF-8 bytes
+# A call is one chunk whose delay is its whole latency; a stream's first
+# delay is its time to first chunk.
+MAGIC = b"RFRP\x01"
+_RECORD = struct.Struct("<I32sBI")
+_CHUNK = struct.Struct("<fI")
+_CALL, _STREAM = 0, 1
+
+
+def replay_key(text: str, style: str) -> bytes:
+    """Exact request identity — independent of the service's cache key scheme"""
+    return hashlib.sha256(f"{text}:{style}".encode()).digest()
+
+
+class ReplayAdapter(LLMInterface):
+    name = "replay"  # Auto-registered!
+
+    """
+    Record real provider traffic once, replay it offline.
+
+    mode="record" wraps the `upstream` provider (built from the remaining
+    kwargs, or injected as `adapter`) and appends every successful call —
+    response, latency and per-chunk stream timings — to `path`. Each
+    record goes out in one O_APPEND write, so several workers can record
+    into the same file.
+
+    mode="replay" memory-maps the file, indexes it by text and style and
+    serves the recorded responses with their recorded timing divided by
+    `speed` (inf = no waiting). Keys recorded several times cycle through
+    their recordings, reproducing the latency spread. Unrecorded requests
+    raise ReplayMissError. An empty file is a recording with no requests.
+    """
+
+    def __init__(
+        self,
+        path: str = "llm-replay.bin",
+        mode: str = "replay",
+        upstream: str = "mock",
+        speed: float = 1.0,
+        adapter: Optional[LLMInterface] = None,
+        **kwargs,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown replay mode '{mode}'")
+        self._path = path
+        self._mode = mode
+        self._speed = speed
+        self._recorded = 0
+        self._replayed = 0
+        self._misses = 0
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+
+        if mode == "record":
+            if upstream == self.name and adapter is None:
+                raise ValueError("Cannot record the replay adapter itself")
+            self._adapter = adapter or LLMInterface.resolve(upstream, **kwargs)
+            self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if os.fstat(self._fd).st_size == 0:
+                os.write(self._fd, MAGIC)
+        else:
+            with open(path, "rb") as file:
+                # mmap cannot map an empty file
+                if os.fstat(file.fileno()).st_size:
+                    self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = self._build_index() if self._map is not None else {}
+            self._turn: dict[bytes, int] = {}
+
+    # -- Recording ---------------------------------------------------------
+
+    def _append(self, key: bytes, kind: int, chunks: list[tuple[float, str]]) -> None:
+        parts = []
+        for delay, chunk in chunks:
+            data = chunk.encode()
+            parts.append(_CHUNK.pack(delay, len(data)))
+            parts.append(data)
+        payload = b"".join(parts)
+        header = _RECORD.pack(_RECORD.size - 4 + len(payload), key, kind, len(chunks))
+        os.write(self._fd, header + payload)
+        self._recorded += 1
+
+    async def _record_call(self, text: str, style: str) -> str:
+        started = time.perf_counter()
+        result = await self._adapter.rewrite(text, style)
+        self._append(replay_key(text, style), _CALL, [(time.perf_counter() - started, result)])
+        return result
+
+    async def _record_stream(self, text: str, style: str) -> AsyncIterator[str]:
+        chunks: list[tuple[float, str]] = []
+        last = time.perf_counter()
+        async for chunk in self._adapter.rewrite_stream(text, style):
+            now = time.perf_counter()
+            chunks.append((now - last, chunk))
+            last = now
+            yield chunk
+        # Only complete streams — a cut-off one would replay as a short answer
+        self._append(replay_key(text, style), _STREAM, chunks)
+
+    # -- Replay ------------------------------------------------------------
+
+    def _build_index(self) -> dict[bytes, list[int]]:
+        """Offsets of every complete record, by key; a torn tail is ignored"""
+        if self._map[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self._path} is not a replay recording")
+        index: dict[bytes, list[int]] = {}
+        offset, size = len(MAGIC), len(self._map)
+        while offset + _RECORD.size <= size:
+            length, key, _, _ = _RECORD.unpack_from(self._map, offset)
+            if offset + 4 + length > size:
+                break
+            index.setdefault(key, []).append(offset)
+            offset += 4 + length
+        return index
+
+    def _next_recording(self, text: str, style: str) -> list[tuple[float, str]]:
+        key = replay_key(text, style)
+        offsets = self._index.get(key)
+        if not offsets:
+            self._misses += 1
+            raise ReplayMissError(
+                f"No recorded response for this request (key {key.hex()})", key=key.hex()
+            )
+        turn = self._turn.get(key, 0)
+        self._turn[key] = turn + 1
+        self._replayed += 1
+
+        offset = offsets[turn % len(offsets)]
+        _, _, _, count = _RECORD.unpack_from(self._map, offset)
+        offset += _RECORD.size
+        chunks = []
+        for _ in range(count):
+            delay, length = _CHUNK.unpack_from(self._map, offset)
+            offset += _CHUNK.size
+            chunks.append((delay, self._map[offset : offset + length].decode()))
+            offset += length
+        return chunks
+
+    async def _wait(self, delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay / self._speed)
+
+    async def rewrite(self, text: str, style: str) -> str:
+        if self._mode == "record":
+            return await self._record_call(text, style)
+        # A recorded stream answers a call too, after its total duration
+        chunks = self._next_recording(text, style)
+        await self._wait(sum(delay for delay, _ in chunks))
+        return "".join(chunk for _, chunk in chunks)
+
+    async def rewrite_stream(self, text: str, style: str) -> AsyncIterator[str]:
+        if self._mode == "record":
+            async for chunk in self._record_stream(text, style):
+                yield chunk
+            return
+        for delay, chunk in self._next_recording(text, style):
+            await self._wait(delay)
+            yield chunk
+
+    async def shutdown(self) -> None:
+        if self._mode == "record":
+            await self._adapter.shutdown()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def stats(self) -> dict[str, float]:
+        upstream = self._adapter.stats() if self._mode == "record" else {}
+        return {
+            **upstream,
+            "replay_recorded": self._recorded,
+            "replay_replayed": self._replayed,
+            "replay_misses": self._misses,
+        }
@@ -0,0 +1,269 @@
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from llm_adapters.contracts import LLMInterface
+from llm_adapters.exceptions import OverloadedError
+from llm_adapters.support.circuit_breaker import CircuitBreaker
+
+T = TypeVar("T")
+
+
+def _is_provider_failure(exc: BaseException) -> bool:
+    """Client errors (4xx except 429) say nothing about provider health"""
+    status = getattr(exc, "status_code", None)
+    return not (isinstance(status, int) and 400 <= status < 500 and status != 429)
+
+
+class _LatencyStats:
+    """EWMA plus a window of recent samples for percentiles"""
+
+    def __init__(self, smoothing: float, window: int = 100):
+        self._smoothing = smoothing
+        self.ewma: Optional[float] = None
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        if self.ewma is None:
+            self.ewma = seconds
+        else:
+            self.ewma += self._smoothing * (seconds - self.ewma)
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class _Route:
+    def __init__(self, name: str, adapter: LLMInterface, breaker: CircuitBreaker, smoothing: float):
+        self.name = name
+        self.adapter = adapter
+        self.breaker = breaker
+        self.calls = _LatencyStats(smoothing)  # rewrite(): full latency
+        self.streams = _LatencyStats(smoothing)  # rewrite_stream(): time to first chunk
+        self.error_rate = 0.0
+        self._smoothing = smoothing
+
+    def score(self, stats: _LatencyStats) -> float:
+        """Expected seconds per successful answer; unmeasured routes go first"""
+        return (stats.ewma or 0.0) / max(1.0 - self.error_rate, 0.05)
+
+    def succeeded(self) -> None:
+        self.error_rate -= self._smoothing * self.error_rate
+        self.breaker.record(True)
+
+    def failed(self, exc: BaseException) -> None:
+        if not _is_provider_failure(exc):
+            self.breaker.abandon()
+            return
+        self.error_rate += self._smoothing * (1.0 - self.error_rate)
+        self.breaker.record(False)
+
+
+class RouterAdapter(LLMInterface):
+    name = "router"  # Auto-registered!
+
+    """
+    Latency-aware composite over several registered adapters.
+
+    Each call goes to the healthy route with the lowest expected time per
+    successful answer (EWMA latency / success rate). If it hasn't answered
+    within the `hedge_percentile` of its recent latencies, the next route
+    is raced against it; the first answer wins and the loser is cancelled.
+    Provider failures fail over to the next route, and a per-route circuit
+    breaker takes a failing route out of rotation until its cooldown ends.
+
+    `routes` maps a route name to its adapter options; "provider" picks the
+    registered adapter (defaults to the route name), the rest go to its
+    constructor on top of the shared kwargs. `adapters` injects ready-made
+    adapters instead. 0 disables hedging / breaking, matching the
+    container's falsy-kwarg filtering.
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        adapters: Optional[Mapping[str, LLMInterface]] = None,
+        hedge_percentile: float = 0.0,
+        hedge_min_samples: int = 20,
+        breaker_threshold: float = 0.0,
+        breaker_cooldown: float = 30.0,
+        smoothing: float = 0.2,
+        **kwargs,
+    ):
+        resolved = dict(adapters or {})
+        for route_name, options in (routes or {}).items():
+            options = dict(options)
+            provider = options.pop("provider", route_name)
+            if provider == self.name:
+                raise ValueError("A router cannot route to another router")
+            resolved[route_name] = LLMInterface.resolve(provider, **{**kwargs, **options})
+
+        if not resolved:
+            raise ValueError("Router needs at least one route")
+
+        self._routes = [
+            _Route(
+                route_name,
+                adapter,
+                CircuitBreaker(threshold=breaker_threshold, cooldown=breaker_cooldown),
+                smoothing,
+            )
+            for route_name, adapter in resolved.items()
+        ]
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_samples = hedge_min_samples
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._failovers = 0
+
+    def _ranked(self, streaming: bool) -> list[_Route]:
+        healthy = [route for route in self._routes if route.breaker.available()]
+        if not healthy:
+            retry_after = min(route.breaker.remaining() for route in self._routes)
+            raise OverloadedError("All LLM routes are unavailable", max(1.0, retry_after))
+        return sorted(
+            healthy, key=lambda route: route.score(route.streams if streaming else route.calls)
+        )
+
+    def _hedge_delay(self, stats: _LatencyStats) -> Optional[float]:
+        if self._hedge_percentile <= 0 or len(stats.samples) < self._hedge_min_samples:
+            return None
+        return stats.percentile(self._hedge_percentile)
+
+    async def _race(
+        self,
+        routes: list[_Route],
+        streaming: bool,
+        attempt: Callable[[_Route], Awaitable[T]],
+        discard: Optional[Callable[[T], Awaitable[None]]] = None,
+    ) -> tuple[_Route, T]:
+        """
+        Run `attempt` on the best route, hedging and failing over down the ranking.
+
+        Results of attempts that also succeeded but were not picked are
+        passed to `discard` (e.g. to close an opened stream).
+        """
+        primary, backups = routes[0], routes[1:]
+        delay = self._hedge_delay(primary.streams if streaming else primary.calls)
+        tasks = {asyncio.create_task(attempt(primary)): primary}
+        hedged = False
+        error: Optional[BaseException] = None
+
+        try:
+            while tasks:
+                timeout = delay if not hedged and backups else None
+                done, _ = await asyncio.wait(
+                    tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Slower than its usual tail — race the next best route
+                    hedged = True
+                    self._hedges += 1
+                    route = backups.pop(0)
+                    tasks[asyncio.create_task(attempt(route))] = route
+                    continue
+
+                for task in sorted(done, key=lambda task: task.exception() is not None):
+                    route = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if route is not primary and hedged:
+                            self._hedge_wins += 1
+                        return route, task.result()
+                    if not _is_provider_failure(error):
+                        raise error
+
+                if not tasks and backups:
+                    self._failovers += 1
+                    route = backups.pop(0)
+                    tasks[asyncio.create_task(attempt(route))] = route
+
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif discard is not None and not task.cancelled() and task.exception() is None:
+                    # Finished in the same round as the winner
+                    await discard(task.result())
+
+    async def _timed(self, route: _Route, stats: _LatencyStats, call: Awaitable[T]) -> T:
+        route.breaker.begin()
+        started = time.monotonic()
+        try:
+            result = await call
+        except asyncio.CancelledError:
+            # Lost a hedge race — it took at least this long
+            stats.observe(time.monotonic() - started)
+            route.breaker.abandon()
+            raise
+        except Exception as exc:
+            route.failed(exc)
+            raise
+        stats.observe(time.monotonic() - started)
+        route.succeeded()
+        return result
+
+    async def rewrite(self, text: str, style: str) -> str:
+        _, result = await self._race(
+            self._ranked(streaming=False),
+            False,
+            lambda route: self._timed(route, route.calls, route.adapter.rewrite(text, style)),
+        )
+        return result
+
+    async def _open_stream(
+        self, route: _Route, text: str, style: str
+    ) -> tuple[AsyncIterator[str], Optional[str]]:
+        chunks = route.adapter.rewrite_stream(text, style)
+        try:
+            first = await self._timed(route, route.streams, anext(chunks, None))
+        except BaseException:
+            await chunks.aclose()
+            raise
+        return chunks, first
+
+    async def rewrite_stream(self, text: str, style: str) -> AsyncIterator[str]:
+        # Hedging only covers time to first chunk — once output has been
+        # sent we're committed to that route
+        route, (chunks, first) = await self._race(
+            self._ranked(streaming=True),
+            True,
+            lambda route: self._open_stream(route, text, style),
+            lambda opened: opened[0].aclose(),
+        )
+        try:
+            if first is None:
+                return
+            yield first
+            async for chunk in chunks:
+                yield chunk
+        except Exception as exc:
+            route.failed(exc)
+            raise
+        finally:
+            await chunks.aclose()
+
+    def stats(self) -> dict[str, float]:
+        stats: dict[str, float] = {
+            "hedges": self._hedges,
+            "hedge_wins": self._hedge_wins,
+            "failovers": self._failovers,
+        }
+        for route in self._routes:
+            prefix = f"route.{route.name}"
+            stats[f"{prefix}.latency_ms"] = (route.calls.ewma or 0.0) * 1000
+            stats[f"{prefix}.ttft_ms"] = (route.streams.ewma or 0.0) * 1000
+            stats[f"{prefix}.error_rate"] = route.error_rate
+            stats[f"{prefix}.breaker_open"] = int(not route.breaker.available())
+            stats[f"{prefix}.breaker_trips"] = route.breaker.trips
+        return stats
+
+    async def shutdown(self) -> None:
+        for route in self._routes:
+            await route.adapter.shutdown()
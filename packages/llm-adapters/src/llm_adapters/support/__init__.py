@@ -0,0 +1,23 @@
+from llm_adapters.support.circuit_breaker import CircuitBreaker
+from llm_adapters.support.deadline import (
+    DeadlineAdapter,
+    deadline,
+    iter_within_deadline,
+    remaining,
+    timeout_kwargs,
+    within_deadline,
+)
+from llm_adapters.support.limiter import AdaptiveLimiter, LimitedAdapter, is_overload
+
+__all__ = [
+    "AdaptiveLimiter",
+    "CircuitBreaker",
+    "DeadlineAdapter",
+    "LimitedAdapter",
+    "deadline",
+    "is_overload",
+    "iter_within_deadline",
+    "remaining",
+    "timeout_kwargs",
+    "within_deadline",
+]
@@ -0,0 +1,90 @@
+import time
+from collections import deque
+from typing import Callable
+
+
+class CircuitBreaker:
+    """
+    Per-dependency circuit breaker.
+
+    Closed: calls flow and outcomes go into a rolling window of the last
+    `window` calls. Once at least `min_calls` are in it and the failure
+    share reaches `threshold`, the breaker opens. Open: no calls for
+    `cooldown` seconds. Half-open: one probe call is let through; its
+    outcome closes the breaker or opens it again. A `threshold` of 0
+    disables tripping.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._threshold = threshold
+        self._min_calls = min_calls
+        self._cooldown = cooldown
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at: float | None = None
+        self._probing = False
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at < self._cooldown:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def available(self) -> bool:
+        """True if a call may be sent now"""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._probing)
+
+    def remaining(self) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self._cooldown - self._clock())
+
+    def begin(self) -> None:
+        """Mark a call as sent; in half-open state it becomes the probe"""
+        if self.state == self.HALF_OPEN:
+            self._probing = True
+
+    def abandon(self) -> None:
+        """A sent call ended without telling us anything (cancelled, client error)"""
+        self._probing = False
+
+    def record(self, success: bool) -> None:
+        """Feed a call outcome"""
+        self._probing = False
+        state = self.state
+        if state == self.OPEN:
+            # Late result from a call sent before the trip
+            return
+        if state == self.HALF_OPEN:
+            if success:
+                self._opened_at = None
+                self._outcomes.clear()
+            else:
+                # Still failing — a trip like any other
+                self._opened_at = self._clock()
+                self.trips += 1
+            return
+
+        self._outcomes.append(success)
+        if self._threshold <= 0 or len(self._outcomes) < self._min_calls:
+            return
+        failures = self._outcomes.count(False)
+        if failures / len(self._outcomes) >= self._threshold:
+            self._opened_at = self._clock()
+            self.trips += 1
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Optional
+
+from llm_adapters.contracts import LLMInterface
+from llm_adapters.exceptions import DeadlineExceededError
+
+# Absolute time.monotonic() by which the current request must finish.
+# Context-local, so it follows the request into every task it spawns.
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Give the enclosed work at most `seconds` (None or <= 0 = no limit).
+
+    Nested scopes can only tighten an outer deadline, never extend it.
+    """
+    if not seconds or seconds <= 0:
+        yield
+        return
+
+    expires_at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(expires_at if outer is None else min(outer, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current deadline, None when there is none"""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return max(0.0, expires_at - time.monotonic())
+
+
+def timeout_kwargs() -> dict[str, float]:
+    """SDK request kwargs carrying the remaining budget, if any"""
+    budget = remaining()
+    return {} if budget is None else {"timeout": budget}
+
+
+@asynccontextmanager
+async def within_deadline() -> AsyncGenerator[None, None]:
+    """
+    Cancel the enclosed awaits when the deadline passes.
+
+    Must not span a `yield` in an async generator — the timeout belongs to
+    the task that entered it. Use iter_within_deadline() for streams.
+
+    Raises:
+        DeadlineExceededError: Budget already spent, or ran out inside
+    """
+    budget = remaining()
+    if budget is None:
+        # No deadline — skip the timer entirely on the hot path
+        yield
+        return
+    if budget <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+
+    timeout = asyncio.timeout(budget)
+    try:
+        async with timeout:
+            yield
+    except TimeoutError:
+        if timeout.expired():
+            raise DeadlineExceededError("Request deadline exceeded") from None
+        raise
+
+
+async def iter_within_deadline(chunks: AsyncIterator[str]) -> AsyncGenerator[str, None]:
+    """Re-yield chunks, bounding each wait for the next one by the deadline"""
+    try:
+        while True:
+            try:
+                async with within_deadline():
+                    chunk = await anext(chunks)
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        await chunks.aclose()
+
+
+class DeadlineAdapter(LLMInterface):
+    """
+    Holds every call of the wrapped adapter to the request deadline.
+
+    Calls with no budget left fail fast; running calls are cancelled when
+    it expires. Counts upstream calls cut short before finishing — by the
+    deadline, a client disconnect or a lost hedge race — so the waste shows
+    up in metrics.
+    """
+
+    def __init__(self, adapter: LLMInterface):
+        self._adapter = adapter
+        self._calls = 0
+        self._cancelled_calls = 0
+        self._deadline_exceeded = 0
+
+    def _check_budget(self) -> None:
+        budget = remaining()
+        if budget is not None and budget <= 0:
+            self._deadline_exceeded += 1
+            raise DeadlineExceededError("Request deadline exceeded")
+
+    def _cut_short(self) -> None:
+        self._cancelled_calls += 1
+        if remaining() == 0:
+            # Our own timeout, or an outer scope on the same deadline firing first
+            self._deadline_exceeded += 1
+
+    async def rewrite(self, text: str, style: str) -> str:
+        self._check_budget()
+        self._calls += 1
+        try:
+            async with within_deadline():
+                return await self._adapter.rewrite(text, style)
+        except (DeadlineExceededError, asyncio.CancelledError):
+            self._cut_short()
+            raise
+
+    async def rewrite_stream(self, text: str, style: str) -> AsyncIterator[str]:
+        self._check_budget()
+        self._calls += 1
+        try:
+            async for chunk in iter_within_deadline(self._adapter.rewrite_stream(text, style)):
+                yield chunk
+        except (DeadlineExceededError, asyncio.CancelledError, GeneratorExit):
+            # GeneratorExit: the consumer closed us mid-stream
+            self._cut_short()
+            raise
+
+    def stats(self) -> dict[str, float]:
+        return {
+            **self._adapter.stats(),
+            "calls": self._calls,
+            "cancelled_calls": self._cancelled_calls,
+            "deadline_exceeded": self._deadline_exceeded,
+        }
+
+    async def shutdown(self) -> None:
+        await self._adapter.shutdown()
@@ -0,0 +1,235 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Optional
+
+from llm_adapters.contracts import LLMInterface
+from llm_adapters.exceptions import OverloadedError
+from llm_adapters.support.deadline import remaining
+
+
+def is_overload(exc: BaseException) -> bool:
+    """
+    True for provider errors that mean "slow down": 429, 5xx and timeouts.
+
+    A timeout once the request deadline has run out is the caller's own
+    budget (passed to the SDK by timeout_kwargs()), not a slow provider.
+    """
+    if isinstance(exc, TimeoutError) or type(exc).__name__ == "APITimeoutError":
+        # Both SDKs raise APITimeoutError, which is not a TimeoutError
+        budget = remaining()
+        return budget is None or budget > 0
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency window with a bounded wait queue.
+
+    A call that finishes within `latency_tolerance` x the baseline latency
+    grows the window by 1/limit (about +1 per window of calls) while the
+    window is in use. An overload error (429, 5xx, timeout) or a slower call
+    shrinks it by `backoff` — at most once per window of completions, so a
+    burst of failures from one overload counts once.
+
+    Callers beyond the window wait FIFO, at most `max_queue` of them and for
+    at most `max_queue_wait` seconds. Anything past that is shed at once
+    with OverloadedError rather than piling up.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 20,
+        min_limit: float = 1,
+        max_limit: float = 200,
+        max_queue: float = 500,
+        max_queue_wait: float = 10.0,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.9,
+        smoothing: float = 0.05,
+    ):
+        self._limit = float(initial_limit)
+        self._min_limit = float(min_limit)
+        self._max_limit = float(max_limit)
+        self._max_queue = int(max_queue)
+        self._max_queue_wait = max_queue_wait
+        self._latency_tolerance = latency_tolerance
+        self._backoff = backoff
+        self._smoothing = smoothing
+        self._inflight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._baseline: Optional[float] = None
+        self._since_decrease = 0
+        self._shed = 0
+        self._queue_timeouts = 0
+        self._overload_signals = 0
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> float:
+        """Rough seconds until a slot frees up for a newly arriving caller"""
+        per_call = self._baseline or 1.0
+        return max(1.0, per_call * (len(self._waiters) + 1) / self.limit)
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, queueing if the window is full.
+
+        Raises:
+            OverloadedError: Queue is full, or no slot freed up in time
+        """
+        if self._inflight < self.limit and not self._waiters:
+            self._inflight += 1
+            return
+
+        if len(self._waiters) >= self._max_queue:
+            self._shed += 1
+            raise OverloadedError("LLM concurrency limit reached", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            async with asyncio.timeout(self._max_queue_wait):
+                await future
+        except BaseException as exc:
+            self._abandon(future)
+            if isinstance(exc, TimeoutError):
+                self._queue_timeouts += 1
+                raise OverloadedError(
+                    "Timed out waiting for an LLM slot", self.retry_after()
+                ) from None
+            raise
+
+    def _abandon(self, future: asyncio.Future) -> None:
+        if future.done() and not future.cancelled():
+            # Slot was handed over just as we gave up — pass it on
+            self._inflight -= 1
+            self._wake()
+            return
+        future.cancel()
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False) -> None:
+        """
+        Return a slot and feed the outcome into the window.
+
+        Args:
+            latency: Seconds the call took, None if it failed or was abandoned
+            overloaded: The provider signalled overload
+        """
+        busy = self._inflight >= self.limit or bool(self._waiters)
+        self._inflight -= 1
+        self._since_decrease += 1
+
+        if overloaded:
+            self._overload_signals += 1
+            self._decrease()
+        elif latency is not None:
+            self._observe(latency, busy)
+
+        self._wake()
+
+    def _observe(self, latency: float, busy: bool) -> None:
+        if self._baseline is None:
+            self._baseline = latency
+            return
+
+        if latency > self._baseline * self._latency_tolerance:
+            self._decrease()
+        elif busy:
+            # Only grow when the window is what's holding callers back
+            self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+        self._baseline += self._smoothing * (latency - self._baseline)
+
+    def _decrease(self) -> None:
+        if self._since_decrease < self.limit:
+            return
+        self._since_decrease = 0
+        self._limit = max(self._min_limit, self._limit * self._backoff)
+
+    def _wake(self) -> None:
+        while self._waiters and self._inflight < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._inflight += 1
+                future.set_result(None)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "limit": self.limit,
+            "inflight": self._inflight,
+            "queue_depth": len(self._waiters),
+            "shed": self._shed,
+            "queue_timeouts": self._queue_timeouts,
+            "overload_signals": self._overload_signals,
+            "latency_baseline_ms": (self._baseline or 0.0) * 1000,
+        }
+
+
+class LimitedAdapter(LLMInterface):
+    """
+    Runs every call of the wrapped adapter through an AdaptiveLimiter.
+
+    Has no `name`, so it never enters the registry — wrap a resolved
+    adapter instead. Streams hold their slot until they finish; time to
+    first chunk is their latency sample.
+    """
+
+    def __init__(self, adapter: LLMInterface, limiter: AdaptiveLimiter):
+        self._adapter = adapter
+        self._limiter = limiter
+
+    @classmethod
+    def wrap(cls, adapter: LLMInterface, enabled: bool = True, options: Optional[dict] = None):
+        """Wrap adapter with a limiter built from `options`, or return it unchanged"""
+        if not enabled:
+            return adapter
+        return cls(adapter, AdaptiveLimiter(**(options or {})))
+
+    @property
+    def limiter(self) -> AdaptiveLimiter:
+        return self._limiter
+
+    async def rewrite(self, text: str, style: str) -> str:
+        await self._limiter.acquire()
+        started = time.monotonic()
+        try:
+            result = await self._adapter.rewrite(text, style)
+        except BaseException as exc:
+            self._limiter.release(overloaded=is_overload(exc))
+            raise
+        self._limiter.release(time.monotonic() - started)
+        return result
+
+    async def rewrite_stream(self, text: str, style: str) -> AsyncIterator[str]:
+        await self._limiter.acquire()
+        started = time.monotonic()
+        first_chunk: Optional[float] = None
+        try:
+            async for chunk in self._adapter.rewrite_stream(text, style):
+                if first_chunk is None:
+                    first_chunk = time.monotonic() - started
+                yield chunk
+        except BaseException as exc:
+            # Includes GeneratorExit when the consumer stops early
+            self._limiter.release(overloaded=is_overload(exc))
+            raise
+        self._limiter.release(first_chunk)
+
+    def stats(self) -> dict[str, float]:
+        return {**self._adapter.stats(), **self._limiter.stats()}
+
+    async def shutdown(self) -> None:
+        await self._adapter.shutdown()
@@ -0,0 +1 @@
+# Console commands - run with python -m rewriteforge.app.console.<command>
@@ -0,0 +1,91 @@
+"""
+Pre-warm a memory cache snapshot from a JSONL file of text/style pairs.
+
+Each line is {"text": ..., "style": ...} (style optional). Pairs are
+rewritten through the configured LLM provider, exactly as the API would,
+and the results written to a snapshot the server loads at startup with
+CACHE_BACKEND=memory and CACHE_SNAPSHOT_PATH. Entries already in an
+existing snapshot at --output are kept and served from cache.
+
+Entries are stored without an expiry: the server's CACHE_TTL starts when
+it loads the snapshot, however long after the build that is.
+
+    uv run python -m rewriteforge.app.console.prewarm inputs.jsonl --output cache.snapshot
+"""
+
+import argparse
+import asyncio
+import json
+from collections.abc import Iterable
+from typing import Optional
+
+from cache_adapters.providers.memory_cache import MemoryCache
+from dependency_injector import providers
+
+from rewriteforge.app.services.freshness import Freshness
+from rewriteforge.container import Container
+
+
+def read_pairs(path: str) -> list[tuple[str, Optional[str]]]:
+    with open(path) as file:
+        rows = [json.loads(line) for line in file if line.strip()]
+    return [(row["text"], row.get("style")) for row in rows]
+
+
+async def prewarm(
+    pairs: Iterable[tuple[str, Optional[str]]],
+    output: str,
+    concurrency: int = 8,
+    container: Optional[Container] = None,
+) -> dict[str, int]:
+    """Rewrite every pair into a snapshot at `output`; returns counts"""
+    container = container or Container()
+    settings = container.config()
+    cache = MemoryCache(
+        compression=settings.cache_compression,
+        compression_level=settings.cache_compression_level or None,
+        compression_min_bytes=settings.cache_compression_min_bytes,
+        compression_dictionary=settings.cache_compression_dictionary or None,
+        snapshot_path=output,
+    )
+    container.cache_adapter.override(providers.Object(cache))
+    # Freshness headers and their storage TTL would date entries from the build
+    container.freshness.override(providers.Object(Freshness(ttl=0)))
+    service = container.rewrite_service()
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"rewritten": 0, "cached": 0, "failed": 0}
+
+    async def run(text: str, style: Optional[str]) -> None:
+        async with semaphore:
+            try:
+                result = await service.rewrite(text, style)
+            except Exception:
+                counts["failed"] += 1
+                return
+        counts["cached" if result["cached"] else "rewritten"] += 1
+
+    await cache.startup()
+    try:
+        await asyncio.gather(*(run(text, style) for text, style in pairs))
+    finally:
+        await cache.shutdown()
+        container.cache_adapter.reset_override()
+        container.freshness.reset_override()
+    counts["saved"] = cache.stats()["snapshot_saved"]
+    return counts
+
+
+def main(args) -> None:
+    counts = asyncio.run(prewarm(read_pairs(args.input), args.output, args.concurrency))
+    print(
+        f"{counts['rewritten']} rewritten, {counts['cached']} already cached, "
+        f"{counts['failed']} failed; {counts['saved']} entries written to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="JSONL file of {text, style} pairs")
+    parser.add_argument("--output", required=True, help="Snapshot path (CACHE_SNAPSHOT_PATH)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Rewrites in flight")
+    main(parser.parse_args())
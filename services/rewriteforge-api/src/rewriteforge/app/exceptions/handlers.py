@@ -1,5 +1,8 @@
+import math
+
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from llm_adapters.exceptions import DeadlineExceededError, OverloadedError, ReplayMissError
 
 
 async def validation_error_handler(request: Request, exc: Exception) -> JSONResponse:
@@ -7,3 +10,25 @@ async def validation_error_handler(request: Request, exc: Exception) -> JSONResp
         status_code=422,
         content={"error": "Validation Error", "detail": str(exc)},
     )
+
+
+async def overloaded_error_handler(request: Request, exc: OverloadedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"error": "Service Overloaded", "detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError) -> JSONResponse:
+    return JSONResponse(
+        status_code=504,
+        content={"error": "Deadline Exceeded", "detail": str(exc)},
+    )
+
+
+async def replay_miss_handler(request: Request, exc: ReplayMissError) -> JSONResponse:
+    return JSONResponse(
+        status_code=404,
+        content={"error": "Not Recorded", "detail": str(exc), "replay_key": exc.key},
+    )
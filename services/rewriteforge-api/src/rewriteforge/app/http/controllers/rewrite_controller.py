@@ -1,38 +1,138 @@
-from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+import asyncio
+from collections.abc import AsyncIterator
+from typing import AsyncGenerator
+
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import StreamingResponse
+from llm_adapters.exceptions import DeadlineExceededError
 
-from rewriteforge.app.http.requests.rewrite_request import RewriteRequest, RewriteResponse
+from rewriteforge.app.http.requests.rewrite_request import (
+    BatchRewriteRequest,
+    BatchRewriteResponse,
+    RewriteRequest,
+    RewriteResponse,
+)
+from rewriteforge.app.http.responses import FastJSONResponse, dumps
 from rewriteforge.app.services.rewrite_service import RewriteService
-from rewriteforge.container import Container
 
 router = APIRouter()
 
 
+async def rewrite_service(request: Request) -> RewriteService:
+    """
+    The container's singleton service.
+
+    An async dependency on purpose: FastAPI runs sync ones — including
+    dependency_injector's Provide markers — in the threadpool, which was
+    the biggest single cost of a cache hit.
+    """
+    return request.app.state.container.rewrite_service()
+
+
 @router.post("/v1/rewrite", response_model=RewriteResponse)
-@inject
 async def rewrite(
     request: RewriteRequest,
-    service: RewriteService = Depends(Provide[Container.rewrite_service]),
+    service: RewriteService = Depends(rewrite_service),
 ):
     """Rewrite text in specified style"""
-    return await service.rewrite(request.text, request.style)
+    # The service already returns the response shape — serialize it as is
+    return FastJSONResponse(await service.rewrite(request.text, request.style))
 
 
 @router.post("/v1/rewrite/stream")
-@inject
 async def rewrite_stream(
     request: RewriteRequest,
-    service: RewriteService = Depends(Provide[Container.rewrite_service]),
+    http_request: Request,
+    service: RewriteService = Depends(rewrite_service),
 ):
     """Rewrite with streaming response (SSE)"""
+    chunks = service.rewrite_stream(request.text, request.style)
+    # Wait for the first chunk before committing to a 200, so a shed or
+    # failed upstream call still gets a real status code
+    first = await anext(chunks, None)
 
     async def event_generator():
-        async for chunk in service.rewrite_stream(request.text, request.style):
-            yield f"data: {chunk}\n\n"
+        try:
+            if first is not None:
+                yield _sse_event(first)
+            async for chunk in _until_disconnected(http_request, chunks):
+                yield _sse_event(chunk)
+        except DeadlineExceededError as exc:
+            # Headers are already sent — report it in-band
+            yield f"event: error\ndata: {exc}\n\n"
+            return
         yield "data: [DONE]\n\n"
 
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
     )
+
+
+@router.post("/v1/rewrite/batch", response_model=BatchRewriteResponse)
+async def rewrite_batch(
+    request: BatchRewriteRequest,
+    stream: bool = False,
+    service: RewriteService = Depends(rewrite_service),
+):
+    """
+    Rewrite many items in one request.
+
+    With ?stream=true, results are sent as NDJSON in completion order,
+    each carrying its input "index".
+    """
+    items = [(item.text, item.style) for item in request.items]
+
+    if not stream:
+        return FastJSONResponse({"results": await service.rewrite_batch(items)})
+
+    results = service.rewrite_batch_stream(items)
+
+    async def ndjson_generator():
+        async for result in results:
+            yield dumps(result) + b"\n"
+
+    return StreamingResponse(
+        ndjson_generator(),
+        media_type="application/x-ndjson",
+    )
+
+
+def _sse_event(chunk: str) -> str:
+    """Frame a chunk as one SSE event — every line needs its own data: prefix"""
+    return "".join(f"data: {line}\n" for line in chunk.split("\n")) + "\n"
+
+
+async def _until_disconnected(
+    request: Request, chunks: AsyncIterator[str]
+) -> AsyncGenerator[str, None]:
+    """
+    Re-yield chunks, closing the upstream as soon as the client disconnects.
+
+    Otherwise a dropped client is only noticed on the next write, and a slow
+    upstream keeps running until it produces one.
+    """
+    disconnected = asyncio.create_task(_wait_for_disconnect(request))
+    try:
+        while True:
+            next_chunk = asyncio.ensure_future(anext(chunks))
+            await asyncio.wait({next_chunk, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_chunk.done():
+                next_chunk.cancel()
+                # Let the cancellation unwind before closing the generator
+                await asyncio.wait({next_chunk})
+                return
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        disconnected.cancel()
+        await chunks.aclose()
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    # The body has been read, so the only message left is the disconnect
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
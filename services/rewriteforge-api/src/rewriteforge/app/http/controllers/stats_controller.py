@@ -0,0 +1,59 @@
+from cache_adapters import CacheInterface
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from llm_adapters import LLMInterface
+
+from rewriteforge.app.services.freshness import Freshness
+from rewriteforge.app.services.fuzzy_cache import FuzzyCache
+from rewriteforge.app.services.metrics import Metrics
+from rewriteforge.app.services.single_flight import SingleFlight
+from rewriteforge.container import Container
+
+router = APIRouter()
+
+
+@router.get("/v1/stats")
+@inject
+async def stats(
+    llm: LLMInterface = Depends(Provide[Container.llm_adapter]),
+    cache: CacheInterface = Depends(Provide[Container.cache_adapter]),
+    single_flight: SingleFlight = Depends(Provide[Container.single_flight]),
+    fuzzy: FuzzyCache = Depends(Provide[Container.fuzzy_cache]),
+    freshness: Freshness = Depends(Provide[Container.freshness]),
+):
+    """
+    Live counters and gauges as JSON.
+
+    Includes the LLM limiter's "limit" and "queue_depth" for autoscalers.
+    """
+    return {
+        "llm": llm.stats(),
+        "cache": cache.stats(),
+        "single_flight": single_flight.stats(),
+        "fuzzy": fuzzy.stats(),
+        "freshness": freshness.stats(),
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+@inject
+async def metrics(
+    metrics: Metrics = Depends(Provide[Container.metrics]),
+    llm: LLMInterface = Depends(Provide[Container.llm_adapter]),
+    cache: CacheInterface = Depends(Provide[Container.cache_adapter]),
+    single_flight: SingleFlight = Depends(Provide[Container.single_flight]),
+    fuzzy: FuzzyCache = Depends(Provide[Container.fuzzy_cache]),
+    freshness: Freshness = Depends(Provide[Container.freshness]),
+):
+    """Stage histograms, counters and adapter stats in Prometheus text format"""
+    body = metrics.render(
+        {
+            "llm": llm.stats(),
+            "cache": cache.stats(),
+            "single_flight": single_flight.stats(),
+            "fuzzy": fuzzy.stats(),
+            "freshness": freshness.stats(),
+        }
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -0,0 +1,45 @@
+from typing import Optional
+
+from llm_adapters.support.deadline import deadline
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+TIMEOUT_HEADER = b"x-request-timeout"
+
+
+class DeadlineMiddleware:
+    """
+    Gives every request a deadline.
+
+    Clients may ask for a shorter budget with `X-Request-Timeout: <seconds>`;
+    `default_timeout` applies otherwise and is also the ceiling (0 = none).
+    Everything downstream — cache lookups, LLM calls, SDK timeouts — reads
+    what is left of it.
+    """
+
+    def __init__(self, app: ASGIApp, default_timeout: float = 0.0):
+        self.app = app
+        self.default_timeout = default_timeout
+
+    def _timeout_for(self, scope: Scope) -> Optional[float]:
+        requested = None
+        for name, value in scope["headers"]:
+            if name == TIMEOUT_HEADER:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    pass
+                break
+
+        if requested is None or requested <= 0:
+            return self.default_timeout or None
+        if self.default_timeout:
+            return min(requested, self.default_timeout)
+        return requested
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with deadline(self._timeout_for(scope)):
+            await self.app(scope, receive, send)
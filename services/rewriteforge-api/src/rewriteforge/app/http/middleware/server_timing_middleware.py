@@ -0,0 +1,36 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from rewriteforge.app.services.metrics import collect_timings, server_timing
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header with the request's per-stage breakdown.
+
+    Stages recorded by Metrics.observe while the request runs are summed
+    and sent with the response headers, plus "app" for everything up to
+    that point. Streams report what happened before their first chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        with collect_timings() as timings:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    timings["app"] = perf_counter() - started
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(timings).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
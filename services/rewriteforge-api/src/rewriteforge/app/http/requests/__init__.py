@@ -1,3 +1,17 @@
-from rewriteforge.app.http.requests.rewrite_request import RewriteRequest, RewriteResponse
+from rewriteforge.app.http.requests.rewrite_request import (
+    BatchRewriteItem,
+    BatchRewriteRequest,
+    BatchRewriteRequestItem,
+    BatchRewriteResponse,
+    RewriteRequest,
+    RewriteResponse,
+)
 
-__all__ = ["RewriteRequest", "RewriteResponse"]
+__all__ = [
+    "BatchRewriteItem",
+    "BatchRewriteRequest",
+    "BatchRewriteRequestItem",
+    "BatchRewriteResponse",
+    "RewriteRequest",
+    "RewriteResponse",
+]
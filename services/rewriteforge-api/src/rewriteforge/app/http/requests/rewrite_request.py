@@ -17,3 +17,46 @@ class RewriteResponse(BaseModel):
     rewritten: str
     style: str
     cached: bool
+    stale: bool = False
+    fuzzy: bool = False
+    coalesced: bool = False
+    segments_reused: int = 0
+    segments_regenerated: int = 0
+
+
+class BatchRewriteRequestItem(BaseModel):
+    """
+    One batch item. Text limits are checked per item by the service, so a
+    bad item gets an error result instead of rejecting the whole batch.
+    """
+
+    text: str = Field(..., description="Text to rewrite")
+    style: Optional[str] = Field(None, description="Target style (pirate, haiku, formal)")
+
+
+class BatchRewriteRequest(BaseModel):
+    """Batch request validation model"""
+
+    items: list[BatchRewriteRequestItem] = Field(..., min_length=1, description="Items to rewrite")
+
+
+class BatchRewriteItem(BaseModel):
+    """One batch result — either rewritten or error is set"""
+
+    index: int
+    original: str
+    rewritten: Optional[str] = None
+    style: Optional[str] = None
+    cached: bool = False
+    stale: bool = False
+    fuzzy: bool = False
+    coalesced: bool = False
+    segments_reused: int = 0
+    segments_regenerated: int = 0
+    error: Optional[str] = None
+
+
+class BatchRewriteResponse(BaseModel):
+    """Batch response model, results in input order"""
+
+    results: list[BatchRewriteItem]
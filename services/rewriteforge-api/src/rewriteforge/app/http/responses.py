@@ -0,0 +1,33 @@
+import json
+from typing import Any
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # A dependency; the stdlib encoder covers builds without it
+    orjson = None
+
+# Same output as FastAPI's JSONResponse, built once
+_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain JSON types (dicts, lists, str, int, bool, None)"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return _encoder.encode(content).encode()
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for results that are already the right shape.
+
+    Returning it from a route skips FastAPI's response_model validation
+    and jsonable_encoder pass; the model still documents the endpoint.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,86 @@
+import hashlib
+import re
+import unicodedata
+from collections.abc import Callable, Sequence
+
+try:
+    import xxhash
+except ImportError:  # A dependency, but keys still work on a build without it
+    xxhash = None
+
+_LINE_SPACE = re.compile(r"[ \t]+")
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+def _newlines(text: str) -> str:
+    # replace() scans the whole string even when there is nothing to do
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _nfc(text: str) -> str:
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFC", text)
+
+
+def _whitespace(text: str) -> str:
+    """Collapse runs of spaces/tabs and drop them at line ends; keeps line breaks"""
+    return _LINE_SPACE.sub(" ", _TRAILING_SPACE.sub("", text))
+
+
+# Applied in the configured order before hashing
+NORMALIZERS: dict[str, Callable[[str], str]] = {
+    "newlines": _newlines,
+    "strip": str.strip,
+    "nfc": _nfc,
+    "whitespace": _whitespace,
+}
+
+
+def digest(data: bytes) -> str:
+    """128-bit hex digest — xxh3, or truncated sha256 if xxhash is missing"""
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    # Not blake2b: sha256 is hardware-accelerated on most CPUs and faster
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+class CacheKeys:
+    """
+    Builds rewrite cache keys.
+
+    Text is canonicalized first, so inputs that differ only in line
+    endings, surrounding whitespace or Unicode composition share an entry.
+    Keys look like `rewrite:v1:anthropic:claude-sonnet:pirate:<digest>`.
+    Provider and model keep one model's output from being served for
+    another, and bumping `version` when the prompts change retires every
+    old entry.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "rewrite",
+        version: int = 1,
+        provider: str = "",
+        model: str = "",
+        normalize: Sequence[str] = ("newlines", "strip", "nfc"),
+    ):
+        unknown = [step for step in normalize if step not in NORMALIZERS]
+        if unknown:
+            raise ValueError(f"Unknown normalizers {unknown}. Available: {list(NORMALIZERS)}")
+        self._steps = [NORMALIZERS[step] for step in normalize]
+        self._prefix = f"{namespace}:v{version}:{provider or '-'}:{model or 'default'}:"
+
+    def canonical(self, text: str) -> str:
+        for step in self._steps:
+            text = step(text)
+        return text
+
+    def for_canonical(self, canonical: str, style: str) -> str:
+        """Key for text that has already been canonicalized"""
+        return f"{self._prefix}{style}:{digest(canonical.encode())}"
+
+    def key(self, text: str, style: str) -> str:
+        return self.for_canonical(self.canonical(text), style)
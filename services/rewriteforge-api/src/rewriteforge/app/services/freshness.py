@@ -0,0 +1,134 @@
+import asyncio
+import contextvars
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import NamedTuple, Optional
+
+# Whole-text entries written with a freshness policy carry a header:
+#   \x1e<created at> <compute seconds>\x1e<rewritten>
+# Entries without one (segments, older writes) are plain rewrites.
+_MARK = "\x1e"
+
+
+class Cached(NamedTuple):
+    """A cached rewrite and, when recorded, when and how expensively it was made"""
+
+    value: str
+    created_at: Optional[float] = None
+    delta: float = 0.0
+
+
+def wrap(value: str, created_at: float, delta: float) -> str:
+    return f"{_MARK}{created_at:.3f} {delta:.3f}{_MARK}{value}"
+
+
+def unwrap(stored: str) -> Cached:
+    if not stored.startswith(_MARK):
+        return Cached(stored)
+    end = stored.find(_MARK, 1)
+    try:
+        created_at, delta = stored[1:end].split(" ")
+        return Cached(stored[end + 1 :], float(created_at), float(delta))
+    except ValueError:
+        return Cached(stored)
+
+
+class Freshness:
+    """
+    When to recompute a cached rewrite, and the background refreshes doing it.
+
+    Entries are fresh for `ttl` seconds after they were created and may then
+    be served stale for `stale_ttl` more while they are refreshed. Before
+    expiry, XFetch refreshes early with a probability that rises as expiry
+    nears, scaled by how long the rewrite took to compute (`delta`) and
+    `beta`: hot keys are recomputed ahead of time, at different moments on
+    each replica, instead of every replica missing at once.
+
+    Refreshes run outside the request (no deadline), at most one per key
+    in this process. Disabled — and entries written without a header —
+    when both `stale_ttl` and `beta` are 0.
+    """
+
+    FRESH, EARLY, STALE = "fresh", "early", "stale"
+
+    def __init__(
+        self,
+        ttl: int = 3600,
+        stale_ttl: int = 0,
+        beta: float = 0.0,
+        rng: Callable[[], float] = random.random,
+    ):
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._beta = beta
+        self._rng = rng
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._early = 0
+        self._stale = 0
+        self._refreshes = 0
+        self._failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._ttl) and (self._stale_ttl > 0 or self._beta > 0)
+
+    @property
+    def storage_ttl(self) -> int:
+        """How long the backend keeps an entry: fresh plus stale window"""
+        return self._ttl + self._stale_ttl
+
+    def state(self, entry: Cached, now: Optional[float] = None) -> str:
+        """FRESH, EARLY (refresh ahead of expiry) or STALE (serve and refresh)"""
+        if entry.created_at is None or not self.enabled:
+            return self.FRESH
+        expires_at = entry.created_at + self._ttl
+        now = time.time() if now is None else now
+        if now >= expires_at:
+            self._stale += 1
+            return self.STALE
+        # XFetch: now - delta * beta * ln(U) >= expiry, U uniform in (0, 1]
+        if self._beta > 0 and entry.delta > 0:
+            if now - entry.delta * self._beta * math.log(1.0 - self._rng()) >= expires_at:
+                self._early += 1
+                return self.EARLY
+        return self.FRESH
+
+    def refresh(self, key: str, recompute: Callable[[], Awaitable[object]]) -> bool:
+        """
+        Run `recompute` in the background unless `key` is already refreshing.
+
+        Returns whether a refresh was started. Failures are counted, not
+        raised — the entry stays as it is until it expires.
+        """
+        if key in self._refreshing:
+            return False
+        # A fresh context: the refresh must not inherit the request deadline
+        task = asyncio.create_task(self._run(recompute), context=contextvars.Context())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        return True
+
+    async def _run(self, recompute: Callable[[], Awaitable[object]]) -> None:
+        self._refreshes += 1
+        try:
+            await recompute()
+        except Exception:
+            self._failures += 1
+
+    async def shutdown(self) -> None:
+        """Cancel running refreshes, so none writes to a cache being shut down"""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "early": self._early,
+            "stale": self._stale,
+            "refreshes": self._refreshes,
+            "refresh_failures": self._failures,
+            "refreshing": len(self._refreshing),
+        }
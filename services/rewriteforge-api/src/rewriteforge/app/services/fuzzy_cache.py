@@ -0,0 +1,259 @@
+import math
+import re
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
+from difflib import SequenceMatcher
+from typing import Optional
+
+# Words and the runs between them, so a diff can be joined back into text
+_TOKEN = re.compile(r"\w+|\W+")
+# Most tokens an input is indexed under
+_SKETCH = 16
+# Candidates, by shared sketch tokens, that get the exact comparison
+_CHECKED = 8
+
+
+def sketch(text: str, threshold: float) -> list[str]:
+    """
+    Tokens an input is indexed and looked up under.
+
+    Tokens are the words similarity() counts, repeats numbered, in a fixed
+    order: longest first (short words are the common ones, with long
+    postings), then by hash. Prefix filtering: two inputs scoring at least
+    `threshold` share at least threshold / (2 - threshold) of the larger
+    one's words, so their first len - that + 1 tokens always overlap. That
+    prefix is exact up to _SKETCH tokens (~45 words at 0.8); longer inputs
+    keep the first _SKETCH, a bottom-k MinHash that near-duplicates share
+    with overwhelming probability. Uses the built-in (per-process salted)
+    hash — the index is never persisted.
+    """
+    counts = Counter(text.split())
+    tokens = list(counts)
+    tokens += [
+        f"{word}\0{repeat}"
+        for word, count in counts.items()
+        if count > 1
+        for repeat in range(1, count)
+    ]
+    if not tokens:
+        return []
+    overlap = math.ceil(threshold * len(tokens) / (2 - threshold) - 1e-9)
+    size = min(len(tokens) - overlap + 1, _SKETCH)
+    if size < len(tokens):
+        # Only the longest tokens can make the cut — sort just those
+        lengths = Counter(map(len, tokens))
+        needed = size
+        for length in sorted(lengths, reverse=True):
+            needed -= lengths[length]
+            if needed <= 0:
+                break
+        tokens = [token for token in tokens if len(token) >= length]
+    tokens.sort(key=_order)
+    return tokens[:size]
+
+
+def _order(token: str) -> tuple[int, int]:
+    return -len(token), hash(token)
+
+
+def similarity(a: str, b: str) -> float:
+    """
+    Share of words the texts have in common, counted with multiplicity
+    (Dice): 0.8 means 4 in 5 words match, in any order.
+    """
+    words_a, words_b = Counter(a.split()), Counter(b.split())
+    total = words_a.total() + words_b.total()
+    return 2 * (words_a & words_b).total() / total if total else 1.0
+
+
+def adapt(source: str, target: str, rewritten: str) -> Optional[str]:
+    """
+    Carry the differences between two near-identical inputs over to the
+    rewrite of `source`.
+
+    Only substitutions are supported (a name or number swapped for
+    another). Every occurrence of a replaced phrase in the source must be
+    replaced, and it must survive verbatim in the rewrite as often as it
+    occurs in the source. Anything else — inserted or deleted words,
+    phrases the rewrite reworded — returns None.
+    """
+    old_tokens, new_tokens = _TOKEN.findall(source), _TOKEN.findall(target)
+    replacements: dict[str, str] = {}
+    replaced: dict[str, int] = {}
+    for i1, i2, j1, j2 in _differences(old_tokens, new_tokens):
+        if i1 == i2 or j1 == j2:
+            return None
+        old, new = "".join(old_tokens[i1:i2]), "".join(new_tokens[j1:j2])
+        if replacements.setdefault(old, new) != new:
+            return None
+        replaced[old] = replaced.get(old, 0) + 1
+
+    if not replacements:
+        return rewritten
+    # Longest first, so a phrase wins over a word inside it
+    phrases = sorted(replacements, key=len, reverse=True)
+    pattern = re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, phrases)) + r")(?!\w)")
+    if not replaced == _occurrences(pattern, source) == _occurrences(pattern, rewritten):
+        return None
+    return pattern.sub(lambda match: replacements[match.group()], rewritten)
+
+
+def _differences(old: list[str], new: list[str]) -> list[tuple[int, int, int, int]]:
+    """
+    Differing (old start, old end, new start, new end) token spans.
+
+    Equal token counts — the usual case for swapped names and numbers —
+    are compared position by position in linear time; only the rest need
+    a full diff.
+    """
+    if len(old) != len(new):
+        return [
+            (i1, i2, j1, j2)
+            for tag, i1, i2, j1, j2 in SequenceMatcher(None, old, new).get_opcodes()
+            if tag != "equal"
+        ]
+    spans = []
+    start = None
+    for index, (before, after) in enumerate(zip(old, new)):
+        if before != after and start is None:
+            start = index
+        elif before == after and start is not None:
+            spans.append((start, index, start, index))
+            start = None
+    if start is not None:
+        spans.append((start, len(old), start, len(old)))
+    return spans
+
+
+def _occurrences(pattern: re.Pattern, text: str) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for match in pattern.finditer(text):
+        counts[match.group()] = counts.get(match.group(), 0) + 1
+    return counts
+
+
+class FuzzyIndex:
+    """
+    Bounded near-duplicate index over cached inputs of one style.
+
+    Each input is filed under its sketch() tokens. A lookup counts, per
+    indexed input, the sketch tokens it shares with the query; the inputs
+    sharing most are scored exactly with similarity() against `threshold`.
+    Least recently used entries are evicted past `max_entries`.
+    """
+
+    def __init__(self, threshold: float = 0.8, max_entries: int = 10_000):
+        if not 0 < threshold <= 1:
+            raise ValueError("Fuzzy threshold must be in (0, 1]")
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._postings: dict[str, set[str]] = {}
+        # cache key -> (sketch, text), oldest first
+        self._entries: OrderedDict[str, tuple[list[str], str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, text: str) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        tokens = sketch(text, self._threshold)
+        self._entries[key] = (tokens, text)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(key)
+        while len(self._entries) > self._max_entries:
+            self.discard(next(iter(self._entries)))
+
+    def discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for token in entry[0]:
+            posting = self._postings[token]
+            posting.discard(key)
+            if not posting:
+                del self._postings[token]
+
+    def search(self, text: str, limit: int = 3) -> list[tuple[str, str, float]]:
+        """Up to `limit` (key, text, similarity) at or above the threshold, best first"""
+        shared: Counter[str] = Counter()
+        for token in sketch(text, self._threshold):
+            shared.update(self._postings.get(token, ()))
+
+        found = []
+        for key, _ in shared.most_common(_CHECKED):
+            source = self._entries[key][1]
+            score = similarity(source, text)
+            if score >= self._threshold:
+                self._entries.move_to_end(key)
+                found.append((key, source, score))
+        found.sort(key=lambda match: match[2], reverse=True)
+        return found[:limit]
+
+
+class FuzzyCache:
+    """
+    Near-duplicate lookups for exact-cache misses, per style.
+
+    Only styles in `styles` are indexed. mode="adapt" serves a neighbour's
+    rewrite only when the differing words can be substituted into it;
+    mode="serve" returns it unchanged, for styles where small input
+    differences do not matter. Shared as a singleton so every request
+    feeds one index.
+    """
+
+    def __init__(
+        self,
+        styles: Sequence[str] = (),
+        threshold: float = 0.8,
+        max_entries: int = 10_000,
+        mode: str = "adapt",
+    ):
+        if mode not in ("adapt", "serve"):
+            raise ValueError(f"Unknown fuzzy cache mode '{mode}'")
+        self._mode = mode
+        self._indexes = {style: FuzzyIndex(threshold, max_entries) for style in styles}
+        self._lookups = 0
+        self._hits = 0
+        self._rejected = 0
+
+    def enabled(self, style: str) -> bool:
+        return style in self._indexes
+
+    def remember(self, style: str, key: str, text: str) -> None:
+        """Index a cached input (canonical text) under its cache key"""
+        index = self._indexes.get(style)
+        if index is not None:
+            index.add(key, text)
+
+    def forget(self, style: str, key: str) -> None:
+        """Drop an entry whose cached rewrite is gone"""
+        index = self._indexes.get(style)
+        if index is not None:
+            index.discard(key)
+
+    def candidates(self, style: str, text: str) -> list[tuple[str, str]]:
+        """(cache key, indexed text) of the closest neighbours, best first"""
+        index = self._indexes.get(style)
+        if index is None:
+            return []
+        self._lookups += 1
+        return [(key, source) for key, source, _ in index.search(text)]
+
+    def apply(self, source: str, target: str, rewritten: str) -> Optional[str]:
+        """Rewrite for `target` from a neighbour's rewrite, or None if unusable"""
+        result = rewritten if self._mode == "serve" else adapt(source, target, rewritten)
+        if result is None:
+            self._rejected += 1
+        else:
+            self._hits += 1
+        return result
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": sum(len(index) for index in self._indexes.values()),
+            "lookups": self._lookups,
+            "hits": self._hits,
+            "rejected": self._rejected,
+        }
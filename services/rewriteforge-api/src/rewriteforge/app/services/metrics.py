@@ -0,0 +1,219 @@
+import re
+from bisect import bisect_left
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Seconds — from sub-millisecond cache hits up to long LLM streams
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Per-request stage totals for the Server-Timing header
+_timings: ContextVar[Optional[dict[str, float]]] = ContextVar("server_timing", default=None)
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Labeled Prometheus histogram; observe() is a dict lookup and a bisect"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self._documentation = documentation
+        self._labelnames = labelnames
+        self._buckets = buckets
+        # label values -> per-bucket counts (last is +Inf), then sum
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self._buckets) + 2)
+        series[bisect_left(self._buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self._documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self._buckets, series):
+                cumulative += count
+                le = _labels(self._labelnames, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            cumulative += series[-2]
+            yield f"{self.name}_bucket{_labels(self._labelnames, labels, 'le="+Inf"')} {cumulative}"
+            yield f"{self.name}_sum{_labels(self._labelnames, labels)} {series[-1]}"
+            yield f"{self.name}_count{_labels(self._labelnames, labels)} {cumulative}"
+
+
+class Counter:
+    """Labeled Prometheus counter"""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self._documentation = documentation
+        self._labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...], amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: tuple[str, ...]) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self._documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_labels(self._labelnames, labels)} {value}"
+
+
+class Metrics:
+    """
+    Process-wide request instrumentation.
+
+    Stage durations go into one histogram labeled by stage, provider, cache
+    backend and style, and into the current request's Server-Timing totals.
+    Shared as a singleton; `enabled=False` turns every call into a no-op.
+    """
+
+    def __init__(self, enabled: bool = True, provider: str = "", cache: str = ""):
+        self.enabled = enabled
+        self._provider = provider
+        self._cache = cache
+        self.stage_seconds = Histogram(
+            "rewriteforge_stage_duration_seconds",
+            "Time spent per request stage",
+            ("stage", "provider", "cache", "style"),
+        )
+        self.cache_requests = Counter(
+            "rewriteforge_cache_requests_total",
+            "Rewrite cache lookups by result",
+            ("result", "cache", "style"),
+        )
+        self.normalized_hits = Counter(
+            "rewriteforge_cache_normalized_hits_total",
+            "Cache hits on inputs that key canonicalization changed",
+            ("cache", "style"),
+        )
+        self.fuzzy_hits = Counter(
+            "rewriteforge_cache_fuzzy_hits_total",
+            "Exact-cache misses served from a near-duplicate's entry",
+            ("cache", "style"),
+        )
+        self.cache_errors = Counter(
+            "rewriteforge_cache_errors_total",
+            "Failed cache operations, served without the cache",
+            ("operation", "cache"),
+        )
+        self.llm_errors = Counter(
+            "rewriteforge_llm_errors_total",
+            "Failed LLM calls by exception type",
+            ("provider", "error"),
+        )
+
+    def observe(self, stage: str, seconds: float, style: str) -> None:
+        """Record how long a stage took"""
+        if not self.enabled:
+            return
+        self.stage_seconds.observe((stage, self._provider, self._cache, style), seconds)
+        timings = _timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+    def cache_result(self, hit: bool, style: str, normalized: bool = False) -> None:
+        """
+        Count a lookup. `normalized` marks inputs that key canonicalization
+        changed; their hits over all lookups bound its hit-ratio gain.
+        """
+        if not self.enabled:
+            return
+        self.cache_requests.inc(("hit" if hit else "miss", self._cache, style))
+        if hit and normalized:
+            self.normalized_hits.inc((self._cache, style))
+
+    def fuzzy_hit(self, style: str) -> None:
+        if self.enabled:
+            self.fuzzy_hits.inc((self._cache, style))
+
+    def cache_error(self, operation: str) -> None:
+        if self.enabled:
+            self.cache_errors.inc((operation, self._cache))
+
+    def llm_error(self, exc: BaseException) -> None:
+        if self.enabled:
+            self.llm_errors.inc((self._provider, type(exc).__name__))
+
+    def render(self, components: Optional[Mapping[str, Mapping[str, float]]] = None) -> str:
+        """
+        Prometheus text exposition.
+
+        `components` maps a prefix to a stats() dict; each entry is exported
+        as an untyped `rewriteforge_<prefix>_<key>` sample.
+        """
+        lines = [
+            *self.stage_seconds.render(),
+            *self.cache_requests.render(),
+            *self.normalized_hits.render(),
+            *self.fuzzy_hits.render(),
+            *self.cache_errors.render(),
+            *self.llm_errors.render(),
+        ]
+        for prefix, stats in (components or {}).items():
+            for key, value in stats.items():
+                name = _INVALID_NAME_CHARS.sub("_", f"rewriteforge_{prefix}_{key}")
+                lines.append(f"# TYPE {name} untyped")
+                lines.append(f"{name} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def collect_timings() -> Iterator[dict[str, float]]:
+    """Collect stage totals (seconds) recorded by Metrics.observe in this context"""
+    timings: dict[str, float] = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def server_timing(timings: Mapping[str, float]) -> str:
+    """Format stage totals as a Server-Timing header value (milliseconds)"""
+    return ", ".join(f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in timings.items())
@@ -1,12 +1,36 @@
-import hashlib
-from typing import AsyncGenerator, Optional
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Sequence
+from time import perf_counter
+from typing import AsyncGenerator, NamedTuple, Optional
 
 from cache_adapters.contracts import CacheInterface
 from llm_adapters.contracts import LLMInterface
+from llm_adapters.support.deadline import iter_within_deadline, within_deadline
 
 from rewriteforge.app.exceptions import ValidationError
+from rewriteforge.app.services.cache_keys import CacheKeys
+from rewriteforge.app.services.freshness import Cached, Freshness, unwrap, wrap
+from rewriteforge.app.services.fuzzy_cache import FuzzyCache
+from rewriteforge.app.services.metrics import Metrics
+from rewriteforge.app.services.segmenter import split_segments
+from rewriteforge.app.services.single_flight import SingleFlight
 from rewriteforge.config.settings import Settings
 
+# Marks the end of one segment's buffered stream
+_SEGMENT_END = object()
+
+
+class _Outcome(NamedTuple):
+    """Result of resolving a cache miss"""
+
+    rewritten: str
+    coalesced: bool = False
+    segments_reused: int = 0
+    segments_regenerated: int = 0
+    # Served from a near-duplicate's cache entry instead of the LLM
+    fuzzy: bool = False
+
 
 class RewriteService:
     """
@@ -20,18 +44,37 @@ class RewriteService:
         llm: LLMInterface,
         cache: CacheInterface,
         config: Settings,
+        single_flight: Optional[SingleFlight] = None,
+        metrics: Optional[Metrics] = None,
+        cache_keys: Optional[CacheKeys] = None,
+        fuzzy: Optional[FuzzyCache] = None,
+        freshness: Optional[Freshness] = None,
     ):
         self._llm = llm
         self._cache = cache
         self._config = config
+        self._single_flight = single_flight or SingleFlight()
+        self._metrics = metrics or Metrics(enabled=False)
+        self._keys = cache_keys or CacheKeys()
+        self._fuzzy = fuzzy or FuzzyCache()
+        self._freshness = freshness or Freshness()
+        # Styles are fixed for the process — check membership in a set
+        self._allowed_styles = frozenset(config.allowed_styles)
+        self._unknown_style = f"Allowed: {', '.join(config.allowed_styles)}"
 
     def _cache_key(self, text: str, style: str) -> str:
         """Generate deterministic cache key"""
-        content = f"{text}:{style}"
-        return f"rewrite:{hashlib.sha256(content.encode()).hexdigest()}"
+        return self._keys.key(text, style)
+
+    def _lookup_key(self, text: str, style: str) -> tuple[str, str]:
+        """Cache key and the canonical text it was built from"""
+        canonical = self._keys.canonical(text)
+        return self._keys.for_canonical(canonical, style), canonical
 
     def _validate(self, text: str, style: Optional[str]) -> str:
         """Validate input and return resolved style"""
+        if not text:
+            raise ValidationError("Text must not be empty")
         if len(text) > self._config.max_text_length:
             raise ValidationError(
                 f"Text exceeds maximum length of {self._config.max_text_length} characters"
@@ -39,11 +82,8 @@ class RewriteService:
 
         resolved_style = style or self._config.default_style
 
-        if resolved_style not in self._config.allowed_styles:
-            raise ValidationError(
-                f"Unknown style '{resolved_style}'. "
-                f"Allowed: {', '.join(self._config.allowed_styles)}"
-            )
+        if resolved_style not in self._allowed_styles:
+            raise ValidationError(f"Unknown style '{resolved_style}'. {self._unknown_style}")
 
         return resolved_style
 
@@ -56,43 +96,537 @@ class RewriteService:
                 "original": str,
                 "rewritten": str,
                 "style": str,
-                "cached": bool
+                "cached": bool,
+                "stale": bool,
+                "fuzzy": bool,
+                "coalesced": bool,
+                "segments_reused": int,
+                "segments_regenerated": int
             }
+
+        Segment counts describe the LLM work done for a miss and are 0 on a
+        whole-text cache hit. "fuzzy" marks a rewrite taken from a
+        near-duplicate input's cache entry (also "cached"); "stale" a hit
+        past its TTL, served while a background task refreshes it.
+
+        Raises:
+            DeadlineExceededError: The request deadline passed first
         """
+        started = perf_counter()
         resolved_style = self._validate(text, style)
-        cache_key = self._cache_key(text, resolved_style)
+        self._metrics.observe("validate", perf_counter() - started, resolved_style)
+        # Cache lookup and LLM call share what is left of the request budget
+        async with within_deadline():
+            return await self._rewrite(text, resolved_style)
+
+    async def _rewrite(self, text: str, resolved_style: str) -> dict:
+        cache_key, canonical = self._lookup_key(text, resolved_style)
 
         # Check cache
+        started = perf_counter()
         cached_result = await self._cache.get(cache_key)
+        self._metrics.observe("cache_get", perf_counter() - started, resolved_style)
+        self._metrics.cache_result(bool(cached_result), resolved_style, canonical != text)
         if cached_result:
+            self._fuzzy.remember(resolved_style, cache_key, canonical)
+            entry = unwrap(cached_result)
             return {
                 "original": text,
-                "rewritten": cached_result,
+                "rewritten": entry.value,
                 "style": resolved_style,
                 "cached": True,
+                "stale": self._revalidate(cache_key, text, resolved_style, entry),
+                "fuzzy": False,
+                "coalesced": False,
+                "segments_reused": 0,
+                "segments_regenerated": 0,
             }
 
-        # Call LLM
-        rewritten = await self._llm.rewrite(text, resolved_style)
-
-        # Store in cache
-        await self._cache.set(cache_key, rewritten)
+        rewritten = await self._fuzzy_hit(canonical, resolved_style)
+        if rewritten is not None:
+            outcome = _Outcome(rewritten, fuzzy=True)
+        else:
+            outcome = await self._resolve_miss(cache_key, text, resolved_style)
 
         return {
             "original": text,
-            "rewritten": rewritten,
+            "rewritten": outcome.rewritten,
             "style": resolved_style,
-            "cached": False,
+            "cached": outcome.fuzzy,
+            "stale": False,
+            "fuzzy": outcome.fuzzy,
+            "coalesced": outcome.coalesced,
+            "segments_reused": outcome.segments_reused,
+            "segments_regenerated": outcome.segments_regenerated,
         }
 
-    async def rewrite_stream(
-        self, text: str, style: Optional[str] = None
-    ) -> AsyncGenerator[str, None]:
+    def rewrite_batch_stream(
+        self, items: Sequence[tuple[str, Optional[str]]]
+    ) -> AsyncIterator[dict]:
+        """
+        Rewrite many items, yielding each result as soon as it is ready.
+
+        Identical items are rewritten once, all cache keys are looked up in
+        one bulk call, and misses fan out to the LLM at most
+        `batch_concurrency` at a time. Invalid items or failed calls yield a
+        per-item "error" instead of failing the batch.
+
+        Yields (completion order):
+            rewrite() result plus "index" and "error"
+        """
+        if len(items) > self._config.batch_max_items:
+            raise ValidationError(f"Batch exceeds maximum of {self._config.batch_max_items} items")
+        return self._batch_results(items)
+
+    async def rewrite_batch(self, items: Sequence[tuple[str, Optional[str]]]) -> list[dict]:
+        """Rewrite many items; results are returned in input order"""
+        results = [result async for result in self.rewrite_batch_stream(items)]
+        return sorted(results, key=lambda result: result["index"])
+
+    async def _batch_results(
+        self, items: Sequence[tuple[str, Optional[str]]]
+    ) -> AsyncGenerator[dict, None]:
+        # Dedup: cache key -> (text, style, input indexes). Inputs that only
+        # differ before canonicalization share a key, so each result echoes
+        # its own item's text.
+        unique: dict[str, tuple[str, str, list[int]]] = {}
+        normalized: set[str] = set()
+        for index, (text, style) in enumerate(items):
+            try:
+                resolved_style = self._validate(text, style)
+            except ValidationError as exc:
+                yield _batch_item(index, text, style, error=str(exc))
+                continue
+
+            cache_key, canonical = self._lookup_key(text, resolved_style)
+            if canonical != text:
+                normalized.add(cache_key)
+            if cache_key in unique:
+                unique[cache_key][2].append(index)
+            else:
+                unique[cache_key] = (text, resolved_style, [index])
+
+        keys = list(unique)
+        misses = []
+        for cache_key, cached_result in zip(keys, await self._cache.get_many(keys)):
+            _, style, indexes = unique[cache_key]
+            self._metrics.cache_result(bool(cached_result), style, cache_key in normalized)
+            if cached_result:
+                text = unique[cache_key][0]
+                if self._fuzzy.enabled(style):
+                    self._fuzzy.remember(style, cache_key, self._keys.canonical(text))
+                entry = unwrap(cached_result)
+                stale = self._revalidate(cache_key, text, style, entry)
+                for index in indexes:
+                    original = items[index][0]
+                    yield _batch_item(
+                        index, original, style, rewritten=entry.value, cached=True, stale=stale
+                    )
+            else:
+                misses.append(cache_key)
+
+        semaphore = asyncio.Semaphore(self._config.batch_concurrency)
+
+        async def resolve(cache_key: str):
+            text, style, _ = unique[cache_key]
+            async with semaphore:
+                try:
+                    if self._fuzzy.enabled(style):
+                        rewritten = await self._fuzzy_hit(self._keys.canonical(text), style)
+                        if rewritten is not None:
+                            return cache_key, _Outcome(rewritten, fuzzy=True)
+                    return cache_key, await self._resolve_miss(cache_key, text, style)
+                except Exception as exc:
+                    return cache_key, exc
+
+        tasks = [asyncio.create_task(resolve(cache_key)) for cache_key in misses]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                cache_key, outcome = await next_done
+                _, style, indexes = unique[cache_key]
+                for position, index in enumerate(indexes):
+                    original = items[index][0]
+                    if isinstance(outcome, Exception):
+                        yield _batch_item(index, original, style, error=str(outcome))
+                    else:
+                        # In-batch duplicates rode along on the first item's call
+                        yield _batch_item(
+                            index,
+                            original,
+                            style,
+                            rewritten=outcome.rewritten,
+                            cached=outcome.fuzzy,
+                            fuzzy=outcome.fuzzy,
+                            coalesced=outcome.coalesced or position > 0,
+                            segments_reused=outcome.segments_reused,
+                            segments_regenerated=outcome.segments_regenerated,
+                        )
+        finally:
+            # Client went away mid-stream — stop calling the LLM
+            for task in tasks:
+                task.cancel()
+
+    async def _fuzzy_hit(self, canonical: str, style: str) -> Optional[str]:
+        """
+        Rewrite taken from a near-duplicate input's cache entry, or None.
+
+        Only for styles with the fuzzy cache on. Neighbours whose entry has
+        left the cache are dropped from the index on the way.
+        """
+        if not self._fuzzy.enabled(style):
+            return None
+        started = perf_counter()
+        try:
+            for key, source in self._fuzzy.candidates(style, canonical):
+                cached = await self._cache.get(key)
+                if not cached:
+                    self._fuzzy.forget(style, key)
+                    continue
+                rewritten = self._fuzzy.apply(source, canonical, unwrap(cached).value)
+                if rewritten is not None:
+                    self._metrics.fuzzy_hit(style)
+                    return rewritten
+            return None
+        finally:
+            self._metrics.observe("fuzzy", perf_counter() - started, style)
+
+    async def _resolve_miss(self, cache_key: str, text: str, style: str) -> _Outcome:
+        """
+        Produce a rewrite for a cache miss.
+
+        Concurrent misses for the same key share one LLM call.
+        """
+        if self._config.single_flight_enabled:
+            outcome, coalesced = await self._single_flight.do(
+                cache_key, lambda: self._generate(cache_key, text, style)
+            )
+            if coalesced:
+                outcome = outcome._replace(coalesced=True)
+            return outcome
+
+        return await self._generate(cache_key, text, style)
+
+    async def _generate(self, cache_key: str, text: str, style: str) -> _Outcome:
+        """
+        Call the LLM and store the result.
+
+        With distributed single-flight, a short cache lock elects one leader
+        across workers; the others poll the cache for its result and come
+        back marked coalesced.
+        """
+        if not self._config.single_flight_distributed:
+            return await self._call_llm(cache_key, text, style)
+
+        lock_key = f"lock:{cache_key}"
+        lock_ttl = self._config.single_flight_lock_ttl
+
+        if await self._cache.add(lock_key, "1", ttl=lock_ttl):
+            try:
+                return await self._call_llm(cache_key, text, style)
+            finally:
+                await self._cache.delete(lock_key)
+
+        rewritten = await self._wait_for_remote(cache_key, lock_key, lock_ttl)
+        if rewritten:
+            self._single_flight.record_remote_coalesced()
+            return _Outcome(rewritten, coalesced=True)
+
+        # Leader failed or its lock expired — fall back to our own call
+        return await self._call_llm(cache_key, text, style)
+
+    async def _call_llm(self, cache_key: str, text: str, style: str) -> _Outcome:
+        started = perf_counter()
+        try:
+            outcome = await self._llm_rewrite(text, style)
+        except Exception as exc:
+            self._metrics.llm_error(exc)
+            raise
+        elapsed = perf_counter() - started
+        self._metrics.observe("llm", elapsed, style)
+
+        await self._store(cache_key, text, outcome.rewritten, style, elapsed)
+        return outcome
+
+    async def _write(self, write: Awaitable[None]) -> None:
+        """A failed cache write costs a later miss, never the response"""
+        try:
+            await write
+        except Exception:
+            self._metrics.cache_error("set")
+
+    async def _store(
+        self, cache_key: str, text: str, rewritten: str, style: str, cost: float = 0.0
+    ) -> None:
+        started = perf_counter()
+        if self._freshness.enabled:
+            stored = wrap(rewritten, time.time(), cost)
+            await self._write(self._cache.set(cache_key, stored, ttl=self._freshness.storage_ttl))
+        else:
+            await self._write(self._cache.set(cache_key, rewritten))
+        self._metrics.observe("cache_set", perf_counter() - started, style)
+        if self._fuzzy.enabled(style):
+            self._fuzzy.remember(style, cache_key, self._keys.canonical(text))
+
+    def _revalidate(self, cache_key: str, text: str, style: str, entry: Cached) -> bool:
+        """Start a background refresh if the hit is due one; True when it is stale"""
+        state = self._freshness.state(entry)
+        if state != Freshness.FRESH:
+            self._freshness.refresh(cache_key, lambda: self._refresh(cache_key, text, style))
+        return state == Freshness.STALE
+
+    async def _refresh(self, cache_key: str, text: str, style: str) -> None:
+        """Recompute an entry; a short cache lock keeps it to one replica"""
+        lock_key = f"refresh:{cache_key}"
+        if not await self._cache.add(lock_key, "1", ttl=self._config.single_flight_lock_ttl):
+            return
+        try:
+            await self._resolve_miss(cache_key, text, style)
+        finally:
+            await self._cache.delete(lock_key)
+
+    async def _timed_stream(self, text: str, style: str) -> AsyncGenerator[str, None]:
+        """LLM stream recording time to first token, total duration and errors"""
+        started = perf_counter()
+        first = True
+        try:
+            async for chunk in self._llm_rewrite_stream(text, style):
+                if first:
+                    self._metrics.observe("ttft", perf_counter() - started, style)
+                    first = False
+                yield chunk
+        except Exception as exc:
+            self._metrics.llm_error(exc)
+            raise
+        self._metrics.observe("stream", perf_counter() - started, style)
+
+    def _segments(self, text: str) -> list[tuple[str, str]]:
+        # The incremental cache needs stable per-paragraph boundaries, so
+        # packing (which shifts after an edit) is off in that mode
+        return split_segments(
+            text,
+            self._config.segment_max_chars,
+            pack=not self._config.segment_cache_enabled,
+        )
+
+    async def _cached_segments(
+        self, segments: list[tuple[str, str]], style: str
+    ) -> tuple[list[str], list[Optional[str]]]:
+        """Segment cache keys and, in incremental mode, their cached rewrites"""
+        keys = [self._cache_key(segment, style) for segment, _ in segments]
+        if not self._config.segment_cache_enabled:
+            return keys, [None] * len(keys)
+        # A segment may equal a whole text cached with a freshness header
+        return keys, [_unwrapped(hit) for hit in await self._cache.get_many(keys)]
+
+    async def _llm_rewrite(self, text: str, style: str) -> _Outcome:
+        """
+        Rewrite through the LLM, splitting long texts into segments.
+
+        Segments are rewritten concurrently, at most `segment_concurrency`
+        at a time, and reassembled in order with their original separators.
+        In incremental mode every segment is looked up in the cache first
+        and only the misses go to the LLM.
+        """
+        segments = self._segments(text)
+        if len(segments) == 1:
+            return _Outcome(await self._llm.rewrite(text, style), segments_regenerated=1)
+
+        keys, cached = await self._cached_segments(segments, style)
+
+        # Cache key -> segment text for every miss; repeated segments are
+        # rewritten once
+        misses: dict[str, str] = {}
+        reused = regenerated = 0
+        for (segment, _), key, hit in zip(segments, keys, cached):
+            if not segment.strip():
+                continue
+            if hit is not None:
+                reused += 1
+            else:
+                regenerated += 1
+                misses.setdefault(key, segment)
+
+        semaphore = asyncio.Semaphore(self._config.segment_concurrency)
+
+        async def rewrite_segment(segment: str) -> str:
+            async with semaphore:
+                return await self._llm.rewrite(segment, style)
+
+        # TaskGroup cancels the remaining segments as soon as one fails
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = {
+                    key: group.create_task(rewrite_segment(segment))
+                    for key, segment in misses.items()
+                }
+        except ExceptionGroup as failed:
+            # Surface the adapter's own error (e.g. OverloadedError -> 503)
+            raise failed.exceptions[0] from None
+        generated = {key: task.result() for key, task in tasks.items()}
+
+        if self._config.segment_cache_enabled and generated:
+            await self._write(self._cache.set_many(generated))
+
+        rewritten = "".join(
+            (segment if not segment.strip() else hit if hit is not None else generated[key])
+            + separator
+            for (segment, separator), key, hit in zip(segments, keys, cached)
+        )
+        return _Outcome(rewritten, segments_reused=reused, segments_regenerated=regenerated)
+
+    async def _llm_rewrite_stream(self, text: str, style: str) -> AsyncGenerator[str, None]:
+        """
+        Stream a rewrite through the LLM, splitting long texts into segments.
+
+        All segments stream concurrently (bounded by `segment_concurrency`)
+        into per-segment buffers. Segment N is emitted live once segments
+        0..N-1 have been emitted, so output order always matches the input.
+        """
+        segments = self._segments(text)
+        if len(segments) == 1:
+            async for chunk in self._llm.rewrite_stream(text, style):
+                yield chunk
+            return
+
+        keys, cached = await self._cached_segments(segments, style)
+        semaphore = asyncio.Semaphore(self._config.segment_concurrency)
+        buffers: list[asyncio.Queue] = [asyncio.Queue() for _ in segments]
+
+        async def stream_segment(segment: str, key: str, buffer: asyncio.Queue) -> None:
+            try:
+                parts = []
+                async with semaphore:
+                    async for chunk in self._llm.rewrite_stream(segment, style):
+                        parts.append(chunk)
+                        buffer.put_nowait(chunk)
+                buffer.put_nowait(_SEGMENT_END)
+                if self._config.segment_cache_enabled:
+                    await self._write(self._cache.set(key, "".join(parts)))
+            except Exception as exc:
+                buffer.put_nowait(exc)
+
+        tasks = []
+        for (segment, _), key, hit, buffer in zip(segments, keys, cached, buffers):
+            if segment.strip() and hit is None:
+                tasks.append(asyncio.create_task(stream_segment(segment, key, buffer)))
+            else:
+                # Whitespace and reused segments are emitted as-is
+                buffer.put_nowait(hit if segment.strip() else segment)
+                buffer.put_nowait(_SEGMENT_END)
+        try:
+            for (_, separator), buffer in zip(segments, buffers):
+                while (chunk := await buffer.get()) is not _SEGMENT_END:
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield chunk
+                if separator:
+                    yield separator
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _wait_for_remote(
+        self, cache_key: str, lock_key: str, timeout: float
+    ) -> Optional[str]:
+        """Poll the cache until the lock holder stores a result or releases the lock"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while loop.time() < deadline:
+            await asyncio.sleep(self._config.single_flight_poll_interval)
+            result = await self._cache.get(cache_key)
+            if result:
+                return unwrap(result).value
+            if await self._cache.get(lock_key) is None:
+                # Leader stores the result before releasing, so check once more
+                return _unwrapped(await self._cache.get(cache_key))
+
+        return None
+
+    def rewrite_stream(self, text: str, style: Optional[str] = None) -> AsyncIterator[str]:
         """
         Rewrite with streaming response (SSE).
-        Note: Streaming bypasses cache.
+
+        Cache hits are replayed in `stream_replay_chunk_size` pieces (0 =
+        one chunk). Misses stream from the LLM and the full text is cached
+        once the stream completes; concurrent identical streams share one
+        upstream call. Every wait for the next chunk is bounded by the
+        request deadline.
         """
+        started = perf_counter()
         resolved_style = self._validate(text, style)
+        self._metrics.observe("validate", perf_counter() - started, resolved_style)
+        return iter_within_deadline(self._stream(text, resolved_style))
 
-        async for chunk in self._llm.rewrite_stream(text, resolved_style):
+    async def _stream(self, text: str, style: str) -> AsyncGenerator[str, None]:
+        cache_key, canonical = self._lookup_key(text, style)
+
+        started = perf_counter()
+        cached_result = await self._cache.get(cache_key)
+        self._metrics.observe("cache_get", perf_counter() - started, style)
+        self._metrics.cache_result(bool(cached_result), style, canonical != text)
+        if cached_result:
+            self._fuzzy.remember(style, cache_key, canonical)
+            entry = unwrap(cached_result)
+            self._revalidate(cache_key, text, style, entry)
+            for chunk in _chunked(entry.value, self._config.stream_replay_chunk_size):
+                yield chunk
+            return
+
+        started = perf_counter()
+        if self._config.single_flight_enabled:
+            chunks, _ = self._single_flight.stream(
+                cache_key,
+                lambda: self._timed_stream(text, style),
+                on_complete=lambda rewritten: self._store(
+                    cache_key, text, rewritten, style, perf_counter() - started
+                ),
+            )
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        parts = []
+        async for chunk in self._timed_stream(text, style):
+            parts.append(chunk)
             yield chunk
+        # Only reached when the stream completed — disconnects skip the write
+        await self._store(cache_key, text, "".join(parts), style, perf_counter() - started)
+
+
+def _batch_item(
+    index: int,
+    text: str,
+    style: Optional[str],
+    rewritten: Optional[str] = None,
+    cached: bool = False,
+    stale: bool = False,
+    fuzzy: bool = False,
+    coalesced: bool = False,
+    segments_reused: int = 0,
+    segments_regenerated: int = 0,
+    error: Optional[str] = None,
+) -> dict:
+    return {
+        "index": index,
+        "original": text,
+        "rewritten": rewritten,
+        "style": style,
+        "cached": cached,
+        "stale": stale,
+        "fuzzy": fuzzy,
+        "coalesced": coalesced,
+        "segments_reused": segments_reused,
+        "segments_regenerated": segments_regenerated,
+        "error": error,
+    }
+
+
+def _unwrapped(stored: Optional[str]) -> Optional[str]:
+    return unwrap(stored).value if stored else stored
+
+
+def _chunked(text: str, size: int) -> list[str]:
+    if size <= 0:
+        return [text]
+    return [text[i : i + size] for i in range(0, len(text), size)]
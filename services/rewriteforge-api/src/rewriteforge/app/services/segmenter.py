@@ -0,0 +1,77 @@
+import re
+
+# Blank line(s) between paragraphs, and whitespace after sentence punctuation
+_PARAGRAPH_BREAK = re.compile(r"(\n[ \t]*\n\s*)")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?…])(\s+)")
+
+
+def split_segments(text: str, max_chars: int, pack: bool = True) -> list[tuple[str, str]]:
+    """
+    Split text into segments of at most `max_chars` characters.
+
+    Cuts at paragraph boundaries first, then sentence boundaries, and only
+    hard-splits a single overlong sentence. Neighbouring pieces are packed
+    together up to the limit so the number of LLM calls stays low.
+
+    With `pack=False` every paragraph is its own segment (overlong ones are
+    still cut when `max_chars` is set), so editing one paragraph leaves the
+    other segments byte-identical.
+
+    Returns:
+        [(segment, separator)] — joining segment + separator for every pair
+        reproduces the original text exactly
+    """
+    if pack and (max_chars <= 0 or len(text) <= max_chars):
+        return [(text, "")]
+
+    units: list[tuple[str, str]] = []
+    for paragraph, separator in _split_keep(text, _PARAGRAPH_BREAK):
+        if max_chars <= 0 or len(paragraph) <= max_chars:
+            units.append((paragraph, separator))
+            continue
+        sentences = _split_keep(paragraph, _SENTENCE_BREAK)
+        sentences[-1] = (sentences[-1][0], sentences[-1][1] + separator)
+        for sentence, sentence_separator in sentences:
+            units.extend(_hard_split(sentence, sentence_separator, max_chars))
+
+    return _pack(units, max_chars) if pack else units
+
+
+def _split_keep(text: str, pattern: re.Pattern) -> list[tuple[str, str]]:
+    """Split on pattern, pairing each piece with the separator that followed it"""
+    parts = pattern.split(text)
+    # re.split with one capture group alternates piece, separator, piece...
+    pieces = parts[0::2]
+    separators = parts[1::2] + [""]
+    return list(zip(pieces, separators))
+
+
+def _hard_split(text: str, separator: str, max_chars: int) -> list[tuple[str, str]]:
+    """Split an overlong run of text at the last whitespace before the limit"""
+    pieces = []
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars + 1)
+        if cut <= 0:
+            pieces.append((text[:max_chars], ""))
+            text = text[max_chars:]
+        else:
+            pieces.append((text[:cut], " "))
+            text = text[cut + 1 :]
+    pieces.append((text, separator))
+    return pieces
+
+
+def _pack(units: list[tuple[str, str]], max_chars: int) -> list[tuple[str, str]]:
+    segments: list[tuple[str, str]] = []
+    body: str | None = None
+    separator = ""
+
+    for unit, unit_separator in units:
+        if body is not None and len(body) + len(separator) + len(unit) > max_chars:
+            segments.append((body, separator))
+            body, separator = None, ""
+        body = unit if body is None else f"{body}{separator}{unit}"
+        separator = unit_separator
+
+    segments.append((body or "", separator))
+    return segments
@@ -0,0 +1,192 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Broadcast:
+    """Replayable fan-out buffer for one in-flight stream"""
+
+    def __init__(self):
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def publish(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self) -> None:
+        self.done = True
+        self._notify()
+
+    def fail(self, error: BaseException) -> None:
+        self.error = error
+        self._notify()
+
+    def _notify(self) -> None:
+        # Wake everyone waiting on the current event, then start a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key (the leader) runs the work. Callers arriving
+    while it is in flight (followers) await the leader's result instead of
+    repeating the work. Shared as a singleton so all requests see one registry.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._streams: dict[str, _Broadcast] = {}
+        self._leader_calls = 0
+        self._coalesced_calls = 0
+        self._remote_coalesced_calls = 0
+        self._abandoned_streams = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run `fn` once per key among concurrent callers.
+
+        Returns:
+            (result, coalesced) — coalesced is True for followers
+        """
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                return await self._lead(key, fn), False
+
+            self._coalesced_calls += 1
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # Leader was cancelled, not us — retry and possibly take over
+                if not future.cancelled():
+                    raise
+                self._coalesced_calls -= 1
+
+    async def _lead(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception as retrieved even when nobody followed
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        self._leader_calls += 1
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def stream(
+        self,
+        key: str,
+        factory: Callable[[], AsyncIterator[str]],
+        on_complete: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> tuple[AsyncIterator[str], bool]:
+        """
+        Share one upstream stream among concurrent consumers of the same key.
+
+        The first caller starts `factory()` in a background task; later
+        callers attach to it and get every chunk from the beginning. When
+        the upstream completes, `on_complete` receives the full text. If all
+        consumers leave early the upstream is cancelled and `on_complete`
+        never runs.
+
+        Returns:
+            (chunks, coalesced) — coalesced is True when attaching to an
+            existing stream
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is not None and (broadcast.error or broadcast.task.cancelling()):
+            # Abandoned or failed upstream that hasn't unregistered yet
+            broadcast = None
+        coalesced = broadcast is not None
+
+        if broadcast is None:
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+            broadcast.task = asyncio.create_task(self._pump(key, broadcast, factory, on_complete))
+            self._leader_calls += 1
+        else:
+            self._coalesced_calls += 1
+
+        broadcast.subscribers += 1
+        return self._subscribe(broadcast), coalesced
+
+    async def _pump(
+        self,
+        key: str,
+        broadcast: _Broadcast,
+        factory: Callable[[], AsyncIterator[str]],
+        on_complete: Optional[Callable[[str], Awaitable[None]]],
+    ) -> None:
+        try:
+            async for chunk in factory():
+                broadcast.publish(chunk)
+            broadcast.finish()
+            if on_complete is not None:
+                await on_complete("".join(broadcast.chunks))
+        except asyncio.CancelledError:
+            broadcast.fail(asyncio.CancelledError())
+            raise
+        except Exception as exc:
+            broadcast.fail(exc)
+        finally:
+            if self._streams.get(key) is broadcast:
+                del self._streams[key]
+
+    async def _subscribe(self, broadcast: _Broadcast) -> AsyncIterator[str]:
+        position = 0
+        try:
+            while True:
+                changed = broadcast._changed
+                while position < len(broadcast.chunks):
+                    yield broadcast.chunks[position]
+                    position += 1
+                    changed = broadcast._changed
+                if broadcast.done:
+                    return
+                if broadcast.error is not None:
+                    raise broadcast.error
+                await changed.wait()
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not broadcast.done and broadcast.task:
+                # Nobody is listening any more — stop paying for the upstream
+                broadcast.task.cancel()
+                self._abandoned_streams += 1
+
+    def record_remote_coalesced(self) -> None:
+        """Count a result received from another worker's in-flight call"""
+        self._remote_coalesced_calls += 1
+
+    def inflight(self) -> int:
+        """Number of keys currently being computed"""
+        return len(self._inflight) + len(self._streams)
+
+    def stats(self) -> dict[str, int]:
+        """Counters for metrics export"""
+        return {
+            "leader_calls": self._leader_calls,
+            "coalesced_calls": self._coalesced_calls,
+            "remote_coalesced_calls": self._remote_coalesced_calls,
+            "llm_calls_saved": self._coalesced_calls + self._remote_coalesced_calls,
+            "abandoned_streams": self._abandoned_streams,
+            "inflight": self.inflight(),
+        }
@@ -1,11 +1,39 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from llm_adapters.exceptions import DeadlineExceededError, OverloadedError, ReplayMissError
 
 from rewriteforge.app.exceptions import ValidationError
-from rewriteforge.app.exceptions.handlers import validation_error_handler
+from rewriteforge.app.exceptions.handlers import (
+    deadline_exceeded_handler,
+    overloaded_error_handler,
+    replay_miss_handler,
+    validation_error_handler,
+)
+from rewriteforge.app.http.middleware.deadline_middleware import DeadlineMiddleware
+from rewriteforge.app.http.middleware.server_timing_middleware import ServerTimingMiddleware
 from rewriteforge.container import Container
 from rewriteforge.routes.api import api_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop adapter background work (expiry, flushers...)"""
+    cache = app.state.container.cache_adapter()
+    llm = app.state.container.llm_adapter()
+    freshness = app.state.container.freshness()
+    await cache.startup()
+    try:
+        yield
+    finally:
+        try:
+            # Background refreshes write to the cache — stop them first
+            await freshness.shutdown()
+            await llm.shutdown()
+        finally:
+            await cache.shutdown()
+
+
 def create_app() -> FastAPI:
     """
     Application factory - Laravel's bootstrap/app.php equivalent.
@@ -18,6 +46,7 @@ def create_app() -> FastAPI:
         title="RewriteForge",
         description="Text rewriting service with pluggable LLM adapters",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     # Store container reference
@@ -26,7 +55,7 @@ def create_app() -> FastAPI:
     # Wire container to modules (enables @inject decorator)
     container.wire(
         modules=[
-            "rewriteforge.app.http.controllers.rewrite_controller",
+            "rewriteforge.app.http.controllers.stats_controller",
         ]
     )
 
@@ -35,6 +64,16 @@ def create_app() -> FastAPI:
 
     # Register exception handlers
     app.add_exception_handler(ValidationError, validation_error_handler)
+    app.add_exception_handler(OverloadedError, overloaded_error_handler)
+    app.add_exception_handler(DeadlineExceededError, deadline_exceeded_handler)
+    app.add_exception_handler(ReplayMissError, replay_miss_handler)
+
+    # Per-request deadline, propagated to cache and LLM calls
+    app.add_middleware(DeadlineMiddleware, default_timeout=container.config().request_timeout)
+
+    # Per-stage breakdown in a Server-Timing header
+    if container.config().metrics_enabled:
+        app.add_middleware(ServerTimingMiddleware)
 
     # Health check
     @app.get("/health")
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,16 +12,144 @@ class Settings(BaseSettings):
     # Server
     port: int = Field(default=8000, alias="PORT")
     debug: bool = Field(default=False, alias="DEBUG")
+    # Default and maximum per-request budget in seconds; clients may ask
+    # for less with X-Request-Timeout (0 = no deadline)
+    request_timeout: float = Field(default=30.0, alias="REQUEST_TIMEOUT")
+    # Per-stage histograms on /metrics plus the Server-Timing header
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
 
     # LLM Adapter - simple name, not class path
     llm_provider: str = Field(default="mock", alias="LLM_PROVIDER")
     llm_api_key: str = Field(default="", alias="LLM_API_KEY")
     llm_model: str = Field(default="", alias="LLM_MODEL")
+    llm_max_tokens: int = Field(default=1024, alias="LLM_MAX_TOKENS")
+
+    # Mock latency profile (LLM_PROVIDER=mock) for offline load tests
+    llm_mock_latency: float = Field(default=0.0, alias="LLM_MOCK_LATENCY")
+    llm_mock_distribution: str = Field(default="fixed", alias="LLM_MOCK_DISTRIBUTION")
+    llm_mock_ttft: float = Field(default=0.0, alias="LLM_MOCK_TTFT")
+    llm_mock_token_delay: float = Field(default=0.0, alias="LLM_MOCK_TOKEN_DELAY")
+    llm_mock_failure_rate: float = Field(default=0.0, alias="LLM_MOCK_FAILURE_RATE")
+
+    # Record/replay (LLM_PROVIDER=replay) - record real traffic through
+    # LLM_REPLAY_UPSTREAM, then replay it offline with its timing
+    llm_replay_path: str = Field(default="llm-replay.bin", alias="LLM_REPLAY_PATH")
+    llm_replay_mode: str = Field(default="replay", alias="LLM_REPLAY_MODE")
+    llm_replay_upstream: str = Field(default="mock", alias="LLM_REPLAY_UPSTREAM")
+    llm_replay_speed: float = Field(default=1.0, alias="LLM_REPLAY_SPEED")
+
+    # Router (LLM_PROVIDER=router) - route name -> adapter options, e.g.
+    # {"anthropic": {"api_key": "..."}, "backup": {"provider": "openai", "api_key": "..."}}
+    llm_router_routes: dict[str, dict[str, Any]] = Field(
+        default_factory=dict, alias="LLM_ROUTER_ROUTES"
+    )
+    llm_router_hedge_percentile: float = Field(default=95.0, alias="LLM_ROUTER_HEDGE_PERCENTILE")
+    llm_router_hedge_min_samples: int = Field(default=20, alias="LLM_ROUTER_HEDGE_MIN_SAMPLES")
+    llm_router_breaker_threshold: float = Field(default=0.5, alias="LLM_ROUTER_BREAKER_THRESHOLD")
+    llm_router_breaker_cooldown: float = Field(default=30.0, alias="LLM_ROUTER_BREAKER_COOLDOWN")
+
+    # Adaptive concurrency limiter in front of the LLM adapter
+    llm_limiter_enabled: bool = Field(default=True, alias="LLM_LIMITER_ENABLED")
+    llm_limiter_initial: int = Field(default=20, alias="LLM_LIMITER_INITIAL")
+    llm_limiter_min: int = Field(default=1, alias="LLM_LIMITER_MIN")
+    llm_limiter_max: int = Field(default=200, alias="LLM_LIMITER_MAX")
+    llm_limiter_max_queue: int = Field(default=500, alias="LLM_LIMITER_MAX_QUEUE")
+    llm_limiter_max_queue_wait: float = Field(default=10.0, alias="LLM_LIMITER_MAX_QUEUE_WAIT")
+    llm_limiter_latency_tolerance: float = Field(default=2.0, alias="LLM_LIMITER_LATENCY_TOLERANCE")
+    # Per-provider overrides, e.g. {"anthropic": {"max_limit": 50}}
+    llm_limiter_overrides: dict[str, dict[str, float]] = Field(
+        default_factory=dict, alias="LLM_LIMITER_OVERRIDES"
+    )
 
     # Cache Adapter - simple name, not class path
     cache_backend: str = Field(default="memory", alias="CACHE_BACKEND")
     cache_ttl: int = Field(default=3600, alias="CACHE_TTL")
     cache_redis_url: str = Field(default="redis://localhost:6379", alias="CACHE_REDIS_URL")
+    cache_batch_size: int = Field(default=500, alias="CACHE_BATCH_SIZE")
+    cache_max_entries: int = Field(default=0, alias="CACHE_MAX_ENTRIES")  # 0 = unbounded
+    cache_max_bytes: int = Field(default=0, alias="CACHE_MAX_BYTES")  # 0 = unbounded
+    cache_eviction_policy: str = Field(default="lru", alias="CACHE_EVICTION_POLICY")
+    cache_l1_ttl: int = Field(default=30, alias="CACHE_L1_TTL")
+    cache_l1_max_entries: int = Field(default=10_000, alias="CACHE_L1_MAX_ENTRIES")
+    cache_l1_invalidation: bool = Field(default=False, alias="CACHE_L1_INVALIDATION")
+    cache_active_expiry: bool = Field(default=False, alias="CACHE_ACTIVE_EXPIRY")
+    cache_expiry_interval: float = Field(default=1.0, alias="CACHE_EXPIRY_INTERVAL")
+    cache_expiry_budget_ms: float = Field(default=5.0, alias="CACHE_EXPIRY_BUDGET_MS")
+    # Value compression (memory and Redis; tiered compresses Redis only):
+    # none | zlib | zstd (needs the zstandard package). Values shorter than
+    # min_bytes are stored as-is; the dictionary is a file path. Level 0 =
+    # the codec's default.
+    cache_compression: str = Field(default="none", alias="CACHE_COMPRESSION")
+    cache_compression_level: int = Field(default=0, alias="CACHE_COMPRESSION_LEVEL")
+    cache_compression_min_bytes: int = Field(default=256, alias="CACHE_COMPRESSION_MIN_BYTES")
+    cache_compression_dictionary: str = Field(default="", alias="CACHE_COMPRESSION_DICTIONARY")
+    # Memory backend warm restarts: load this snapshot at startup, save it
+    # every interval seconds (0 = only on shutdown). Empty path = off.
+    cache_snapshot_path: str = Field(default="", alias="CACHE_SNAPSHOT_PATH")
+    cache_snapshot_interval: float = Field(default=300.0, alias="CACHE_SNAPSHOT_INTERVAL")
+    # Disk backend (SQLite, WAL): database file, reader threads, and seconds
+    # between compactions (expired rows, CACHE_MAX_ENTRIES/_BYTES bounds)
+    cache_disk_path: str = Field(default="rewriteforge-cache.db", alias="CACHE_DISK_PATH")
+    cache_disk_threads: int = Field(default=4, alias="CACHE_DISK_THREADS")
+    cache_compaction_interval: float = Field(default=60.0, alias="CACHE_COMPACTION_INTERVAL")
+    # Shared backend: one memory-mapped table for every worker on the host —
+    # file (empty = /dev/shm/rewriteforge-cache), slot count and slot bytes
+    cache_shared_path: str = Field(default="", alias="CACHE_SHARED_PATH")
+    cache_shared_slots: int = Field(default=65_536, alias="CACHE_SHARED_SLOTS")
+    cache_shared_slot_size: int = Field(default=4096, alias="CACHE_SHARED_SLOT_SIZE")
+    # Write-behind: cache writes are queued (up to CACHE_WRITE_QUEUE_SIZE keys)
+    # and flushed in set_many batches off the request path. When the queue is
+    # full, "drop" discards new writes and "block" waits for room.
+    cache_write_behind: bool = Field(default=False, alias="CACHE_WRITE_BEHIND")
+    cache_write_queue_size: int = Field(default=10_000, alias="CACHE_WRITE_QUEUE_SIZE")
+    cache_write_batch_size: int = Field(default=500, alias="CACHE_WRITE_BATCH_SIZE")
+    cache_write_flush_interval: float = Field(default=0.005, alias="CACHE_WRITE_FLUSH_INTERVAL")
+    cache_write_overflow: str = Field(default="drop", alias="CACHE_WRITE_OVERFLOW")
+
+    # Cache keys: <namespace>:v<version>:<provider>:<model>:<style>:<digest>.
+    # Bump the version whenever the prompts change.
+    cache_key_namespace: str = Field(default="rewrite", alias="CACHE_KEY_NAMESPACE")
+    cache_key_version: int = Field(default=1, alias="CACHE_KEY_VERSION")
+    # Canonicalization steps applied before hashing, in order
+    cache_key_normalize: list[str] = Field(
+        default=["newlines", "strip", "nfc"], alias="CACHE_KEY_NORMALIZE"
+    )
+
+    # Fuzzy cache - serve exact-cache misses from a near-duplicate input's
+    # entry, for these styles only (empty = off). "adapt" substitutes the
+    # differing words into the cached rewrite, "serve" returns it as is.
+    # The index keeps up to max_entries inputs per style in memory.
+    fuzzy_cache_styles: list[str] = Field(default=[], alias="FUZZY_CACHE_STYLES")
+    fuzzy_cache_threshold: float = Field(default=0.8, alias="FUZZY_CACHE_THRESHOLD")
+    fuzzy_cache_max_entries: int = Field(default=10_000, alias="FUZZY_CACHE_MAX_ENTRIES")
+    fuzzy_cache_mode: str = Field(default="adapt", alias="FUZZY_CACHE_MODE")
+
+    # Freshness - past CACHE_TTL a rewrite may still be served for
+    # stale_ttl seconds while one background task refreshes it; beta > 0
+    # also refreshes hot entries early (XFetch, ~1.0). Both 0 = off.
+    cache_stale_ttl: int = Field(default=0, alias="CACHE_STALE_TTL")
+    cache_early_refresh_beta: float = Field(default=0.0, alias="CACHE_EARLY_REFRESH_BETA")
+
+    # Single-flight - coalesce concurrent identical cache misses
+    single_flight_enabled: bool = Field(default=True, alias="SINGLE_FLIGHT_ENABLED")
+    single_flight_distributed: bool = Field(default=False, alias="SINGLE_FLIGHT_DISTRIBUTED")
+    single_flight_lock_ttl: int = Field(default=30, alias="SINGLE_FLIGHT_LOCK_TTL")
+    single_flight_poll_interval: float = Field(default=0.05, alias="SINGLE_FLIGHT_POLL_INTERVAL")
+
+    # Streaming - replay cache hits in chunks of this many characters (0 = one event)
+    stream_replay_chunk_size: int = Field(default=0, alias="STREAM_REPLAY_CHUNK_SIZE")
+
+    # Segmentation - split texts longer than this into concurrently rewritten
+    # segments (0 = never split)
+    segment_max_chars: int = Field(default=0, alias="SEGMENT_MAX_CHARS")
+    segment_concurrency: int = Field(default=4, alias="SEGMENT_CONCURRENCY")
+    # Cache every paragraph separately so an edited document only sends
+    # its changed paragraphs to the LLM
+    segment_cache_enabled: bool = Field(default=False, alias="SEGMENT_CACHE_ENABLED")
+
+    # Batch endpoint
+    batch_max_items: int = Field(default=1000, alias="BATCH_MAX_ITEMS")
+    batch_concurrency: int = Field(default=8, alias="BATCH_CONCURRENCY")
 
     # Validation
     max_text_length: int = Field(default=5000, alias="MAX_TEXT_LENGTH")
@@ -28,3 +158,16 @@ class Settings(BaseSettings):
         alias="ALLOWED_STYLES",
     )
     default_style: str = Field(default="formal", alias="DEFAULT_STYLE")
+
+    def llm_limiter_options(self, provider: str) -> dict[str, float]:
+        """Limiter settings for one provider, with its overrides applied"""
+        options = {
+            "initial_limit": self.llm_limiter_initial,
+            "min_limit": self.llm_limiter_min,
+            "max_limit": self.llm_limiter_max,
+            "max_queue": self.llm_limiter_max_queue,
+            "max_queue_wait": self.llm_limiter_max_queue_wait,
+            "latency_tolerance": self.llm_limiter_latency_tolerance,
+        }
+        options.update(self.llm_limiter_overrides.get(provider, {}))
+        return options
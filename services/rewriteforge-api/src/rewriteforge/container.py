@@ -1,8 +1,15 @@
 from cache_adapters import CacheInterface
+from cache_adapters.support import WriteBehindCache
 from dependency_injector import containers, providers
 from llm_adapters import LLMInterface
+from llm_adapters.support import DeadlineAdapter, LimitedAdapter
 
+from rewriteforge.app.services.cache_keys import CacheKeys
+from rewriteforge.app.services.freshness import Freshness
+from rewriteforge.app.services.fuzzy_cache import FuzzyCache
+from rewriteforge.app.services.metrics import Metrics
 from rewriteforge.app.services.rewrite_service import RewriteService
+from rewriteforge.app.services.single_flight import SingleFlight
 from rewriteforge.config.settings import Settings
 
 
@@ -18,25 +25,128 @@ class Container(containers.DeclarativeContainer):
     config = providers.Singleton(Settings)
 
     # LLM Adapter - resolved by name from auto-registry
-    llm_adapter = providers.Singleton(
+    llm_provider = providers.Singleton(
         LLMInterface.resolve,
         name=config.provided.llm_provider,
         api_key=config.provided.llm_api_key,
         model=config.provided.llm_model,
+        max_tokens=config.provided.llm_max_tokens,
+        latency=config.provided.llm_mock_latency,
+        distribution=config.provided.llm_mock_distribution,
+        ttft=config.provided.llm_mock_ttft,
+        token_delay=config.provided.llm_mock_token_delay,
+        failure_rate=config.provided.llm_mock_failure_rate,
+        path=config.provided.llm_replay_path,
+        mode=config.provided.llm_replay_mode,
+        upstream=config.provided.llm_replay_upstream,
+        speed=config.provided.llm_replay_speed,
+        routes=config.provided.llm_router_routes,
+        hedge_percentile=config.provided.llm_router_hedge_percentile,
+        hedge_min_samples=config.provided.llm_router_hedge_min_samples,
+        breaker_threshold=config.provided.llm_router_breaker_threshold,
+        breaker_cooldown=config.provided.llm_router_breaker_cooldown,
     )
 
+    # ...behind an adaptive concurrency limiter that sheds overload
+    llm_limited = providers.Singleton(
+        LimitedAdapter.wrap,
+        adapter=llm_provider,
+        enabled=config.provided.llm_limiter_enabled,
+        options=config.provided.llm_limiter_options.call(config.provided.llm_provider),
+    )
+
+    # ...held to each request's deadline (outermost, so queueing spends it too)
+    llm_adapter = providers.Singleton(DeadlineAdapter, adapter=llm_limited)
+
     # Cache Adapter - resolved by name from auto-registry
-    cache_adapter = providers.Singleton(
+    cache_backend = providers.Singleton(
         CacheInterface.resolve,
         name=config.provided.cache_backend,
         default_ttl=config.provided.cache_ttl,
         url=config.provided.cache_redis_url,
+        batch_size=config.provided.cache_batch_size,
+        max_entries=config.provided.cache_max_entries,
+        max_bytes=config.provided.cache_max_bytes,
+        eviction_policy=config.provided.cache_eviction_policy,
+        l1_ttl=config.provided.cache_l1_ttl,
+        l1_max_entries=config.provided.cache_l1_max_entries,
+        l1_invalidation=config.provided.cache_l1_invalidation,
+        active_expiry=config.provided.cache_active_expiry,
+        expiry_interval=config.provided.cache_expiry_interval,
+        expiry_budget_ms=config.provided.cache_expiry_budget_ms,
+        compression=config.provided.cache_compression,
+        compression_level=config.provided.cache_compression_level,
+        compression_min_bytes=config.provided.cache_compression_min_bytes,
+        compression_dictionary=config.provided.cache_compression_dictionary,
+        snapshot_path=config.provided.cache_snapshot_path,
+        snapshot_interval=config.provided.cache_snapshot_interval,
+        path=config.provided.cache_disk_path,
+        threads=config.provided.cache_disk_threads,
+        compaction_interval=config.provided.cache_compaction_interval,
+        shared_path=config.provided.cache_shared_path,
+        slots=config.provided.cache_shared_slots,
+        slot_size=config.provided.cache_shared_slot_size,
+    )
+
+    # ...optionally writing behind a queue, off the request path
+    cache_adapter = providers.Singleton(
+        WriteBehindCache.wrap,
+        cache=cache_backend,
+        enabled=config.provided.cache_write_behind,
+        max_queue=config.provided.cache_write_queue_size,
+        batch_size=config.provided.cache_write_batch_size,
+        flush_interval=config.provided.cache_write_flush_interval,
+        overflow=config.provided.cache_write_overflow,
+    )
+
+    # In-flight registry - shared so concurrent requests coalesce
+    single_flight = providers.Singleton(SingleFlight)
+
+    # Request instrumentation - one registry for the whole process
+    metrics = providers.Singleton(
+        Metrics,
+        enabled=config.provided.metrics_enabled,
+        provider=config.provided.llm_provider,
+        cache=config.provided.cache_backend,
+    )
+
+    # Cache key scheme - canonicalization plus provider/model/version layout
+    cache_keys = providers.Singleton(
+        CacheKeys,
+        namespace=config.provided.cache_key_namespace,
+        version=config.provided.cache_key_version,
+        provider=config.provided.llm_provider,
+        model=config.provided.llm_model,
+        normalize=config.provided.cache_key_normalize,
+    )
+
+    # Near-duplicate index - shared so every request feeds it
+    fuzzy_cache = providers.Singleton(
+        FuzzyCache,
+        styles=config.provided.fuzzy_cache_styles,
+        threshold=config.provided.fuzzy_cache_threshold,
+        max_entries=config.provided.fuzzy_cache_max_entries,
+        mode=config.provided.fuzzy_cache_mode,
+    )
+
+    # Early refresh / stale-while-revalidate - shared so refreshes stay one per key
+    freshness = providers.Singleton(
+        Freshness,
+        ttl=config.provided.cache_ttl,
+        stale_ttl=config.provided.cache_stale_ttl,
+        beta=config.provided.cache_early_refresh_beta,
     )
 
-    # Services - depend on contracts, receive implementations
-    rewrite_service = providers.Factory(
+    # Services - depend on contracts, receive implementations. Stateless,
+    # so one instance serves every request
+    rewrite_service = providers.Singleton(
         RewriteService,
         llm=llm_adapter,
         cache=cache_adapter,
         config=config,
+        single_flight=single_flight,
+        metrics=metrics,
+        cache_keys=cache_keys,
+        fuzzy=fuzzy_cache,
+        freshness=freshness,
     )
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
 from rewriteforge.app.http.controllers.rewrite_controller import router as rewrite_router
+from rewriteforge.app.http.controllers.stats_controller import router as stats_router
 
 api_router = APIRouter()
 api_router.include_router(rewrite_router, tags=["rewrite"])
+api_router.include_router(stats_router, tags=["stats"])
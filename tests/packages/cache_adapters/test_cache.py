@@ -1,5 +1,26 @@
+import asyncio
+import sqlite3
+import subprocess
+import sys
+import time
+
 import pytest
+from cache_adapters import CacheInterface
+from cache_adapters.providers import disk_cache
+from cache_adapters.providers.disk_cache import DiskCache
 from cache_adapters.providers.memory_cache import MemoryCache
+from cache_adapters.providers.redis_cache import RedisCache
+from cache_adapters.providers.shared_cache import SharedMemoryCache
+from cache_adapters.providers.tiered_cache import TieredCache
+from cache_adapters.support.codec import ValueCodec, train_dictionary, zstandard
+from cache_adapters.support.snapshot import (
+    MappedValue,
+    SnapshotError,
+    read_snapshot,
+    write_snapshot,
+)
+from cache_adapters.support.timing_wheel import TimingWheel
+from cache_adapters.support.write_behind import WriteBehindCache
 
 
 class TestMemoryCache:
@@ -60,3 +81,810 @@ class TestMemoryCache:
         await cache_with_ttl.set("key1", "value1", ttl=7200)
         result = await cache_with_ttl.get("key1")
         assert result == "value1"
+
+
+class TestBoundedMemoryCache:
+    async def test_max_entries_evicts_least_recently_used(self):
+        """Test LRU drops the least recently used key when full"""
+        cache = MemoryCache(max_entries=2)
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        await cache.get("a")  # a is now most recent
+        await cache.set("c", "3")
+
+        assert await cache.get("a") == "1"
+        assert await cache.get("b") is None
+        assert await cache.get("c") == "3"
+        assert cache.stats()["evictions"] == 1
+
+    async def test_max_bytes_bounds_memory(self):
+        """Test byte budget is never exceeded"""
+        cache = MemoryCache(max_bytes=2000)
+        for i in range(50):
+            await cache.set(f"key{i}", "x" * 100)
+
+        stats = cache.stats()
+        assert stats["bytes"] <= 2000
+        assert stats["evictions"] > 0
+        assert await cache.get("key49") == "x" * 100
+
+    async def test_value_larger_than_budget_not_stored(self):
+        """Test an entry bigger than max_bytes is rejected"""
+        cache = MemoryCache(max_bytes=500)
+        await cache.set("big", "x" * 1000)
+
+        assert await cache.get("big") is None
+        assert cache.stats()["entries"] == 0
+
+    async def test_overwrite_does_not_grow_entries(self):
+        """Test overwriting a key keeps entry count and byte accounting right"""
+        cache = MemoryCache(max_entries=2)
+        await cache.set("a", "short")
+        await cache.set("a", "a much longer value")
+
+        assert cache.stats()["entries"] == 1
+        assert await cache.get("a") == "a much longer value"
+
+    async def test_delete_releases_bytes(self):
+        """Test delete gives its bytes back to the budget"""
+        cache = MemoryCache(max_entries=10)
+        await cache.set("a", "1")
+        await cache.delete("a")
+
+        assert cache.stats()["bytes"] == 0
+
+    async def test_tinylfu_keeps_frequent_keys_under_scan(self):
+        """Test W-TinyLFU protects hot keys from a one-hit-wonder scan"""
+        cache = MemoryCache(max_entries=100, eviction_policy="tinylfu")
+        hot = [f"hot{i}" for i in range(50)]
+        for _ in range(5):
+            for key in hot:
+                if await cache.get(key) is None:
+                    await cache.set(key, "v")
+
+        for i in range(1000):
+            await cache.set(f"scan{i}", "v")
+
+        survivors = sum([await cache.get(key) is not None for key in hot])
+        assert survivors == len(hot)
+        assert cache.stats()["entries"] <= 100
+
+    async def test_hit_and_miss_counters(self):
+        """Test hit/miss counters are exposed"""
+        cache = MemoryCache()
+        await cache.set("a", "1")
+        await cache.get("a")
+        await cache.get("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_unknown_policy_raises(self):
+        """Test resolving an unknown eviction policy raises KeyError"""
+        with pytest.raises(KeyError, match="Unknown eviction policy"):
+            MemoryCache(max_entries=10, eviction_policy="fifo")
+
+
+class TestTimingWheel:
+    def test_advance_returns_due_keys_only(self):
+        """Test only keys whose deadline passed are returned"""
+        wheel = TimingWheel(tick=1.0, now=1000.0)
+        wheel.schedule("soon", 1002.0)
+        wheel.schedule("later", 1010.0)
+
+        assert wheel.advance(now=1005.0) == ["soon"]
+        assert wheel.advance(now=1010.0) == ["later"]
+        assert len(wheel) == 0
+
+    def test_far_deadlines_cascade_down(self):
+        """Test deadlines on coarse levels and in overflow still fire on time"""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2, now=0.0)
+        wheel.schedule("level1", 9.0)
+        wheel.schedule("overflow", 37.0)
+
+        assert wheel.advance(now=8.0) == []
+        assert wheel.advance(now=9.0) == ["level1"]
+        assert wheel.advance(now=36.0) == []
+        assert wheel.advance(now=37.0) == ["overflow"]
+
+    def test_reschedule_and_cancel(self):
+        """Test rescheduling replaces the old deadline and cancel removes it"""
+        wheel = TimingWheel(tick=1.0, now=0.0)
+        wheel.schedule("a", 2.0)
+        wheel.schedule("a", 50.0)
+        wheel.schedule("b", 3.0)
+        wheel.cancel("b")
+
+        assert wheel.advance(now=10.0) == []
+        assert wheel.advance(now=50.0) == ["a"]
+
+    def test_budget_stops_early_and_resumes(self):
+        """Test a zero budget defers work to the next call"""
+        wheel = TimingWheel(tick=1.0, now=0.0)
+        for i in range(200):
+            wheel.schedule(f"k{i}", 1.0)
+
+        first = wheel.advance(now=2.0, budget=0.0)
+        assert len(first) < 200
+        assert wheel.pending(now=2.0)
+
+        rest = wheel.advance(now=2.0)
+        assert len(first) + len(rest) == 200
+
+
+class TestActiveExpiry:
+    async def test_purge_removes_unread_expired_entries(self):
+        """Test expired keys are reclaimed without anyone reading them"""
+        cache = MemoryCache(active_expiry=True, max_entries=100)
+        await cache.set("short", "1", ttl=1)
+        await cache.set("long", "2", ttl=3600)
+        await cache.set("forever", "3")
+
+        purged = cache.purge_expired(now=time.time() + 5)
+
+        assert purged == 1
+        assert "short" not in cache._store
+        assert await cache.get("long") == "2"
+        stats = cache.stats()
+        assert stats["purged"] == 1
+        assert stats["purged_bytes"] > 0
+
+    async def test_overwrite_without_ttl_is_not_purged(self):
+        """Test removing a TTL by overwriting cancels the scheduled expiry"""
+        cache = MemoryCache(active_expiry=True)
+        await cache.set("key", "1", ttl=1)
+        await cache.set("key", "2")
+
+        assert cache.purge_expired(now=time.time() + 5) == 0
+        assert await cache.get("key") == "2"
+
+    async def test_background_task_lifecycle(self):
+        """Test startup runs the purge loop and shutdown stops it"""
+        cache = MemoryCache(active_expiry=True, expiry_interval=0.01)
+        await cache.startup()
+        await asyncio.sleep(0.05)
+        await cache.shutdown()
+
+        assert cache.stats()["purge_runs"] > 0
+        assert cache._expiry_task is None
+
+    def test_disabled_by_default(self):
+        """Test purge is a no-op without active expiry"""
+        assert MemoryCache().purge_expired() == 0
+
+
+class TestTieredCache:
+    @pytest.fixture
+    def l2(self):
+        # MemoryCache stands in for Redis — the tier logic is backend-agnostic
+        return MemoryCache()
+
+    @pytest.fixture
+    def cache(self, l2):
+        return TieredCache(l1_ttl=30, l1_max_entries=100, l2=l2)
+
+    def test_registered(self):
+        """Test tiered backend is auto-registered"""
+        assert "tiered" in CacheInterface.available()
+
+    async def test_set_writes_both_tiers(self, cache, l2):
+        """Test set stores in L2 and L1"""
+        await cache.set("key1", "value1")
+
+        assert await l2.get("key1") == "value1"
+        assert await cache.get("key1") == "value1"
+        assert cache.stats()["l1_hits"] == 1
+
+    async def test_l2_hit_fills_l1(self, cache, l2):
+        """Test a value found only in L2 is promoted to L1"""
+        await l2.set("key1", "value1")
+
+        assert await cache.get("key1") == "value1"
+        assert await cache.get("key1") == "value1"
+
+        stats = cache.stats()
+        assert stats["l2_hits"] == 1
+        assert stats["l1_hits"] == 1
+        assert stats["l1_hit_ratio"] == 0.5
+
+    async def test_miss_in_both_tiers(self, cache):
+        """Test miss returns None and is counted against L2"""
+        assert await cache.get("missing") is None
+        assert cache.stats()["l2_misses"] == 1
+
+    async def test_delete_removes_from_both_tiers(self, cache, l2):
+        """Test delete clears L1 and L2"""
+        await cache.set("key1", "value1")
+        await cache.delete("key1")
+
+        assert await l2.get("key1") is None
+        assert await cache.get("key1") is None
+
+    async def test_add_decided_by_l2(self, cache, l2):
+        """Test add only succeeds if the shared tier lacks the key"""
+        await l2.set("lock", "1")
+
+        assert await cache.add("lock", "1") is False
+        assert await cache.add("other", "1") is True
+
+    async def test_lock_keys_read_from_l2_only(self, cache, l2):
+        """Test a released lock is not served from L1 afterwards"""
+        assert await cache.add("lock:key1", "1") is True
+        assert await cache.get("lock:key1") == "1"
+        assert await cache.get_many(["refresh:key1"]) == [None]
+
+        await l2.delete("lock:key1")  # released by another replica
+
+        assert await cache.get("lock:key1") is None
+        assert cache.stats()["l1_entries"] == 0
+
+    async def test_invalidation_from_other_replica_drops_l1(self, cache, l2):
+        """Test an invalidation message evicts the stale L1 copy"""
+        await cache.set("key1", "old")
+        await l2.set("key1", "new")  # another replica wrote through
+
+        await cache.handle_invalidation(b"other-node key1")
+
+        assert await cache.get("key1") == "new"
+        assert cache.stats()["invalidations_received"] == 1
+
+    async def test_own_invalidation_ignored(self, cache):
+        """Test a replica ignores its own broadcasts"""
+        await cache.set("key1", "value1")
+
+        await cache.handle_invalidation(f"{cache._node_id} key1")
+
+        assert cache.stats()["invalidations_received"] == 0
+        assert await cache.get("key1") == "value1"
+
+
+class TestBulkOperations:
+    async def test_memory_get_many_aligned_with_keys(self):
+        """Test get_many returns values in key order with None for misses"""
+        cache = MemoryCache()
+        await cache.set("a", "1")
+        await cache.set("c", "3")
+
+        assert await cache.get_many(["a", "b", "c"]) == ["1", None, "3"]
+
+    async def test_memory_set_many_per_key_ttl(self):
+        """Test set_many applies per-key TTLs"""
+        cache = MemoryCache(active_expiry=True)
+        await cache.set_many({"short": "1", "long": "2"}, ttl={"short": 1, "long": 3600})
+
+        cache.purge_expired(now=time.time() + 5)
+
+        assert await cache.get_many(["short", "long"]) == [None, "2"]
+
+    async def test_default_fallback_for_third_party_backends(self):
+        """Test a backend with only single-key methods gets working bulk ops"""
+
+        class DictCache(CacheInterface):
+            def __init__(self):
+                self.data = {}
+
+            async def get(self, key):
+                return self.data.get(key)
+
+            async def set(self, key, value, ttl=None):
+                self.data[key] = value
+
+            async def delete(self, key):
+                self.data.pop(key, None)
+
+            async def clear(self):
+                self.data.clear()
+
+        cache = DictCache()
+        await cache.set_many({"a": "1", "b": "2"}, ttl=60)
+
+        assert await cache.get_many(["b", "x", "a"]) == ["2", None, "1"]
+
+    async def test_tiered_get_many_fills_l1_from_l2(self):
+        """Test bulk reads consult L2 only for L1 misses and promote hits"""
+        l2 = MemoryCache()
+        cache = TieredCache(l2=l2)
+        await cache.set("a", "1")
+        await l2.set("b", "2")
+
+        assert await cache.get_many(["a", "b", "c"]) == ["1", "2", None]
+        assert await cache.get_many(["b"]) == ["2"]
+
+        stats = cache.stats()
+        assert stats["l1_hits"] == 2
+        assert stats["l2_hits"] == 1
+        assert stats["l2_misses"] == 1
+
+
+class _BytesClient:
+    """Just enough of redis.asyncio.Redis: stores and returns bytes like the server"""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    async def setex(self, key, ttl, value):
+        await self.set(key, value)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+
+class TestCompression:
+    LONG = "Arr, the quick brown fox be jumpin' over the lazy dog, matey! " * 20
+
+    def test_short_values_stored_as_is(self):
+        """Test values below the threshold skip compression and its header"""
+        codec = ValueCodec(min_bytes=256)
+
+        assert codec.encode("short") == "short"
+
+    def test_roundtrip_with_header(self):
+        """Test compressed values carry the 0xff header and decode back"""
+        codec = ValueCodec()
+
+        stored = codec.encode(self.LONG)
+
+        assert stored[0] == 0xFF
+        assert len(stored) < len(self.LONG) / 4
+        assert codec.decode(stored) == self.LONG
+
+    def test_legacy_values_still_decode(self):
+        """Test plain UTF-8 written before compression reads back unchanged"""
+        assert ValueCodec().decode("café".encode()) == "café"
+
+    def test_dictionary_shrinks_short_texts(self):
+        """Test a trained dictionary helps texts too short to compress alone"""
+        samples = [f"Ahoy {name}, yer order be shipped, matey!" for name in ("Ann", "Bo", "Cy")]
+        dictionary = train_dictionary(samples * 10)
+        value = "Ahoy Dee, yer order be shipped, matey!"
+
+        plain = ValueCodec(min_bytes=0).encode(value)
+        with_dict = ValueCodec(min_bytes=0, dictionary=dictionary)
+
+        assert plain == value  # would not shrink on its own
+        assert len(with_dict.encode(value)) < len(value.encode())
+        assert with_dict.decode(with_dict.encode(value)) == value
+
+    def test_other_dictionary_reads_as_undecodable(self):
+        """Test values from another dictionary are rejected, not garbled"""
+        writer = ValueCodec(dictionary=b"pirate matey ahoy " * 10)
+        reader = ValueCodec(dictionary=b"formal regards sincerely " * 10)
+
+        assert reader.decode(writer.encode(self.LONG)) is None
+        assert reader.stats()["undecodable"] == 1
+
+    def test_zstd_requires_package(self):
+        if zstandard is not None:
+            pytest.skip("zstandard is installed")
+        with pytest.raises(ImportError, match="zstandard"):
+            ValueCodec("zstd")
+
+    async def test_memory_cache_compresses_transparently(self):
+        """Test a compressing memory cache fits more under the same byte budget"""
+        plain = MemoryCache(max_bytes=1_000_000)
+        compressed = MemoryCache(max_bytes=1_000_000, compression="zlib")
+        for cache in (plain, compressed):
+            await cache.set("k", self.LONG)
+
+        assert await compressed.get("k") == self.LONG
+        assert compressed.stats()["bytes"] < plain.stats()["bytes"] / 3
+
+    async def test_redis_mixed_rollout(self):
+        """Test compressed and plain entries coexist in Redis in both directions"""
+        client = _BytesClient()
+        plain = RedisCache(client=client)
+        compressing = RedisCache(client=client, compression="zlib")
+
+        await plain.set("old", self.LONG)
+        await compressing.set("new", self.LONG)
+
+        assert client.data["new"][0] == 0xFF
+        assert await compressing.get_many(["old", "new"]) == [self.LONG, self.LONG]
+        # Rolled back: compression off still reads what was compressed
+        assert await plain.get("new") == self.LONG
+
+
+class TestSnapshot:
+    def test_roundtrip_skips_expired(self, tmp_path):
+        """Test live text and binary entries survive, expired ones are dropped"""
+        path = str(tmp_path / "cache.snapshot")
+        entries = [("text", "café", None), ("binary", b"\xff\x01", 200.0), ("old", "x", 50.0)]
+
+        assert write_snapshot(path, entries, now=100.0) == 2
+        loaded = {
+            key: (value.load(), expires) for key, value, expires in read_snapshot(path, 100.0)
+        }
+
+        assert loaded == {"text": ("café", None), "binary": (b"\xff\x01", 200.0)}
+
+    def test_other_version_rejected(self, tmp_path):
+        path = tmp_path / "cache.snapshot"
+        write_snapshot(str(path), [("key", "value", None)])
+        data = bytearray(path.read_bytes())
+        data[4] = 99
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError, match="version 99"):
+            list(read_snapshot(str(path)))
+
+    async def test_warm_restart(self, tmp_path):
+        """Test shutdown saves the cache and the next startup serves it lazily"""
+        path = str(tmp_path / "cache.snapshot")
+        cache = MemoryCache(snapshot_path=path)
+        await cache.set("kept", "value")
+        await cache.set("gone", "value", ttl=1)
+        await cache.startup()
+        cache._store["gone"].expires_at = time.time() - 1
+        await cache.shutdown()
+
+        restarted = MemoryCache(snapshot_path=path)
+        await restarted.startup()
+
+        assert isinstance(restarted._store["kept"].value, MappedValue)
+        assert await restarted.get("kept") == "value"
+        assert restarted._store["kept"].value == "value"
+        assert await restarted.get("gone") is None
+        assert restarted.stats()["snapshot_loaded"] == 1
+
+    async def test_compressed_snapshot_into_uncompressed_cache(self, tmp_path):
+        """Test values compressed before a restart decode with compression off"""
+        path = str(tmp_path / "cache.snapshot")
+        cache = MemoryCache(snapshot_path=path, compression="zlib")
+        await cache.set("key", TestCompression.LONG)
+        await cache.save_snapshot()
+
+        restarted = MemoryCache(snapshot_path=path)
+        restarted.load_snapshot()
+
+        assert await restarted.get("key") == TestCompression.LONG
+        await restarted.shutdown()
+
+    async def test_compressed_values_restored(self, tmp_path):
+        path = str(tmp_path / "cache.snapshot")
+        cache = MemoryCache(compression="zlib", snapshot_path=path)
+        await cache.set("key", TestCompression.LONG)
+        await cache.save_snapshot()
+
+        restarted = MemoryCache(compression="zlib", snapshot_path=path)
+        await restarted.startup()
+
+        assert await restarted.get("key") == TestCompression.LONG
+
+    async def test_unreadable_snapshot_counted(self, tmp_path):
+        """Test a foreign file starts the cache empty instead of failing startup"""
+        path = tmp_path / "cache.snapshot"
+        path.write_bytes(b"not a snapshot at all, just bytes")
+        cache = MemoryCache(snapshot_path=str(path))
+
+        await cache.startup()
+
+        assert cache.stats()["snapshot_rejected"] == 1
+        assert not cache._store
+
+
+class TestDiskCache:
+    @pytest.fixture
+    async def cache(self, tmp_path):
+        cache = DiskCache(path=str(tmp_path / "cache.db"))
+        yield cache
+        await cache.shutdown()
+
+    def test_registered(self):
+        assert "disk" in CacheInterface.available()
+
+    async def test_set_get_delete(self, cache):
+        await cache.set("key", "café")
+
+        assert await cache.get("key") == "café"
+        await cache.delete("key")
+        assert await cache.get("key") is None
+        assert cache.stats()["hits"] == 1
+
+    async def test_expired_entries_miss_and_compact(self, cache, monkeypatch):
+        """Test expired rows read as misses and are purged by compaction"""
+        await cache.set("short", "value", ttl=10)
+        await cache.set("forever", "value")
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 60)
+
+        assert await cache.get("short") is None
+        await cache.compact()
+
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["entries"] == 1
+
+    async def test_bulk_operations(self, cache):
+        await cache.set_many({"a": "1", "b": "2"}, ttl={"a": 60})
+
+        assert await cache.get_many(["a", "missing", "b"]) == ["1", None, "2"]
+
+    async def test_add_only_when_absent(self, cache):
+        assert await cache.add("key", "first")
+        assert not await cache.add("key", "second")
+        assert await cache.get("key") == "first"
+
+    async def test_compaction_evicts_oldest_writes(self, tmp_path):
+        """Test bounds are enforced by dropping the oldest-written entries"""
+        cache = DiskCache(path=str(tmp_path / "cache.db"), max_entries=2)
+        await cache.set_many({"a": "1", "b": "2", "c": "3"})
+        await cache.set("a", "1")  # rewritten, now the newest
+
+        await cache.compact()
+
+        assert await cache.get_many(["a", "b", "c"]) == ["1", None, "3"]
+        assert cache.stats()["evictions"] == 1
+        await cache.shutdown()
+
+    async def test_survives_restart(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        cache = DiskCache(path=path, compression="zlib")
+        await cache.set("key", TestCompression.LONG)
+        await cache.shutdown()
+
+        reopened = DiskCache(path=path, compression="zlib")
+
+        assert await reopened.get("key") == TestCompression.LONG
+        await reopened.shutdown()
+
+    async def test_corrupt_file_replaced(self, tmp_path):
+        """Test an unreadable database is moved aside instead of failing startup"""
+        path = tmp_path / "cache.db"
+        path.write_bytes(b"definitely not sqlite" * 100)
+
+        cache = DiskCache(path=str(path))
+        await cache.set("key", "value")
+
+        assert await cache.get("key") == "value"
+        assert cache.stats()["recovered"] == 1
+        assert (tmp_path / "cache.db.corrupt").exists()
+        await cache.shutdown()
+
+    async def test_locked_file_not_replaced(self, tmp_path, monkeypatch):
+        """Test a database locked by another worker is kept, not moved aside"""
+        path = tmp_path / "cache.db"
+        first = DiskCache(path=str(path))
+        await first.set("key", "value")
+        monkeypatch.setattr(disk_cache, "_BUSY_TIMEOUT_MS", 50)
+        holder = sqlite3.connect(path, isolation_level=None)
+        holder.execute("BEGIN EXCLUSIVE")
+
+        with pytest.raises(sqlite3.OperationalError):
+            DiskCache(path=str(path))
+
+        holder.execute("ROLLBACK")
+        holder.close()
+        assert not (tmp_path / "cache.db.corrupt").exists()
+        assert await first.get("key") == "value"
+        await first.shutdown()
+
+
+class TestWriteBehindCache:
+    @pytest.fixture
+    def backend(self):
+        return MemoryCache()
+
+    def test_wrap_disabled_returns_cache(self, backend):
+        assert WriteBehindCache.wrap(backend, enabled=False) is backend
+        assert "write_queue_depth" in WriteBehindCache.wrap(backend, enabled=True).stats()
+
+    async def test_queued_writes_are_readable_then_flushed(self, backend):
+        cache = WriteBehindCache(backend, flush_interval=60)
+        await cache.set("a", "1", ttl=30)
+        await cache.set_many({"b": "2"})
+
+        assert backend._store == {}
+        assert await cache.get("a") == "1"
+        assert await cache.get_many(["a", "missing", "b"]) == ["1", None, "2"]
+        assert not await cache.add("a", "other")
+        assert cache.stats()["write_queue_depth"] == 2
+
+        await cache.shutdown()
+
+        assert await backend.get_many(["a", "b"]) == ["1", "2"]
+        assert backend._store["a"].expires_at is not None
+        assert cache.stats()["write_queue_depth"] == 0
+        assert cache.stats()["write_batches"] == 1
+
+    async def test_drains_in_background(self, backend):
+        cache = WriteBehindCache(backend, batch_size=2, flush_interval=0)
+        await cache.set_many({"a": "1", "b": "2", "c": "3"})
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert await backend.get_many(["a", "b", "c"]) == ["1", "2", "3"]
+        assert cache.stats()["write_batches"] == 2
+        await cache.shutdown()
+
+    async def test_drop_overflow(self, backend):
+        cache = WriteBehindCache(backend, max_queue=2, flush_interval=60)
+        await cache.set_many({"a": "1", "b": "2", "c": "3"})
+        await cache.set("a", "updated")  # already queued, takes no room
+
+        assert cache.stats()["writes_dropped"] == 1
+        await cache.shutdown()
+        assert await backend.get_many(["a", "b", "c"]) == ["updated", "2", None]
+
+    async def test_block_overflow_waits_for_room(self, backend):
+        cache = WriteBehindCache(backend, max_queue=1, flush_interval=0, overflow="block")
+        await cache.set("a", "1")
+        await asyncio.wait_for(cache.set("b", "2"), timeout=1)
+
+        await cache.shutdown()
+        assert await backend.get_many(["a", "b"]) == ["1", "2"]
+        assert cache.stats()["writes_dropped"] == 0
+
+    async def test_delete_drops_queued_write(self, backend):
+        cache = WriteBehindCache(backend, flush_interval=60)
+        await cache.set("a", "1")
+        await cache.delete("a")
+
+        await cache.shutdown()
+        assert await backend.get("a") is None
+
+    async def test_failed_batch_is_counted(self, backend):
+        async def fail(*args, **kwargs):
+            raise ConnectionError("backend down")
+
+        backend.set_many = fail
+        cache = WriteBehindCache(backend, flush_interval=60)
+        await cache.set("a", "1")
+
+        await cache.shutdown()
+        assert cache.stats()["write_errors"] == 1
+        assert cache.stats()["write_queue_depth"] == 0
+
+    def test_unknown_overflow(self, backend):
+        with pytest.raises(ValueError, match="overflow"):
+            WriteBehindCache(backend, overflow="spill")
+
+    async def test_delete_flushes_earlier_writes(self, backend):
+        """Test releasing a lock publishes what was queued before it"""
+        cache = WriteBehindCache(backend, flush_interval=60)
+        await cache.add("lock:key", "1")
+        await cache.set("key", "value")
+        await cache.delete("lock:key")
+
+        assert await backend.get("key") == "value"
+        assert await backend.get("lock:key") is None
+        await cache.shutdown()
+
+    async def test_delete_does_not_wait_for_later_writes(self, backend):
+        """Test a lock release under steady writes only flushes what came before it"""
+
+        class SlowCache(MemoryCache):
+            async def set_many(self, items, ttl=None):
+                await asyncio.sleep(0.001)
+                await super().set_many(items, ttl)
+
+        slow = SlowCache()
+        cache = WriteBehindCache(slow, batch_size=2, flush_interval=60)
+        await cache.set("key", "value")
+
+        async def produce() -> None:
+            for i in range(1_000_000):
+                await cache.set(f"other:{i}", "v")
+                await asyncio.sleep(0)
+
+        producer = asyncio.create_task(produce())
+        await asyncio.sleep(0)
+        await asyncio.wait_for(cache.delete("lock:key"), timeout=1)
+        producer.cancel()
+
+        assert await slow.get("key") == "value"
+        await cache.shutdown()
+
+    async def test_blocked_writers_write_through_after_shutdown(self, backend):
+        cache = WriteBehindCache(backend, max_queue=1, flush_interval=60, overflow="block")
+        await cache.shutdown()
+        await cache.set("a", "1")
+        await asyncio.wait_for(cache.set("b", "2"), timeout=1)
+
+        assert await backend.get_many(["a", "b"]) == ["1", "2"]
+
+    async def test_shutdown_does_not_wait_for_flush_interval(self, backend):
+        cache = WriteBehindCache(backend, flush_interval=60)
+        await cache.set("a", "1")
+        await asyncio.sleep(0)  # drainer is now waiting for a batch
+
+        await asyncio.wait_for(cache.shutdown(), timeout=1)
+        assert await backend.get("a") == "1"
+
+
+class TestSharedMemoryCache:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "shared")
+
+    @pytest.fixture
+    async def cache(self, path):
+        cache = SharedMemoryCache(shared_path=path, slots=64, slot_size=256)
+        yield cache
+        await cache.shutdown()
+
+    def test_registered(self):
+        assert "shared" in CacheInterface.available()
+
+    async def test_set_get_delete(self, cache):
+        await cache.set("key", "café")
+
+        assert await cache.get("key") == "café"
+        await cache.delete("key")
+        assert await cache.get("key") is None
+        assert cache.stats()["hits"] == 1
+
+    async def test_shared_between_instances(self, cache, path):
+        other = SharedMemoryCache(shared_path=path, slots=64, slot_size=256)
+        await cache.set_many({"a": "1", "b": "2"}, ttl={"a": 60})
+
+        assert await other.get_many(["a", "missing", "b"]) == ["1", None, "2"]
+        assert not await other.add("a", "other")
+        await other.clear()
+        assert await cache.get("b") is None
+
+    async def test_shared_between_processes(self, cache, path):
+        script = (
+            "import asyncio\n"
+            "from cache_adapters.providers.shared_cache import SharedMemoryCache\n"
+            f"cache = SharedMemoryCache(shared_path={path!r}, slots=64, slot_size=256)\n"
+            "asyncio.run(cache.set('key', 'from child'))\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+        assert await cache.get("key") == "from child"
+
+    async def test_expired_entries_miss(self, cache, monkeypatch):
+        await cache.set("short", "value", ttl=10)
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 60)
+
+        assert await cache.get("short") is None
+        assert await cache.add("short", "again")
+        assert cache.stats()["expirations"] == 1
+
+    async def test_full_set_evicts_least_recently_hit(self, path, monkeypatch):
+        """Test a full set replaces the entry whose last hit is oldest"""
+        cache = SharedMemoryCache(shared_path=path, slots=8, slot_size=256)  # one set
+        now = time.time()
+        for i in range(8):
+            monkeypatch.setattr(time, "time", lambda i=i: now + i * 10)
+            await cache.set(f"k{i}", "value")
+        monkeypatch.setattr(time, "time", lambda: now + 100)
+        await cache.get("k0")  # k1 is now the least recently hit
+        await cache.set("new", "value")
+
+        assert await cache.get("k1") is None
+        assert await cache.get_many(["k0", "new"]) == ["value", "value"]
+        assert cache.stats()["evictions"] == 1
+
+    async def test_oversized_value_not_cached(self, cache):
+        await cache.set("key", "small")
+        await cache.set("key", "x" * 1000)
+
+        assert await cache.get("key") is None
+        assert cache.stats()["rejected"] == 1
+
+    async def test_compressed_values_fit_slots(self, path):
+        cache = SharedMemoryCache(shared_path=path, slots=8, slot_size=512, compression="zlib")
+        await cache.set("key", TestCompression.LONG)
+
+        assert await cache.get("key") == TestCompression.LONG
+
+    async def test_other_geometry_replaces_file(self, cache, path):
+        await cache.set("key", "value")
+
+        resized = SharedMemoryCache(shared_path=path, slots=128, slot_size=256)
+
+        assert resized.stats()["recreated"] == 1
+        assert await resized.get("key") is None
+        assert await cache.get("key") == "value"  # old mapping stays readable
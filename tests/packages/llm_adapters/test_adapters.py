@@ -1,5 +1,12 @@
+import asyncio
+import subprocess
+import sys
+from importlib.metadata import EntryPoint, EntryPoints
+
 import pytest
 from llm_adapters import LLMInterface
+from llm_adapters.contracts import llm_interface
+from llm_adapters.contracts.llm_interface import ENTRY_POINT_GROUP
 from llm_adapters.providers.anthropic_adapter import AnthropicAdapter
 from llm_adapters.providers.mock_adapter import MockAdapter
 from llm_adapters.providers.openai_adapter import OpenAIAdapter
@@ -38,6 +45,59 @@ class TestAdapterRegistry:
             LLMInterface.resolve("unknown")
 
 
+class TestLazyRegistry:
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        # Isolate registrations made by the test
+        monkeypatch.setattr(LLMInterface, "_registry", dict(LLMInterface._registry))
+        monkeypatch.setattr(LLMInterface, "_lazy", dict(LLMInterface._lazy))
+
+    @pytest.fixture
+    def plugin_module(self, tmp_path, monkeypatch):
+        (tmp_path / "lazy_plugin.py").write_text(
+            "from llm_adapters.providers.mock_adapter import MockAdapter\n"
+            "class LazyAdapter(MockAdapter):\n"
+            "    name = 'lazy'\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        yield "lazy_plugin"
+        sys.modules.pop("lazy_plugin", None)
+
+    def test_lazy_adapter_imported_on_first_resolve(self, registry, plugin_module):
+        """Test a lazily registered adapter is listed but not imported until picked"""
+        LLMInterface.register_lazy("lazy", f"{plugin_module}:LazyAdapter")
+
+        assert "lazy" in LLMInterface.available()
+        assert plugin_module not in sys.modules
+
+        adapter = LLMInterface.resolve("lazy")
+
+        assert type(adapter).__name__ == "LazyAdapter"
+        assert plugin_module in sys.modules
+
+    def test_entry_point_adapter(self, registry, plugin_module, monkeypatch):
+        """Test third-party packages can register through entry points"""
+        plugin = EntryPoint("lazy", f"{plugin_module}:LazyAdapter", ENTRY_POINT_GROUP)
+        monkeypatch.setattr(
+            llm_interface, "entry_points", lambda **kw: EntryPoints([plugin]).select(**kw)
+        )
+
+        assert "lazy" in LLMInterface.available()
+        assert type(LLMInterface.resolve("lazy")).__name__ == "LazyAdapter"
+
+    def test_app_import_skips_provider_sdks(self):
+        """Test importing the app loads no SDK until a provider is resolved"""
+        code = (
+            "import sys; from rewriteforge.bootstrap import app; "
+            "print(sorted({'anthropic', 'openai', 'redis'} & set(sys.modules)))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+
+        assert output.strip() == "[]"
+
+
 class TestMockAdapter:
     @pytest.fixture
     def adapter(self):
@@ -76,3 +136,42 @@ class TestMockAdapter:
         assert len(chunks) > 0
         result = "".join(chunks).strip()
         assert result == "[*pirate*] Hello world"
+
+
+class TestMockLatencyProfile:
+    @pytest.mark.parametrize("distribution", ["lognormal", "pareto"])
+    def test_distribution_centres_on_latency(self, distribution):
+        """Test lognormal has median latency, pareto never goes below it"""
+        adapter = MockAdapter(latency=0.1, distribution=distribution, seed=1)
+
+        samples = sorted(adapter.sample_latency() for _ in range(2001))
+
+        if distribution == "lognormal":
+            assert 0.09 < samples[1000] < 0.11
+        else:
+            assert samples[0] >= 0.1
+            assert samples[-1] > 1.0  # the heavy tail shows up
+
+    def test_fixed_is_constant(self):
+        """Test the default profile keeps its old behaviour"""
+        adapter = MockAdapter(latency=0.1)
+
+        assert {adapter.sample_latency() for _ in range(10)} == {0.1}
+
+    def test_unknown_distribution_rejected(self):
+        """Test typos in the distribution name fail loudly"""
+        with pytest.raises(ValueError, match="distribution"):
+            MockAdapter(distribution="gaussian")
+
+    async def test_stream_waits_ttft_then_token_delay(self):
+        """Test streams model time to first token and inter-token delay"""
+        adapter = MockAdapter(latency=5.0, ttft=0.02, token_delay=0.01)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        arrivals = []
+
+        async for _ in adapter.rewrite_stream("one two three", "pirate"):
+            arrivals.append(loop.time() - started)
+
+        assert 0.02 <= arrivals[0] < 0.5  # ttft, not the 5s call latency
+        assert arrivals[-1] - arrivals[0] >= 0.03  # 3 gaps between 4 chunks
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from llm_adapters.exceptions import DeadlineExceededError
+from llm_adapters.providers.mock_adapter import MockAdapter
+from llm_adapters.support import DeadlineAdapter, deadline, remaining, timeout_kwargs
+
+
+class TestDeadline:
+    def test_no_deadline_by_default(self):
+        """Test nothing is limited outside a deadline scope"""
+        assert remaining() is None
+        assert timeout_kwargs() == {}
+
+    def test_nested_scope_only_tightens(self):
+        """Test an inner scope can shorten but not extend the outer budget"""
+        with deadline(1.0):
+            with deadline(60.0):
+                assert remaining() <= 1.0
+            with deadline(0.5):
+                assert remaining() <= 0.5
+            assert 0.5 < remaining() <= 1.0
+        assert remaining() is None
+
+    def test_timeout_kwargs_carry_budget(self):
+        """Test SDK timeout is what's left of the deadline"""
+        with deadline(2.0):
+            assert 0 < timeout_kwargs()["timeout"] <= 2.0
+
+
+class TestDeadlineAdapter:
+    async def test_slow_call_cancelled_at_deadline(self):
+        """Test an upstream call is cut off when the budget runs out"""
+        adapter = DeadlineAdapter(MockAdapter(latency=1.0))
+
+        with deadline(0.02), pytest.raises(DeadlineExceededError):
+            await adapter.rewrite("x", "pirate")
+
+        assert adapter.stats()["deadline_exceeded"] == 1
+
+    async def test_spent_budget_fails_fast(self):
+        """Test no upstream call is made once the budget is gone"""
+        inner = MockAdapter()
+        inner.rewrite = pytest.fail
+        adapter = DeadlineAdapter(inner)
+
+        with deadline(0.001):
+            await asyncio.sleep(0.01)
+            with pytest.raises(DeadlineExceededError):
+                await adapter.rewrite("x", "pirate")
+
+    async def test_closed_stream_counts_as_cancelled(self):
+        """Test a consumer leaving mid-stream is counted as a cancelled upstream call"""
+        adapter = DeadlineAdapter(MockAdapter())
+
+        chunks = adapter.rewrite_stream("one two three", "pirate")
+        await anext(chunks)
+        await chunks.aclose()
+
+        assert adapter.stats()["cancelled_calls"] == 1
+
+    async def test_completed_calls_not_cancelled(self):
+        """Test normal calls leave the cancellation counters alone"""
+        adapter = DeadlineAdapter(MockAdapter())
+
+        with deadline(5):
+            await adapter.rewrite("x", "pirate")
+            _ = [chunk async for chunk in adapter.rewrite_stream("x", "pirate")]
+
+        assert adapter.stats()["cancelled_calls"] == 0
+        assert adapter.stats()["calls"] == 2
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+from llm_adapters.contracts import LLMInterface
+from llm_adapters.exceptions import OverloadedError
+from llm_adapters.providers.mock_adapter import MockAdapter
+from llm_adapters.support import AdaptiveLimiter, LimitedAdapter, deadline, is_overload
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class SlowAdapter(LLMInterface):
+    """Adapter that tracks peak concurrency"""
+
+    def __init__(self, delay: float = 0.02, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.running = 0
+        self.peak = 0
+
+    async def rewrite(self, text: str, style: str) -> str:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            return text
+        finally:
+            self.running -= 1
+
+    async def rewrite_stream(self, text: str, style: str):
+        await asyncio.sleep(self.delay)
+        for word in text.split():
+            yield word
+
+
+class TestAdaptiveLimiter:
+    async def test_window_bounds_concurrency(self):
+        """Test no more than `limit` calls reach the provider at once"""
+        inner = SlowAdapter()
+        adapter = LimitedAdapter(inner, AdaptiveLimiter(initial_limit=2, max_limit=2))
+
+        await asyncio.gather(*(adapter.rewrite("x", "pirate") for _ in range(6)))
+
+        assert inner.peak == 2
+
+    async def test_full_queue_sheds_immediately(self):
+        """Test callers beyond the queue bound are rejected without waiting"""
+        limiter = AdaptiveLimiter(initial_limit=1, max_queue=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(OverloadedError) as excinfo:
+            await limiter.acquire()
+
+        assert excinfo.value.retry_after >= 1
+        assert limiter.stats()["shed"] == 1
+        limiter.release(0.01)
+        await waiter
+
+    async def test_queue_wait_times_out(self):
+        """Test a queued caller gives up after max_queue_wait"""
+        limiter = AdaptiveLimiter(initial_limit=1, max_queue_wait=0.02)
+        await limiter.acquire()
+
+        with pytest.raises(OverloadedError):
+            await limiter.acquire()
+
+        assert limiter.queue_depth == 0
+        assert limiter.stats()["queue_timeouts"] == 1
+
+    async def test_overload_errors_shrink_window(self):
+        """Test 429s multiplicatively decrease the limit"""
+        limiter = AdaptiveLimiter(initial_limit=10, backoff=0.5)
+        adapter = LimitedAdapter(SlowAdapter(delay=0, error=RateLimitError()), limiter)
+
+        for _ in range(10):
+            with pytest.raises(RateLimitError):
+                await adapter.rewrite("x", "pirate")
+
+        # One decrease per window of completions, not one per error
+        assert limiter.limit == 5
+        assert limiter.stats()["overload_signals"] == 10
+
+    async def test_timeouts_past_the_deadline_do_not_shrink_window(self):
+        """Test a client's own short deadline is not read as provider overload"""
+        limiter = AdaptiveLimiter()
+        adapter = LimitedAdapter(SlowAdapter(delay=0.01, error=TimeoutError()), limiter)
+
+        with deadline(0.001), pytest.raises(TimeoutError):
+            await adapter.rewrite("x", "pirate")
+        assert limiter.stats()["overload_signals"] == 0
+
+        with deadline(10), pytest.raises(TimeoutError):
+            await adapter.rewrite("x", "pirate")
+        assert limiter.stats()["overload_signals"] == 1
+
+    async def test_window_grows_while_saturated(self):
+        """Test steady latency under full load raises the limit"""
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=10)
+        adapter = LimitedAdapter(SlowAdapter(delay=0.005), limiter)
+
+        await asyncio.gather(*(adapter.rewrite("x", "pirate") for _ in range(40)))
+
+        assert limiter.limit > 2
+
+    async def test_abandoned_stream_releases_slot(self):
+        """Test a consumer stopping early frees the stream's slot"""
+        limiter = AdaptiveLimiter(initial_limit=1)
+        adapter = LimitedAdapter(SlowAdapter(delay=0), limiter)
+
+        chunks = adapter.rewrite_stream("one two three", "pirate")
+        assert await anext(chunks) == "one"
+        await chunks.aclose()
+
+        assert limiter.stats()["inflight"] == 0
+
+    def test_wrap_disabled_returns_adapter(self):
+        """Test the limiter can be switched off"""
+        adapter = MockAdapter()
+
+        assert LimitedAdapter.wrap(adapter, enabled=False) is adapter
+        assert isinstance(LimitedAdapter.wrap(adapter), LimitedAdapter)
+
+    def test_is_overload(self):
+        """Test which provider errors count as overload"""
+        server_error = Exception()
+        server_error.status_code = 503
+        bad_request = Exception()
+        bad_request.status_code = 400
+
+        assert is_overload(RateLimitError())
+        assert is_overload(server_error)
+        assert is_overload(TimeoutError())
+        assert not is_overload(bad_request)
+        assert not is_overload(ValueError())
@@ -0,0 +1,120 @@
+import asyncio
+import os
+
+import pytest
+from llm_adapters import LLMInterface
+from llm_adapters.providers.mock_adapter import MockAdapter
+from llm_adapters.providers.replay_adapter import ReplayAdapter, ReplayMissError
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "traffic.bin")
+
+
+async def collect(chunks) -> list[str]:
+    return [chunk async for chunk in chunks]
+
+
+class TestReplayAdapter:
+    def test_registered(self):
+        """Test LLM_PROVIDER=replay resolves"""
+        assert "replay" in LLMInterface.available()
+
+    async def test_replays_recorded_calls_and_streams(self, path):
+        """Test responses come back byte-identical from the recording"""
+        recorder = ReplayAdapter(path=path, mode="record", upstream="mock")
+        called = await recorder.rewrite("Hello world", "pirate")
+        streamed = await collect(recorder.rewrite_stream("Stream me", "haiku"))
+
+        replay = ReplayAdapter(path=path, speed=float("inf"))
+
+        assert await replay.rewrite("Hello world", "pirate") == called
+        assert await collect(replay.rewrite_stream("Stream me", "haiku")) == streamed
+        assert replay.stats()["replay_replayed"] == 2
+
+    async def test_reproduces_recorded_timing(self, path):
+        """Test replay waits as long as the upstream did, scaled by speed"""
+        recorder = ReplayAdapter(
+            path=path, mode="record", adapter=MockAdapter(ttft=0.05, token_delay=0.02)
+        )
+        await collect(recorder.rewrite_stream("one two three", "pirate"))
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        await collect(ReplayAdapter(path=path).rewrite_stream("one two three", "pirate"))
+        normal = loop.time() - started
+        started = loop.time()
+        await collect(ReplayAdapter(path=path, speed=2).rewrite_stream("one two three", "pirate"))
+        double = loop.time() - started
+
+        assert normal >= 0.1  # ttft + 3 token delays
+        assert double < normal * 0.75
+
+    async def test_cycles_through_repeated_recordings(self, path):
+        """Test a key recorded twice replays both latencies in turn"""
+        for latency in (0.0, 0.05):
+            recorder = ReplayAdapter(path=path, mode="record", adapter=MockAdapter(latency=latency))
+            await recorder.rewrite("Hello", "pirate")
+        replay = ReplayAdapter(path=path)
+        loop = asyncio.get_running_loop()
+
+        durations = []
+        for _ in range(2):
+            started = loop.time()
+            await replay.rewrite("Hello", "pirate")
+            durations.append(loop.time() - started)
+
+        assert durations[0] < 0.04 <= durations[1]
+
+    async def test_unrecorded_request_misses(self, path):
+        """Test requests outside the recording fail instead of inventing output"""
+        await ReplayAdapter(path=path, mode="record").rewrite("Hello", "pirate")
+        replay = ReplayAdapter(path=path)
+
+        with pytest.raises(ReplayMissError):
+            await replay.rewrite("Hello", "haiku")
+        assert replay.stats()["replay_misses"] == 1
+
+    async def test_torn_tail_is_ignored(self, path):
+        """Test a record cut off by a crash doesn't break the rest of the file"""
+        recorder = ReplayAdapter(path=path, mode="record")
+        await recorder.rewrite("First", "pirate")
+        await recorder.rewrite("Second", "pirate")
+        with open(path, "r+b") as file:
+            file.truncate(file.seek(0, 2) - 3)
+
+        replay = ReplayAdapter(path=path, speed=float("inf"))
+
+        assert await replay.rewrite("First", "pirate") == "[*pirate*] First"
+        with pytest.raises(ReplayMissError):
+            await replay.rewrite("Second", "pirate")
+
+    async def test_aborted_stream_not_recorded(self, path):
+        """Test a stream the consumer abandoned isn't replayed as a short answer"""
+        recorder = ReplayAdapter(path=path, mode="record")
+        chunks = recorder.rewrite_stream("one two three", "pirate")
+        await anext(chunks)
+        await chunks.aclose()
+
+        assert recorder.stats()["replay_recorded"] == 0
+
+    async def test_empty_recording_misses(self, path):
+        """Test an empty file replays as a recording of nothing"""
+        open(path, "wb").close()
+        replay = ReplayAdapter(path=path)
+
+        with pytest.raises(ReplayMissError):
+            await replay.rewrite("Hello", "pirate")
+        await replay.shutdown()
+
+    async def test_shutdown_closes_recording(self, path):
+        """Test the append descriptor is released on shutdown"""
+        recorder = ReplayAdapter(path=path, mode="record")
+        await recorder.rewrite("Hello", "pirate")
+        fd = recorder._fd
+
+        await recorder.shutdown()
+
+        with pytest.raises(OSError):
+            os.fstat(fd)
@@ -0,0 +1,240 @@
+import asyncio
+
+import pytest
+from llm_adapters import LLMInterface
+from llm_adapters.exceptions import OverloadedError
+from llm_adapters.providers.mock_adapter import MockAdapter, MockProviderError
+from llm_adapters.providers.router_adapter import RouterAdapter
+from llm_adapters.support import CircuitBreaker
+
+
+class Scripted(LLMInterface):
+    """Adapter with a settable delay that records calls and cancellations"""
+
+    def __init__(self, label: str, delay: float = 0.0, error: Exception | None = None):
+        self.label = label
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def _wait(self) -> None:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+
+    async def rewrite(self, text: str, style: str) -> str:
+        await self._wait()
+        return f"{self.label}:{text}"
+
+    async def rewrite_stream(self, text: str, style: str):
+        await self._wait()
+        for word in text.split():
+            yield f"{self.label}:{word} "
+
+
+class Gated(Scripted):
+    """Scripted adapter whose streams wait on a shared gate and record closing"""
+
+    def __init__(self, label: str, gate: asyncio.Event, delay: float = 0.0):
+        super().__init__(label, delay)
+        self.gate = gate
+        self.closed = 0
+
+    async def rewrite_stream(self, text: str, style: str):
+        await self._wait()
+        await self.gate.wait()
+        try:
+            for word in text.split():
+                yield f"{self.label}:{word} "
+        finally:
+            self.closed += 1
+
+
+class ClientError(Exception):
+    status_code = 400
+
+
+class TestRouterAdapter:
+    async def test_routes_to_fastest(self):
+        """Test traffic settles on the lowest-latency route"""
+        slow, fast = Scripted("slow", 0.03), Scripted("fast", 0.0)
+        router = RouterAdapter(adapters={"slow": slow, "fast": fast})
+
+        results = [await router.rewrite("x", "pirate") for _ in range(10)]
+
+        # One exploratory call to each, then only the fast one
+        assert slow.calls == 1
+        assert results[-1] == "fast:x"
+
+    async def test_hedge_beats_stuck_primary(self):
+        """Test a primary slower than its usual tail is raced and cancelled"""
+        a, b = Scripted("a", 0.005), Scripted("b", 0.02)
+        router = RouterAdapter(adapters={"a": a, "b": b}, hedge_percentile=50, hedge_min_samples=1)
+        for _ in range(3):
+            await router.rewrite("warmup", "pirate")
+
+        a.delay = 10
+        result = await router.rewrite("x", "pirate")
+        await asyncio.sleep(0)
+
+        assert result == "b:x"
+        assert a.cancelled == 1
+        assert router.stats()["hedges"] == 1
+        assert router.stats()["hedge_wins"] == 1
+
+    async def test_fails_over_on_provider_error(self):
+        """Test a failing route falls through to the next one"""
+        router = RouterAdapter(
+            adapters={"a": Scripted("a", error=MockProviderError("down")), "b": Scripted("b")}
+        )
+
+        assert await router.rewrite("x", "pirate") == "b:x"
+        assert router.stats()["failovers"] == 1
+
+    async def test_client_error_not_failed_over(self):
+        """Test a 4xx is the caller's problem, not a reason to try elsewhere"""
+        backup = Scripted("b")
+        router = RouterAdapter(adapters={"a": Scripted("a", error=ClientError()), "b": backup})
+
+        with pytest.raises(ClientError):
+            await router.rewrite("x", "pirate")
+
+        assert backup.calls == 0
+
+    async def test_breaker_takes_failing_route_out(self):
+        """Test repeated failures trip the breaker so the route is skipped"""
+        failing = Scripted("a", error=MockProviderError("down"))
+        router = RouterAdapter(adapters={"a": failing, "b": Scripted("b")}, breaker_threshold=0.5)
+
+        for _ in range(10):
+            assert await router.rewrite("x", "pirate") == "b:x"
+
+        assert failing.calls == 5
+        assert router.stats()["route.a.breaker_open"] == 1
+
+    async def test_all_routes_open_sheds(self):
+        """Test an all-open router raises OverloadedError instead of calling anyone"""
+        router = RouterAdapter(
+            adapters={"a": MockAdapter(failure_rate=1.0)},
+            breaker_threshold=0.5,
+            breaker_cooldown=60,
+        )
+        for _ in range(5):
+            with pytest.raises(MockProviderError):
+                await router.rewrite("x", "pirate")
+
+        with pytest.raises(OverloadedError) as excinfo:
+            await router.rewrite("x", "pirate")
+
+        assert excinfo.value.retry_after > 1
+
+    async def test_stream_hedges_time_to_first_chunk(self):
+        """Test streams race on first chunk and then stick to the winner"""
+        a, b = Scripted("a", 0.005), Scripted("b", 0.02)
+        router = RouterAdapter(adapters={"a": a, "b": b}, hedge_percentile=50, hedge_min_samples=1)
+        for _ in range(3):
+            _ = [chunk async for chunk in router.rewrite_stream("warmup", "pirate")]
+
+        a.delay = 10
+        chunks = [chunk async for chunk in router.rewrite_stream("one two", "pirate")]
+
+        assert chunks == ["b:one ", "b:two "]
+
+    async def test_stream_closes_hedge_that_also_opened(self):
+        """Test a stream that opened in the same round as the winner is closed"""
+        gate = asyncio.Event()
+        gate.set()
+        a, b = Gated("a", gate, 0.005), Gated("b", gate, 0.02)
+        router = RouterAdapter(adapters={"a": a, "b": b}, hedge_percentile=50, hedge_min_samples=1)
+        for _ in range(3):
+            _ = [chunk async for chunk in router.rewrite_stream("warmup", "pirate")]
+
+        gate.clear()
+        a.delay = b.delay = 0
+        a.closed = b.closed = 0
+        hedged = b.calls + 1
+
+        async def open_gate() -> None:
+            while b.calls < hedged:
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(0.001)
+            gate.set()
+
+        opener = asyncio.create_task(open_gate())
+        stream = router.rewrite_stream("one two", "pirate")
+        first = await anext(stream)
+        await opener
+
+        # Both opened in the same round; whichever lost is closed
+        winner, loser = (a, b) if first == "a:one " else (b, a)
+        assert (winner.closed, loser.closed) == (0, 1)
+        await stream.aclose()
+
+    async def test_routes_resolved_from_registry(self):
+        """Test routes can name registered adapters with their own options"""
+        router = LLMInterface.resolve(
+            "router",
+            routes={"primary": {"provider": "mock", "latency": 0.001}, "mock": {}},
+        )
+
+        assert await router.rewrite("Hello", "pirate") == "[*pirate*] Hello"
+        assert {"route.primary.latency_ms", "route.mock.latency_ms"} <= router.stats().keys()
+
+    def test_router_cannot_nest(self):
+        """Test a router route pointing at another router is rejected"""
+        with pytest.raises(ValueError):
+            RouterAdapter(routes={"inner": {"provider": "router"}})
+
+
+class TestCircuitBreaker:
+    def test_half_open_probe_closes_on_success(self):
+        """Test open -> half-open after cooldown, and a good probe closes it"""
+        now = [0.0]
+        breaker = CircuitBreaker(threshold=0.5, min_calls=2, cooldown=10, clock=lambda: now[0])
+        breaker.record(False)
+        breaker.record(False)
+        assert breaker.state == CircuitBreaker.OPEN
+
+        now[0] = 11
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.begin()
+        assert not breaker.available()  # only one probe at a time
+
+        breaker.record(True)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        """Test a failing probe restarts the cooldown"""
+        now = [0.0]
+        breaker = CircuitBreaker(threshold=0.5, min_calls=1, cooldown=10, clock=lambda: now[0])
+        breaker.record(False)
+
+        now[0] = 11
+        breaker.begin()
+        breaker.record(False)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.remaining() == 10
+        assert breaker.trips == 2
+
+
+class TestMockProfiles:
+    async def test_failure_rate(self):
+        """Test failure_rate=1 always raises a retryable provider error"""
+        with pytest.raises(MockProviderError):
+            await MockAdapter(failure_rate=1.0).rewrite("x", "pirate")
+
+    async def test_latency(self):
+        """Test calls wait at least the configured latency"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        await MockAdapter(latency=0.02).rewrite("x", "pirate")
+
+        assert loop.time() - started >= 0.02
@@ -0,0 +1,53 @@
+import unicodedata
+
+import pytest
+from rewriteforge.app.services.cache_keys import CacheKeys
+
+
+class TestCacheKeys:
+    @pytest.mark.parametrize(
+        "variant",
+        [
+            "Café au lait\nplease",
+            "Café au lait\r\nplease",
+            "  Café au lait\nplease \n",
+            unicodedata.normalize("NFD", "Café au lait\nplease"),
+        ],
+    )
+    def test_trivial_differences_share_a_key(self, variant):
+        """Test line endings, surrounding whitespace and NFD/NFC collapse"""
+        keys = CacheKeys()
+
+        assert keys.key(variant, "pirate") == keys.key("Café au lait\nplease", "pirate")
+
+    def test_layout(self):
+        """Test namespace, version, provider, model and style lead the key"""
+        key = CacheKeys(provider="openai", model="gpt-4o").key("Hello", "pirate")
+
+        prefix, digest = key.rsplit(":", 1)
+        assert prefix == "rewrite:v1:openai:gpt-4o:pirate"
+        assert len(digest) == 32  # 128 bits
+
+    @pytest.mark.parametrize(
+        "changed", [{"provider": "openai"}, {"model": "other"}, {"version": 2}]
+    )
+    def test_provider_model_and_version_separate_entries(self, changed):
+        """Test switching provider, model or prompt version never serves old output"""
+        base = {"provider": "anthropic", "model": "claude", "version": 1}
+
+        assert CacheKeys(**base).key("Hello", "pirate") != CacheKeys(**{**base, **changed}).key(
+            "Hello", "pirate"
+        )
+
+    def test_whitespace_step_is_opt_in(self):
+        """Test inner whitespace only collapses when configured"""
+        default = CacheKeys()
+        collapsing = CacheKeys(normalize=["whitespace"])
+
+        assert default.canonical("a  b") == "a  b"
+        assert collapsing.canonical("a  \tb  \nc") == "a b\nc"
+
+    def test_unknown_step_rejected(self):
+        """Test typos in CACHE_KEY_NORMALIZE fail at startup"""
+        with pytest.raises(ValueError, match="Unknown normalizers"):
+            CacheKeys(normalize=["strip", "lowercase"])
@@ -0,0 +1,76 @@
+import asyncio
+
+from rewriteforge.app.services.freshness import Cached, Freshness, unwrap, wrap
+
+
+class TestEnvelope:
+    def test_roundtrip(self):
+        assert unwrap(wrap("Ahoy", 1000.5, 2.25)) == Cached("Ahoy", 1000.5, 2.25)
+
+    def test_plain_values_have_no_metadata(self):
+        """Test entries written without a header read back as themselves"""
+        assert unwrap("Ahoy") == Cached("Ahoy")
+
+
+class TestFreshness:
+    def test_stale_past_ttl(self):
+        freshness = Freshness(ttl=60, stale_ttl=30)
+
+        assert freshness.state(Cached("x", 1000.0), now=1059.0) == Freshness.FRESH
+        assert freshness.state(Cached("x", 1000.0), now=1060.0) == Freshness.STALE
+        assert freshness.storage_ttl == 90
+
+    def test_early_refresh_scales_with_cost(self):
+        """Test XFetch refreshes expensive entries sooner than cheap ones"""
+        # U = 1 - e^-1, so the draw is exactly delta * beta seconds ahead
+        freshness = Freshness(ttl=60, beta=1.0, rng=lambda: 0.6321205588285577)
+
+        assert freshness.state(Cached("x", 1000.0, delta=5.0), now=1056.0) == Freshness.EARLY
+        assert freshness.state(Cached("x", 1000.0, delta=1.0), now=1056.0) == Freshness.FRESH
+
+    def test_disabled_by_default(self):
+        freshness = Freshness(ttl=60)
+
+        assert not freshness.enabled
+        assert freshness.state(Cached("x", 0.0, 5.0), now=1e9) == Freshness.FRESH
+
+    async def test_one_refresh_per_key(self):
+        freshness = Freshness(ttl=60, stale_ttl=30)
+        calls = []
+
+        async def recompute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+
+        started = [freshness.refresh("key", recompute) for _ in range(3)]
+        await asyncio.sleep(0.05)
+
+        assert started == [True, False, False]
+        assert calls == [1]
+        assert freshness.stats()["refreshing"] == 0
+
+    async def test_failures_counted(self):
+        freshness = Freshness(ttl=60, stale_ttl=30)
+
+        async def broken():
+            raise RuntimeError("provider down")
+
+        freshness.refresh("key", broken)
+        await asyncio.sleep(0.01)
+
+        assert freshness.stats()["refresh_failures"] == 1
+
+    async def test_shutdown_cancels_refreshes(self):
+        freshness = Freshness(ttl=60, stale_ttl=30)
+        finished = []
+
+        async def slow():
+            await asyncio.sleep(10)
+            finished.append(1)
+
+        freshness.refresh("key", slow)
+        await asyncio.sleep(0)
+        await asyncio.wait_for(freshness.shutdown(), timeout=1)
+
+        assert finished == []
+        assert freshness.stats()["refreshing"] == 0
@@ -0,0 +1,117 @@
+import pytest
+from rewriteforge.app.services.fuzzy_cache import FuzzyCache, FuzzyIndex, adapt, similarity
+
+TEMPLATE = (
+    "Hi {name}, your order {order} has shipped and will arrive on Tuesday. "
+    "Thanks for shopping with us, and let us know if anything is wrong."
+)
+
+
+def notification(name: str, order: int) -> str:
+    return TEMPLATE.format(name=name, order=order)
+
+
+class TestAdapt:
+    def test_substitutes_swapped_words(self):
+        """Test names and numbers carry over into the cached rewrite"""
+        rewritten = "Ahoy Alice! Yer order 1234 be on its way."
+
+        result = adapt(notification("Alice", 1234), notification("Bob", 5678), rewritten)
+
+        assert result == "Ahoy Bob! Yer order 5678 be on its way."
+
+    def test_multi_word_substitution(self):
+        """Test a phrase may be replaced by one of a different length"""
+        rewritten = "Ahoy Alice! Yer order 1234 be on its way."
+
+        result = adapt(notification("Alice", 1234), notification("Mary Jane", 1234), rewritten)
+
+        assert result == "Ahoy Mary Jane! Yer order 1234 be on its way."
+
+    def test_reworded_phrase_rejected(self):
+        """Test a rewrite that dropped the differing word cannot be adapted"""
+        rewritten = "Ahoy matey! Yer order be on its way."
+
+        assert adapt(notification("Alice", 1234), notification("Bob", 1234), rewritten) is None
+
+    def test_partially_replaced_word_rejected(self):
+        """Test a word changed in only one of its occurrences is not swapped everywhere"""
+        source = "Hello world. Hello world."
+        target = "Hello earth. Hello world."
+
+        assert adapt(source, target, source) is None
+
+    def test_insertion_rejected(self):
+        """Test added words cannot be carried over"""
+        assert adapt("Your order shipped.", "Your big order shipped.", "Order sent.") is None
+
+
+class TestFuzzyIndex:
+    def test_finds_near_duplicate(self):
+        """Test a templated variant finds its neighbour, unrelated text does not"""
+        index = FuzzyIndex(threshold=0.8)
+        index.add("alice", notification("Alice", 1234))
+        index.add("report", "The quarterly report shows revenue growth in every region.")
+
+        matches = index.search(notification("Bob", 5678))
+
+        assert [key for key, _, _ in matches] == ["alice"]
+        assert matches[0][2] == pytest.approx(similarity(notification("Alice", 1234), TEMPLATE))
+
+    def test_threshold_enforced(self):
+        """Test neighbours below the exact similarity threshold are not returned"""
+        index = FuzzyIndex(threshold=0.99)
+        index.add("alice", notification("Alice", 1234))
+
+        assert index.search(notification("Bob", 5678)) == []
+
+    def test_bounded_with_lru_eviction(self):
+        """Test the index never exceeds max_entries and evicts the oldest first"""
+        index = FuzzyIndex(max_entries=2)
+        index.add("a", notification("Alice", 1))
+        index.add("b", notification("Bob", 2))
+        index.add("c", notification("Carol", 3))
+
+        assert len(index) == 2
+        assert "a" not in [key for key, _, _ in index.search(notification("Alice", 1))]
+
+    def test_discard_clears_postings(self):
+        """Test discarded entries leave no empty postings behind"""
+        index = FuzzyIndex()
+        index.add("a", notification("Alice", 1))
+        index.discard("a")
+
+        assert len(index) == 0
+        assert not index._postings
+
+    def test_short_near_duplicates_always_found(self):
+        """Test recall is exact for short inputs whatever the hash salt"""
+        index = FuzzyIndex(threshold=0.8)
+        index.add("a", "one two three four five six seven eight nine ten")
+
+        for changed in range(10):
+            words = "one two three four five six seven eight nine ten".split()
+            words[changed] = "eleven"
+            assert index.search(" ".join(words)), changed
+
+
+class TestFuzzyCache:
+    def test_only_configured_styles(self):
+        """Test styles without the switch are neither indexed nor searched"""
+        fuzzy = FuzzyCache(styles=["formal"])
+        fuzzy.remember("pirate", "key", notification("Alice", 1))
+
+        assert fuzzy.enabled("formal") and not fuzzy.enabled("pirate")
+        assert fuzzy.candidates("pirate", notification("Bob", 2)) == []
+        assert fuzzy.stats()["entries"] == 0
+
+    def test_serve_mode_returns_neighbour_unchanged(self):
+        """Test serve mode skips adaptation"""
+        fuzzy = FuzzyCache(styles=["formal"], mode="serve")
+
+        assert fuzzy.apply("a b", "a c", "Rewritten.") == "Rewritten."
+        assert fuzzy.stats()["hits"] == 1
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError, match="Unknown fuzzy cache mode"):
+            FuzzyCache(mode="guess")
@@ -1,6 +1,16 @@
+import asyncio
+import json
+
 import pytest
 from httpx import ASGITransport, AsyncClient
+from llm_adapters.contracts import LLMInterface
+from llm_adapters.exceptions import OverloadedError
+from llm_adapters.providers.mock_adapter import MockAdapter
+from llm_adapters.providers.replay_adapter import ReplayAdapter, replay_key
+from rewriteforge.app.http.controllers.rewrite_controller import _until_disconnected
+from rewriteforge.app.http.requests.rewrite_request import RewriteResponse
 from rewriteforge.bootstrap import create_app
+from rewriteforge.config.settings import Settings
 
 
 @pytest.fixture
@@ -72,6 +82,35 @@ class TestRewriteEndpoint:
         assert response2.status_code == 200
         assert response2.json()["cached"] is True
 
+    async def test_rewrite_serializes_directly(self, app, client):
+        """Test the fast path still returns the documented shape"""
+        body = {"text": "Ahoy — café ☕", "style": "pirate"}
+        await client.post("/v1/rewrite", json=body)
+
+        response = await client.post("/v1/rewrite", json=body)
+
+        assert response.headers["content-type"] == "application/json"
+        assert RewriteResponse.model_validate_json(response.content).rewritten.endswith("café ☕")
+        container = app.state.container
+        assert container.rewrite_service() is container.rewrite_service()
+
+    async def test_fuzzy_hit_flagged(self, monkeypatch):
+        """Test a near-duplicate is served adapted and flagged, and shows in stats"""
+        monkeypatch.setenv("FUZZY_CACHE_STYLES", '["pirate"]')
+        app = create_app()
+        template = "Hi {}, your order {} has shipped and will arrive on Tuesday."
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            body = {"text": template.format("Alice", 1234), "style": "pirate"}
+            await client.post("/v1/rewrite", json=body)
+            body = {"text": template.format("Bob", 5678), "style": "pirate"}
+            data = (await client.post("/v1/rewrite", json=body)).json()
+            stats = (await client.get("/v1/stats")).json()["fuzzy"]
+
+        assert data["fuzzy"] is True
+        assert "Bob" in data["rewritten"] and "Alice" not in data["rewritten"]
+        assert stats["hits"] == 1
+
 
 class TestStreamEndpoint:
     async def test_rewrite_stream(self, client):
@@ -87,3 +126,227 @@ class TestStreamEndpoint:
         content = response.text
         assert "data:" in content
         assert "[DONE]" in content
+
+    async def test_rewrite_stream_replays_cache_hit(self, client):
+        """Test a repeated stream is served from the cache"""
+        payload = {"text": "Stream cache test", "style": "pirate"}
+        first = await client.post("/v1/rewrite/stream", json=payload)
+        second = await client.post("/v1/rewrite/stream", json=payload)
+
+        assert first.text.startswith("data:")
+        assert second.text.endswith("data: [DONE]\n\n")
+        response = await client.post("/v1/rewrite", json=payload)
+        assert response.json()["cached"] is True
+
+    async def test_rewrite_stream_invalid_style(self, client):
+        """Test 422 for unknown style on the stream endpoint"""
+        response = await client.post(
+            "/v1/rewrite/stream", json={"text": "Hello world", "style": "unknown"}
+        )
+
+        assert response.status_code == 422
+
+
+class TestBatchEndpoint:
+    async def test_rewrite_batch(self, client):
+        """Test batch returns one result per item in input order"""
+        response = await client.post(
+            "/v1/rewrite/batch",
+            json={
+                "items": [
+                    {"text": "Hello", "style": "pirate"},
+                    {"text": "Hello", "style": "unknown"},
+                    {"text": "Hello", "style": "pirate"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert results[0]["rewritten"] == results[2]["rewritten"]
+        assert results[1]["error"] is not None
+
+    async def test_rewrite_batch_ndjson(self, client):
+        """Test streaming mode emits one JSON object per line"""
+        response = await client.post(
+            "/v1/rewrite/batch?stream=true",
+            json={"items": [{"text": "One"}, {"text": "Two"}]},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(r["index"] for r in lines) == [0, 1]
+
+    async def test_invalid_items_do_not_reject_batch(self, client):
+        """Test empty and oversized items get per-item errors, not a 422"""
+        response = await client.post(
+            "/v1/rewrite/batch",
+            json={"items": [{"text": ""}, {"text": "x" * 100_000}, {"text": "Hello"}]},
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0]["error"] == "Text must not be empty"
+        assert "maximum length" in results[1]["error"]
+        assert results[2]["error"] is None
+
+    async def test_rewrite_batch_empty_rejected(self, client):
+        """Test 422 for an empty batch"""
+        response = await client.post("/v1/rewrite/batch", json={"items": []})
+
+        assert response.status_code == 422
+
+
+class TestLoadShedding:
+    @pytest.fixture
+    def overloaded_app(self, app):
+        # Not a MockAdapter subclass — it would inherit name="mock" and
+        # replace the real mock in the adapter registry
+        class Overloaded(LLMInterface):
+            async def rewrite(self, text, style):
+                raise OverloadedError("busy", retry_after=2.5)
+
+            async def rewrite_stream(self, text, style):
+                raise OverloadedError("busy", retry_after=2.5)
+                yield
+
+        app.state.container.llm_adapter.override(Overloaded())
+        yield app
+        app.state.container.llm_adapter.reset_override()
+
+    async def test_shed_request_gets_503_with_retry_after(self, overloaded_app, client):
+        """Test overload maps to 503 with a whole-second Retry-After"""
+        response = await client.post("/v1/rewrite", json={"text": "Shed me", "style": "pirate"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+
+    async def test_shed_stream_gets_503(self, overloaded_app, client):
+        """Test a stream shed before its first chunk still gets a 503"""
+        response = await client.post(
+            "/v1/rewrite/stream", json={"text": "Shed my stream", "style": "pirate"}
+        )
+
+        assert response.status_code == 503
+
+    async def test_stats_exports_limiter_gauges(self, client):
+        """Test limit and queue depth are exported for autoscaling"""
+        response = await client.get("/v1/stats")
+
+        assert response.status_code == 200
+        assert {"limit", "queue_depth"} <= response.json()["llm"].keys()
+
+    def test_limiter_overrides_per_provider(self):
+        """Test per-provider overrides replace the defaults"""
+        settings = Settings(LLM_LIMITER_OVERRIDES={"anthropic": {"max_limit": 50}})
+
+        assert settings.llm_limiter_options("anthropic")["max_limit"] == 50
+        assert settings.llm_limiter_options("openai")["max_limit"] == settings.llm_limiter_max
+
+
+class TestReplay:
+    async def test_unrecorded_request_gets_404(self, app, client, tmp_path):
+        """Test a replay miss names the missing recording instead of failing with 500"""
+        path = str(tmp_path / "replay.bin")
+        await ReplayAdapter(path=path, mode="record").rewrite("Recorded", "pirate")
+        app.state.container.llm_provider.override(ReplayAdapter(path=path))
+        try:
+            response = await client.post(
+                "/v1/rewrite", json={"text": "Never recorded", "style": "pirate"}
+            )
+        finally:
+            app.state.container.llm_provider.reset_override()
+
+        assert response.status_code == 404
+        assert response.json()["replay_key"] == replay_key("Never recorded", "pirate").hex()
+
+
+class TestDeadlines:
+    @pytest.fixture
+    def slow_app(self, app):
+        app.state.container.llm_provider.override(MockAdapter(latency=1.0))
+        yield app
+        app.state.container.llm_provider.reset_override()
+
+    async def test_header_deadline_returns_504(self, slow_app, client):
+        """Test X-Request-Timeout cuts the provider call short"""
+        response = await client.post(
+            "/v1/rewrite",
+            json={"text": "Too slow", "style": "pirate"},
+            headers={"X-Request-Timeout": "0.05"},
+        )
+
+        assert response.status_code == 504
+        stats = (await client.get("/v1/stats")).json()["llm"]
+        assert stats["deadline_exceeded"] == 1
+
+    async def test_stream_deadline_before_first_chunk_returns_504(self, slow_app, client):
+        """Test a stream that can't start within its budget gets a 504"""
+        response = await client.post(
+            "/v1/rewrite/stream",
+            json={"text": "Too slow to stream", "style": "pirate"},
+            headers={"X-Request-Timeout": "0.05"},
+        )
+
+        assert response.status_code == 504
+
+    async def test_disconnect_closes_upstream(self):
+        """Test a client disconnect stops waiting on a stalled upstream"""
+        disconnect = asyncio.Event()
+        closed = asyncio.Event()
+
+        class FakeRequest:
+            async def receive(self):
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+        async def stalled_upstream():
+            try:
+                yield "first"
+                await asyncio.sleep(60)
+                yield "never"
+            finally:
+                closed.set()
+
+        chunks = _until_disconnected(FakeRequest(), stalled_upstream())
+        assert await anext(chunks) == "first"
+        pending = asyncio.ensure_future(anext(chunks, None))
+        disconnect.set()
+
+        assert await asyncio.wait_for(pending, timeout=1) is None
+        assert closed.is_set()
+
+
+class TestMetrics:
+    async def test_metrics_exposes_stage_histograms_and_cache_counters(self, client):
+        """Test /metrics reports per-stage latency and cache hits/misses"""
+        for _ in range(2):
+            await client.post("/v1/rewrite", json={"text": "Measure me", "style": "pirate"})
+
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert 'rewriteforge_stage_duration_seconds_bucket{stage="cache_get"' in body
+        assert 'rewriteforge_stage_duration_seconds_count{stage="llm"' in body
+        assert (
+            'rewriteforge_cache_requests_total{result="hit",cache="memory",style="pirate"} 1.0'
+            in body
+        )
+        assert (
+            'rewriteforge_cache_requests_total{result="miss",cache="memory",style="pirate"} 1.0'
+            in body
+        )
+        assert "rewriteforge_llm_calls" in body
+
+    async def test_rewrite_sends_server_timing(self, client):
+        """Test responses break their latency down in Server-Timing"""
+        response = await client.post("/v1/rewrite", json={"text": "Time me", "style": "pirate"})
+
+        timing = response.headers["server-timing"]
+        assert "cache_get;dur=" in timing
+        assert "llm;dur=" in timing
+        assert "app;dur=" in timing
@@ -0,0 +1,60 @@
+from rewriteforge.app.services.metrics import Histogram, Metrics, collect_timings, server_timing
+
+
+class TestHistogram:
+    def test_render_is_cumulative(self):
+        """Test bucket counts accumulate up to +Inf"""
+        histogram = Histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(("llm",), value)
+
+        lines = list(histogram.render())
+
+        assert 'latency_seconds_bucket{stage="llm",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{stage="llm",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{stage="llm",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{stage="llm"} 4' in lines
+        assert 'latency_seconds_sum{stage="llm"} 6.05' in lines
+
+    def test_boundary_value_lands_in_its_bucket(self):
+        """Test le is inclusive"""
+        histogram = Histogram("latency_seconds", "Latency", (), buckets=(0.1, 1.0))
+        histogram.observe((), 0.1)
+
+        assert 'latency_seconds_bucket{le="0.1"} 1' in list(histogram.render())
+
+
+class TestMetrics:
+    def test_observe_feeds_histogram_and_request_timings(self):
+        """Test stage durations also add up per request for Server-Timing"""
+        metrics = Metrics(provider="mock", cache="memory")
+
+        with collect_timings() as timings:
+            metrics.observe("llm", 0.25, "pirate")
+            metrics.observe("llm", 0.25, "pirate")
+            metrics.observe("cache_get", 0.001, "pirate")
+
+        assert timings == {"llm": 0.5, "cache_get": 0.001}
+        assert server_timing(timings) == "llm;dur=500.000, cache_get;dur=1.000"
+        assert 'stage="llm",provider="mock",cache="memory",style="pirate"' in metrics.render()
+
+    def test_disabled_records_nothing(self):
+        """Test METRICS_ENABLED=false turns every call into a no-op"""
+        metrics = Metrics(enabled=False)
+
+        with collect_timings() as timings:
+            metrics.observe("llm", 0.25, "pirate")
+            metrics.cache_result(True, "pirate")
+            metrics.llm_error(RuntimeError())
+
+        assert timings == {}
+        assert metrics.cache_requests.value(("hit", "", "pirate")) == 0
+        assert "rewriteforge_llm_errors_total{" not in metrics.render()
+
+    def test_render_sanitizes_component_stats(self):
+        """Test stats() keys become valid metric names"""
+        metrics = Metrics()
+
+        body = metrics.render({"llm": {"route.openai.latency_ms": 12}})
+
+        assert "rewriteforge_llm_route_openai_latency_ms 12.0" in body
@@ -0,0 +1,46 @@
+import json
+import time
+
+from cache_adapters.providers.memory_cache import MemoryCache
+from cache_adapters.support.snapshot import read_snapshot
+from rewriteforge.app.console.prewarm import prewarm, read_pairs
+
+
+class TestPrewarm:
+    async def test_builds_snapshot_the_server_loads(self, tmp_path):
+        """Test pre-warmed rewrites are served as cache hits after a restart"""
+        inputs = tmp_path / "inputs.jsonl"
+        rows = [{"text": "Hello world", "style": "pirate"}, {"text": "Goodbye"}]
+        inputs.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+        output = str(tmp_path / "cache.snapshot")
+
+        counts = await prewarm(read_pairs(str(inputs)), output)
+
+        assert counts == {"rewritten": 2, "cached": 0, "failed": 0, "saved": 2}
+        cache = MemoryCache(snapshot_path=output)
+        await cache.startup()
+        assert cache.stats()["snapshot_loaded"] == 2
+
+    async def test_existing_snapshot_reused(self, tmp_path):
+        output = str(tmp_path / "cache.snapshot")
+        await prewarm([("Hello world", "pirate")], output)
+
+        counts = await prewarm([("Hello world", "pirate"), ("Bad style", "nope")], output)
+
+        assert counts == {"rewritten": 0, "cached": 1, "failed": 1, "saved": 1}
+
+    async def test_ttl_starts_when_the_server_loads(self, tmp_path, monkeypatch):
+        """Test a snapshot loaded long after the build still warms the cache"""
+        output = str(tmp_path / "cache.snapshot")
+        await prewarm([("Hello world", "pirate")], output)
+        [(key, _, expires_at)] = read_snapshot(output)
+        assert expires_at is None
+
+        loaded_at = time.time() + 7 * 24 * 3600
+        monkeypatch.setattr(time, "time", lambda: loaded_at)
+        cache = MemoryCache(default_ttl=3600, snapshot_path=output)
+        await cache.startup()
+
+        assert await cache.get(key) is not None
+        monkeypatch.setattr(time, "time", lambda: loaded_at + 3601)
+        assert await cache.get(key) is None
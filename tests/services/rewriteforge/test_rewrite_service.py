@@ -1,7 +1,13 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from cache_adapters.providers.memory_cache import MemoryCache
+from cache_adapters.support.write_behind import WriteBehindCache
 from rewriteforge.app.exceptions import ValidationError
+from rewriteforge.app.services.freshness import Freshness, unwrap, wrap
+from rewriteforge.app.services.fuzzy_cache import FuzzyCache
+from rewriteforge.app.services.metrics import Metrics
 from rewriteforge.app.services.rewrite_service import RewriteService
 
 
@@ -25,6 +31,16 @@ def config():
     config.max_text_length = 5000
     config.allowed_styles = ["pirate", "haiku", "formal"]
     config.default_style = "formal"
+    config.single_flight_enabled = True
+    config.single_flight_distributed = False
+    config.single_flight_lock_ttl = 5
+    config.single_flight_poll_interval = 0.01
+    config.stream_replay_chunk_size = 0
+    config.segment_max_chars = 0
+    config.segment_concurrency = 4
+    config.segment_cache_enabled = False
+    config.batch_max_items = 100
+    config.batch_concurrency = 4
     return config
 
 
@@ -88,3 +104,551 @@ class TestRewriteService:
 
         assert key1 != key2
         assert key1 != key3
+
+    async def test_failed_cache_write_keeps_response(self, mock_llm, mock_cache, config):
+        """Test a cache outage on set costs a later miss, not the rewrite"""
+        metrics = Metrics(cache="redis")
+        service = RewriteService(llm=mock_llm, cache=mock_cache, config=config, metrics=metrics)
+        mock_cache.set.side_effect = ConnectionError("cache down")
+
+        result = await service.rewrite("Hello world", "pirate")
+
+        assert result["rewritten"] == "Transformed text"
+        assert metrics.cache_errors.value(("set", "redis")) == 1
+
+
+class TestCanonicalKeys:
+    async def test_normalized_hit_counted(self, mock_llm, config):
+        """Test hits that only canonicalization made possible are reported"""
+        metrics = Metrics(cache="memory")
+        service = RewriteService(llm=mock_llm, cache=MemoryCache(), config=config, metrics=metrics)
+
+        await service.rewrite("Hello world", "pirate")
+        await service.rewrite("Hello world", "pirate")
+        result = await service.rewrite("Hello world\r\n", "pirate")
+
+        assert result["cached"] is True
+        mock_llm.rewrite.assert_called_once()
+        assert metrics.cache_requests.value(("hit", "memory", "pirate")) == 2
+        assert metrics.normalized_hits.value(("memory", "pirate")) == 1
+
+
+class TestFuzzyCache:
+    @pytest.fixture
+    def cache(self):
+        return MemoryCache()
+
+    @pytest.fixture
+    def fuzzy_service(self, mock_llm, config, cache):
+        async def pirate(text, style):
+            return text.replace("Hi", "Ahoy")
+
+        mock_llm.rewrite.side_effect = pirate
+        return RewriteService(
+            llm=mock_llm, cache=cache, config=config, fuzzy=FuzzyCache(styles=["pirate"])
+        )
+
+    TEMPLATE = "Hi {}, your order {} has shipped and will arrive on Tuesday."
+
+    async def test_near_duplicate_served_adapted(self, fuzzy_service, mock_llm):
+        """Test a templated variant is adapted from its neighbour's entry"""
+        await fuzzy_service.rewrite(self.TEMPLATE.format("Alice", 1234), "pirate")
+        result = await fuzzy_service.rewrite(self.TEMPLATE.format("Bob", 5678), "pirate")
+
+        mock_llm.rewrite.assert_called_once()
+        assert (
+            result["rewritten"]
+            == "Ahoy Bob, your order 5678 has shipped and will arrive on Tuesday."
+        )
+        assert result["fuzzy"] is True
+        assert result["cached"] is True
+
+    async def test_style_switch(self, fuzzy_service, mock_llm):
+        """Test styles without the fuzzy cache always go to the LLM"""
+        await fuzzy_service.rewrite(self.TEMPLATE.format("Alice", 1234), "formal")
+        result = await fuzzy_service.rewrite(self.TEMPLATE.format("Bob", 5678), "formal")
+
+        assert mock_llm.rewrite.call_count == 2
+        assert result["fuzzy"] is False
+
+    async def test_expired_neighbour_forgotten(self, fuzzy_service, mock_llm, cache):
+        """Test a neighbour whose cache entry is gone is dropped, not served"""
+        await fuzzy_service.rewrite(self.TEMPLATE.format("Alice", 1234), "pirate")
+        await cache.clear()
+
+        result = await fuzzy_service.rewrite(self.TEMPLATE.format("Bob", 5678), "pirate")
+
+        assert result["fuzzy"] is False
+        assert mock_llm.rewrite.call_count == 2
+        assert fuzzy_service._fuzzy.stats()["entries"] == 1  # only Bob
+
+    async def test_batch_flags_fuzzy_items(self, fuzzy_service, mock_llm):
+        """Test batch misses try the fuzzy cache before the LLM"""
+        await fuzzy_service.rewrite(self.TEMPLATE.format("Alice", 1234), "pirate")
+
+        results = await fuzzy_service.rewrite_batch([(self.TEMPLATE.format("Bob", 5678), "pirate")])
+
+        mock_llm.rewrite.assert_called_once()
+        assert results[0]["fuzzy"] is True
+        assert results[0]["rewritten"].startswith("Ahoy Bob")
+
+
+class TestFreshness:
+    @pytest.fixture
+    def cache(self):
+        return MemoryCache()
+
+    @pytest.fixture
+    def fresh_service(self, mock_llm, config, cache):
+        mock_llm.rewrite.return_value = "New rewrite"
+        freshness = Freshness(ttl=60, stale_ttl=600)
+        return RewriteService(llm=mock_llm, cache=cache, config=config, freshness=freshness)
+
+    async def test_entries_carry_creation_time_and_cost(self, fresh_service, cache):
+        await fresh_service.rewrite("Hello", "pirate")
+
+        entry = unwrap(await cache.get(fresh_service._cache_key("Hello", "pirate")))
+
+        assert entry.value == "New rewrite"
+        assert entry.created_at is not None and entry.delta >= 0
+
+    async def test_stale_served_while_one_task_refreshes(self, fresh_service, mock_llm, cache):
+        """Test stale hits return at once and trigger exactly one refresh"""
+        key = fresh_service._cache_key("Hello", "pirate")
+        await cache.set(key, wrap("Old rewrite", created_at=0.0, delta=1.0))
+
+        results = await asyncio.gather(
+            *[fresh_service.rewrite("Hello", "pirate") for _ in range(3)]
+        )
+        await asyncio.sleep(0.01)
+
+        assert [r["rewritten"] for r in results] == ["Old rewrite"] * 3
+        assert all(r["stale"] and r["cached"] for r in results)
+        mock_llm.rewrite.assert_called_once()
+        result = await fresh_service.rewrite("Hello", "pirate")
+        assert result["rewritten"] == "New rewrite"
+        assert result["stale"] is False
+
+    async def test_refresh_lock_held_elsewhere(self, fresh_service, mock_llm, cache):
+        """Test another replica's refresh lock stops this one from refreshing"""
+        key = fresh_service._cache_key("Hello", "pirate")
+        await cache.set(key, wrap("Old rewrite", created_at=0.0, delta=1.0))
+        await cache.set(f"refresh:{key}", "1")
+
+        await fresh_service.rewrite("Hello", "pirate")
+        await asyncio.sleep(0.01)
+
+        mock_llm.rewrite.assert_not_called()
+
+
+class TestSingleFlight:
+    @pytest.fixture
+    def slow_llm(self, mock_llm):
+        async def slow_rewrite(text, style):
+            await asyncio.sleep(0.05)
+            return "Transformed text"
+
+        mock_llm.rewrite.side_effect = slow_rewrite
+        return mock_llm
+
+    async def test_concurrent_misses_share_one_llm_call(self, service, slow_llm):
+        """Test identical concurrent requests coalesce into one LLM call"""
+        results = await asyncio.gather(
+            *[service.rewrite("Hello world", "pirate") for _ in range(5)]
+        )
+
+        slow_llm.rewrite.assert_called_once()
+        assert all(r["rewritten"] == "Transformed text" for r in results)
+        assert sum(r["coalesced"] for r in results) == 4
+        assert service._single_flight.stats()["llm_calls_saved"] == 4
+
+    async def test_different_keys_not_coalesced(self, service, slow_llm):
+        """Test different inputs each get their own LLM call"""
+        await asyncio.gather(
+            service.rewrite("Hello world", "pirate"),
+            service.rewrite("Hello world", "formal"),
+        )
+
+        assert slow_llm.rewrite.call_count == 2
+
+    async def test_leader_error_propagates_to_followers(self, service, mock_llm):
+        """Test followers receive the leader's exception"""
+
+        async def failing_rewrite(text, style):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        mock_llm.rewrite.side_effect = failing_rewrite
+
+        results = await asyncio.gather(
+            *[service.rewrite("Hello world", "pirate") for _ in range(3)],
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        mock_llm.rewrite.assert_called_once()
+
+    async def test_disabled_calls_llm_per_request(self, service, slow_llm, config):
+        """Test coalescing can be switched off"""
+        config.single_flight_enabled = False
+
+        await asyncio.gather(*[service.rewrite("Hello world", "pirate") for _ in range(3)])
+
+        assert slow_llm.rewrite.call_count == 3
+
+    async def test_distributed_followers_wait_for_lock_holder(self, slow_llm, config):
+        """Test services sharing a cache coalesce through the cache lock"""
+        config.single_flight_distributed = True
+        cache = MemoryCache()
+        # Separate services with separate registries, like two workers
+        workers = [RewriteService(llm=slow_llm, cache=cache, config=config) for _ in range(3)]
+
+        results = await asyncio.gather(*[w.rewrite("Hello world", "pirate") for w in workers])
+
+        slow_llm.rewrite.assert_called_once()
+        assert sum(r["coalesced"] for r in results) == 2
+        assert await cache.get(f"lock:{workers[0]._cache_key('Hello world', 'pirate')}") is None
+
+    async def test_distributed_with_write_behind(self, slow_llm, config):
+        """Test the leader's queued result is visible once it releases the lock"""
+        config.single_flight_distributed = True
+        backend = MemoryCache()
+        # Each worker queues its own writes; only lock releases flush them
+        workers = [
+            RewriteService(
+                llm=slow_llm, cache=WriteBehindCache(backend, flush_interval=60), config=config
+            )
+            for _ in range(2)
+        ]
+
+        results = await asyncio.gather(*[w.rewrite("Hello world", "pirate") for w in workers])
+
+        slow_llm.rewrite.assert_called_once()
+        assert sum(r["coalesced"] for r in results) == 1
+
+
+class TestRewriteBatch:
+    @pytest.fixture
+    def memory_service(self, mock_llm, config):
+        return RewriteService(llm=mock_llm, cache=MemoryCache(), config=config)
+
+    async def test_results_in_input_order(self, memory_service):
+        """Test batch results come back in input order"""
+        results = await memory_service.rewrite_batch(
+            [("one", "pirate"), ("two", "formal"), ("three", None)]
+        )
+
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert [r["original"] for r in results] == ["one", "two", "three"]
+        assert results[2]["style"] == "formal"
+
+    async def test_duplicates_share_one_llm_call(self, memory_service, mock_llm):
+        """Test identical items are rewritten once"""
+        results = await memory_service.rewrite_batch([("same", "pirate")] * 3)
+
+        mock_llm.rewrite.assert_called_once()
+        assert [r["coalesced"] for r in results] == [False, True, True]
+
+    async def test_canonical_duplicates_echo_their_own_text(self, memory_service, mock_llm):
+        """Test inputs equal after canonicalization share a call but keep their original"""
+        results = await memory_service.rewrite_batch([("same", "pirate"), ("same \r\n", "pirate")])
+
+        mock_llm.rewrite.assert_called_once()
+        assert [r["original"] for r in results] == ["same", "same \r\n"]
+
+    async def test_cache_hits_resolved_in_one_bulk_lookup(self, service, mock_cache, mock_llm):
+        """Test all keys are looked up with a single get_many call"""
+        mock_cache.get_many.side_effect = lambda keys: ["Cached result"] * len(keys)
+
+        results = await service.rewrite_batch([("a", "pirate"), ("b", "pirate")])
+
+        mock_cache.get_many.assert_called_once()
+        mock_cache.get.assert_not_called()
+        mock_llm.rewrite.assert_not_called()
+        assert all(r["cached"] for r in results)
+
+    async def test_per_item_errors_do_not_fail_batch(self, memory_service, mock_llm):
+        """Test invalid items and LLM failures are reported per item"""
+
+        async def flaky_rewrite(text, style):
+            if text == "boom":
+                raise RuntimeError("provider error")
+            return "Transformed text"
+
+        mock_llm.rewrite.side_effect = flaky_rewrite
+
+        results = await memory_service.rewrite_batch(
+            [("ok", "pirate"), ("bad style", "shakespeare"), ("boom", "pirate"), ("", None)]
+        )
+
+        assert results[0]["rewritten"] == "Transformed text"
+        assert results[0]["error"] is None
+        assert "Unknown style" in results[1]["error"]
+        assert results[2]["error"] == "provider error"
+        assert results[3]["error"] == "Text must not be empty"
+
+    async def test_concurrency_is_capped(self, memory_service, mock_llm, config):
+        """Test no more than batch_concurrency LLM calls run at once"""
+        config.batch_concurrency = 2
+        running = peak = 0
+
+        async def tracked_rewrite(text, style):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "Transformed text"
+
+        mock_llm.rewrite.side_effect = tracked_rewrite
+
+        await memory_service.rewrite_batch([(f"text {i}", "pirate") for i in range(10)])
+
+        assert peak == 2
+
+    async def test_too_many_items_rejected(self, service, config):
+        """Test batch size limit"""
+        config.batch_max_items = 2
+
+        with pytest.raises(ValidationError, match="Batch exceeds maximum"):
+            await service.rewrite_batch([("a", None)] * 3)
+
+
+class TestRewriteStream:
+    @pytest.fixture
+    def cache(self):
+        return MemoryCache()
+
+    @pytest.fixture
+    def upstream_calls(self):
+        return []
+
+    @pytest.fixture
+    def streaming_llm(self, mock_llm, upstream_calls):
+        def rewrite_stream(text, style):
+            upstream_calls.append(text)
+
+            async def chunks():
+                for word in ["Ahoy ", "there ", "matey"]:
+                    await asyncio.sleep(0.01)
+                    yield word
+
+            return chunks()
+
+        mock_llm.rewrite_stream = rewrite_stream
+        return mock_llm
+
+    @pytest.fixture
+    def stream_service(self, streaming_llm, cache, config):
+        return RewriteService(llm=streaming_llm, cache=cache, config=config)
+
+    async def test_completed_stream_is_cached(self, stream_service, cache):
+        """Test the full streamed text is written under the rewrite() key"""
+        chunks = [c async for c in stream_service.rewrite_stream("Hello", "pirate")]
+
+        assert "".join(chunks) == "Ahoy there matey"
+        result = await stream_service.rewrite("Hello", "pirate")
+        assert result["cached"] is True
+        assert result["rewritten"] == "Ahoy there matey"
+
+    async def test_cache_hit_replayed_in_chunks(
+        self, stream_service, cache, config, upstream_calls
+    ):
+        """Test a cached rewrite is replayed without calling the LLM"""
+        config.stream_replay_chunk_size = 4
+        await cache.set(stream_service._cache_key("Hello", "pirate"), "Cached pirate text")
+
+        chunks = [c async for c in stream_service.rewrite_stream("Hello", "pirate")]
+
+        assert chunks == ["Cach", "ed p", "irat", "e te", "xt"]
+        assert upstream_calls == []
+
+    async def test_concurrent_streams_share_upstream(self, stream_service, upstream_calls):
+        """Test a second viewer attaches to the in-progress stream"""
+
+        async def consume():
+            return "".join([c async for c in stream_service.rewrite_stream("Hello", "pirate")])
+
+        results = await asyncio.gather(consume(), consume(), consume())
+
+        assert results == ["Ahoy there matey"] * 3
+        assert len(upstream_calls) == 1
+
+    async def test_disconnect_skips_cache_write(self, stream_service, cache):
+        """Test abandoning the stream cancels upstream and caches nothing"""
+        chunks = stream_service.rewrite_stream("Hello", "pirate")
+        assert await chunks.__anext__() == "Ahoy "
+        await chunks.aclose()
+        await asyncio.sleep(0.05)
+
+        assert await cache.get(stream_service._cache_key("Hello", "pirate")) is None
+        assert stream_service._single_flight.stats()["abandoned_streams"] == 1
+
+    async def test_upstream_error_skips_cache_write(self, stream_service, streaming_llm, cache):
+        """Test a failed stream raises and caches nothing"""
+
+        async def broken(text, style):
+            yield "partial "
+            raise RuntimeError("stream broke")
+
+        streaming_llm.rewrite_stream = broken
+
+        with pytest.raises(RuntimeError, match="stream broke"):
+            _ = [c async for c in stream_service.rewrite_stream("Hello", "pirate")]
+        assert await cache.get(stream_service._cache_key("Hello", "pirate")) is None
+
+    async def test_invalid_style_raises_before_streaming(self, stream_service):
+        """Test validation happens when the stream is requested, not iterated"""
+        with pytest.raises(ValidationError):
+            stream_service.rewrite_stream("Hello", "shakespeare")
+
+
+class TestSegmentedRewrite:
+    @pytest.fixture
+    def long_text(self):
+        return "First paragraph.\n\nSecond paragraph.\n\nThird paragraph."
+
+    @pytest.fixture
+    def segmented_service(self, mock_llm, config):
+        config.segment_max_chars = 20
+        return RewriteService(llm=mock_llm, cache=MemoryCache(), config=config)
+
+    async def test_long_text_rewritten_per_segment_in_order(
+        self, segmented_service, mock_llm, long_text
+    ):
+        """Test segments are rewritten separately and reassembled in order"""
+
+        async def reverse_delay(text, style):
+            # Earlier segments finish last
+            await asyncio.sleep(0.03 if text.startswith("First") else 0.0)
+            return text.upper()
+
+        mock_llm.rewrite.side_effect = reverse_delay
+
+        result = await segmented_service.rewrite(long_text, "pirate")
+
+        assert mock_llm.rewrite.call_count == 3
+        assert result["rewritten"] == "FIRST PARAGRAPH.\n\nSECOND PARAGRAPH.\n\nTHIRD PARAGRAPH."
+
+    async def test_segment_concurrency_capped(self, segmented_service, mock_llm, config, long_text):
+        """Test no more than segment_concurrency segment calls run at once"""
+        config.segment_concurrency = 1
+        running = peak = 0
+
+        async def tracked(text, style):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return text
+
+        mock_llm.rewrite.side_effect = tracked
+
+        await segmented_service.rewrite(long_text, "pirate")
+
+        assert peak == 1
+
+    async def test_short_text_not_segmented(self, segmented_service, mock_llm):
+        """Test texts under the limit go to the LLM in one call"""
+        await segmented_service.rewrite("Short text.", "pirate")
+
+        mock_llm.rewrite.assert_called_once_with("Short text.", "pirate")
+
+    async def test_stream_emits_segments_in_order(self, segmented_service, mock_llm, long_text):
+        """Test streamed segments come out in input order despite finishing out of order"""
+
+        def rewrite_stream(text, style):
+            async def chunks():
+                await asyncio.sleep(0.03 if text.startswith("First") else 0.0)
+                for word in text.upper().split(" "):
+                    yield word + "|"
+
+            return chunks()
+
+        mock_llm.rewrite_stream = rewrite_stream
+
+        chunks = [c async for c in segmented_service.rewrite_stream(long_text, "pirate")]
+
+        assert "".join(chunks) == ("FIRST|PARAGRAPH.|\n\nSECOND|PARAGRAPH.|\n\nTHIRD|PARAGRAPH.|")
+
+
+class TestIncrementalSegmentCache:
+    @pytest.fixture
+    def cache(self):
+        return MemoryCache()
+
+    @pytest.fixture
+    def incremental_service(self, mock_llm, cache, config):
+        config.segment_cache_enabled = True
+        mock_llm.rewrite.side_effect = lambda text, style: text.upper()
+        return RewriteService(llm=mock_llm, cache=cache, config=config)
+
+    async def test_edit_regenerates_only_changed_paragraph(self, incremental_service, mock_llm):
+        """Test an edited document only sends its changed paragraph to the LLM"""
+        first = await incremental_service.rewrite(
+            "Alpha one.\n\nBeta two.\n\nGamma three.", "pirate"
+        )
+        assert first["segments_regenerated"] == 3
+        mock_llm.rewrite.reset_mock()
+
+        result = await incremental_service.rewrite(
+            "Alpha one.\n\nBeta TWO edited.\n\nGamma three.", "pirate"
+        )
+
+        mock_llm.rewrite.assert_called_once_with("Beta TWO edited.", "pirate")
+        assert result["rewritten"] == "ALPHA ONE.\n\nBETA TWO EDITED.\n\nGAMMA THREE."
+        assert result["segments_reused"] == 2
+        assert result["segments_regenerated"] == 1
+        assert result["cached"] is False
+
+    async def test_repeated_paragraphs_rewritten_once(self, incremental_service, mock_llm):
+        """Test identical paragraphs within a document share one LLM call"""
+        result = await incremental_service.rewrite("Same.\n\nSame.\n\nOther.", "pirate")
+
+        assert mock_llm.rewrite.call_count == 2
+        assert result["rewritten"] == "SAME.\n\nSAME.\n\nOTHER."
+
+    async def test_cached_empty_rewrite_is_reused(self, incremental_service, mock_llm, cache):
+        """Test a segment cached as an empty string counts as a hit"""
+        await cache.set(incremental_service._cache_key("Alpha one.", "pirate"), "")
+
+        result = await incremental_service.rewrite("Alpha one.\n\nBeta two.", "pirate")
+
+        mock_llm.rewrite.assert_called_once_with("Beta two.", "pirate")
+        assert result["rewritten"] == "\n\nBETA TWO."
+        assert result["segments_reused"] == 1
+
+    async def test_whole_document_hit_skips_segments(self, incremental_service, mock_llm, cache):
+        """Test an unchanged document is still a single cache hit"""
+        text = "Alpha one.\n\nBeta two."
+        await incremental_service.rewrite(text, "pirate")
+        cache_get_many = AsyncMock(wraps=cache.get_many)
+        cache.get_many = cache_get_many
+
+        result = await incremental_service.rewrite(text, "pirate")
+
+        assert result["cached"] is True
+        cache_get_many.assert_not_called()
+
+    async def test_stream_reuses_cached_paragraphs(self, incremental_service, mock_llm):
+        """Test streaming emits cached paragraphs and streams only the edited one"""
+        await incremental_service.rewrite("Alpha one.\n\nBeta two.", "pirate")
+        streamed = []
+
+        def rewrite_stream(text, style):
+            streamed.append(text)
+
+            async def chunks():
+                yield text.upper()
+
+            return chunks()
+
+        mock_llm.rewrite_stream = rewrite_stream
+
+        chunks = [
+            c async for c in incremental_service.rewrite_stream("Alpha one.\n\nBeta 2.", "pirate")
+        ]
+
+        assert "".join(chunks) == "ALPHA ONE.\n\nBETA 2."
+        assert streamed == ["Beta 2."]
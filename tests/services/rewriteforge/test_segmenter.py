@@ -0,0 +1,67 @@
+from rewriteforge.app.services.segmenter import split_segments
+
+
+def _join(segments):
+    return "".join(segment + separator for segment, separator in segments)
+
+
+class TestSplitSegments:
+    def test_short_text_single_segment(self):
+        """Test text under the limit is not split"""
+        assert split_segments("Hello world", 100) == [("Hello world", "")]
+
+    def test_disabled_with_zero_limit(self):
+        """Test a zero limit never splits"""
+        assert split_segments("x" * 1000, 0) == [("x" * 1000, "")]
+
+    def test_splits_at_paragraphs(self):
+        """Test paragraph breaks are preferred split points"""
+        text = "First paragraph.\n\nSecond paragraph."
+
+        segments = split_segments(text, 20)
+
+        assert segments == [("First paragraph.", "\n\n"), ("Second paragraph.", "")]
+
+    def test_packs_small_paragraphs_together(self):
+        """Test neighbouring pieces share a segment when they fit"""
+        text = "One.\n\nTwo.\n\nThree is longer."
+
+        segments = split_segments(text, 12)
+
+        assert segments[0] == ("One.\n\nTwo.", "\n\n")
+
+    def test_long_paragraph_splits_at_sentences(self):
+        """Test an overlong paragraph is cut between sentences"""
+        text = "First sentence here. Second sentence here. Third one."
+
+        segments = split_segments(text, 25)
+
+        assert [segment for segment, _ in segments] == [
+            "First sentence here.",
+            "Second sentence here.",
+            "Third one.",
+        ]
+
+    def test_overlong_sentence_hard_split(self):
+        """Test a sentence longer than the limit is cut at whitespace"""
+        text = "word " * 20
+
+        segments = split_segments(text, 12)
+
+        assert all(len(segment) <= 12 for segment, _ in segments)
+        assert _join(segments) == text
+
+    def test_reassembly_is_lossless(self):
+        """Test joining segments reproduces the input exactly"""
+        text = "  Intro.\n\n\nBody one. Body two!  Body three?\n \nOutro without end"
+
+        for limit in (5, 10, 20, 40):
+            assert _join(split_segments(text, limit)) == text
+
+    def test_unpacked_keeps_one_paragraph_per_segment(self):
+        """Test pack=False never merges paragraphs, even short ones"""
+        text = "One.\n\nTwo.\n\nThree."
+
+        segments = split_segments(text, 0, pack=False)
+
+        assert segments == [("One.", "\n\n"), ("Two.", "\n\n"), ("Three.", "")]